@@ -78,8 +78,16 @@ def _create_seed_benchmark_data(app):
         app.logger.error(f"Error creating seed benchmark data: {e}")
 
 
-def create_app(config_name=None):
-    """Application factory."""
+def create_app(config_name=None, worker=False):
+    """
+    Application factory.
+    
+    Args:
+        config_name: Key into config (default: FLASK_CONFIG or 'default')
+        worker: Build the app for a background worker process - skip the
+            startup work the web process already did (table creation,
+            benchmark seeding, cache warming) and do not start the scheduler
+    """
     if config_name is None:
         config_name = os.environ.get('FLASK_CONFIG', 'default')
 
@@ -124,6 +132,27 @@ def create_app(config_name=None):
         """Serve the WebFlow shell template for testing."""
         return render_template('webflow_shell.html')
 
+    # Add global functions to Jinja2
+    app.jinja_env.globals.update(abs=abs, min=min, max=max)
+
+    # Take "now" once per request (see utils.request_time)
+    from .utils.request_time import cache_request_now, utc_now
+    app.before_request(cache_request_now)
+
+    # Context processors
+    @app.context_processor
+    def inject_now():
+        return {'now': utc_now()}
+
+    # Initialize security features
+    init_security(app)
+
+    # Add CLI commands
+    register_cli(app)
+
+    if worker:
+        return app
+
     # Create database tables
     with app.app_context():
         db.create_all()
@@ -132,7 +161,7 @@ def create_app(config_name=None):
         _ensure_benchmark_table(app)
         
         # Warm caches for Neon.tech optimization (pre-populate in-memory cache)
-        if os.environ.get('NEON_OPTIMIZE', 'true').lower() == 'true':
+        if app.config['WARM_CACHES_ON_STARTUP'] and os.environ.get('NEON_OPTIMIZE', 'true').lower() == 'true':
             try:
                 from .utils.neon_cache import warm_public_caches
                 warm_public_caches()
@@ -147,21 +176,6 @@ def create_app(config_name=None):
     import atexit
     atexit.register(shutdown_scheduler)
 
-    # Add global functions to Jinja2
-    app.jinja_env.globals.update(abs=abs, min=min, max=max)
-
-    # Context processors
-    @app.context_processor
-    def inject_now():
-        from datetime import datetime
-        return {'now': datetime.utcnow()}
-
-    # Initialize security features
-    init_security(app)
-
-    # Add CLI commands
-    register_cli(app)
-
     return app
 
 def register_cli(app):
@@ -7,7 +7,8 @@ import io
 import csv
 import secrets
 from datetime import datetime, date, timedelta
-from sqlalchemy import desc, func
+from sqlalchemy import desc, func, select
+import numpy as np
 
 from ..extensions import db
 from ..models import User, ActivityLog, CsvUpload, Analysis, Company, PerformanceCalculation, AnalystMapping, CompanyTickerMapping, Vote, PortfolioPurchase, Idea, IdeaComment, BenchmarkPrice, StockPrice, analysis_analysts, CompanySectorCache
@@ -106,11 +107,30 @@ def get_portfolio_performance(purchased_only=False):
 
 def get_benchmark_price_on_date(ticker, target_date):
     """Get cached benchmark price on or before target_date."""
-    price = BenchmarkPrice.query.filter(
-        BenchmarkPrice.ticker == ticker,
-        BenchmarkPrice.date <= target_date
-    ).order_by(BenchmarkPrice.date.desc()).first()
-    return float(price.close_price) if price else None
+    price = db.session.execute(
+        select(BenchmarkPrice.close_price).where(
+            BenchmarkPrice.ticker == ticker,
+            BenchmarkPrice.date <= target_date
+        ).order_by(BenchmarkPrice.date.desc()).limit(1)
+    ).scalar()
+    return float(price) if price is not None else None
+
+
+def get_benchmark_prices_on_dates(ticker, *target_dates):
+    """
+    Get cached benchmark prices on or before each of target_dates.
+    
+    All lookups are issued as scalar subqueries of one SELECT, so the
+    database is hit once regardless of how many dates are requested.
+    """
+    def _latest_close(target_date):
+        return select(BenchmarkPrice.close_price).where(
+            BenchmarkPrice.ticker == ticker,
+            BenchmarkPrice.date <= target_date
+        ).order_by(BenchmarkPrice.date.desc()).limit(1).scalar_subquery()
+    
+    row = db.session.execute(select(*[_latest_close(d) for d in target_dates])).one()
+    return tuple(float(price) if price is not None else None for price in row)
 
 
 def get_cached_benchmark_return(ticker, days):
@@ -122,9 +142,8 @@ def get_cached_benchmark_return(ticker, days):
         end_date = date.today()
         start_date = end_date - timedelta(days=days)
         
-        # Get start and end prices from cache
-        start_price = get_benchmark_price_on_date(ticker, start_date)
-        end_price = get_benchmark_price_on_date(ticker, end_date)
+        # Get start and end prices from cache (single round trip)
+        start_price, end_price = get_benchmark_prices_on_dates(ticker, start_date, end_date)
         
         if start_price and end_price:
             return ((end_price - start_price) / start_price) * 100
@@ -317,10 +336,12 @@ def _get_benchmark_series_from_cache(dates, ticker):
     
     # If no price on first date, try to find the earliest available price after it
     if base_price is None:
-        bp = BenchmarkPrice.query.filter(
-            BenchmarkPrice.ticker == ticker,
-            BenchmarkPrice.date >= first_date
-        ).order_by(BenchmarkPrice.date.asc()).first()
+        bp = db.session.execute(
+            select(BenchmarkPrice.date, BenchmarkPrice.close_price).where(
+                BenchmarkPrice.ticker == ticker,
+                BenchmarkPrice.date >= first_date
+            ).order_by(BenchmarkPrice.date.asc()).limit(1)
+        ).first()
         if bp:
             base_price = float(bp.close_price)
             base_price_date = bp.date
@@ -332,19 +353,21 @@ def _get_benchmark_series_from_cache(dates, ticker):
         
         # Generate simple synthetic series based on annual return (no compounding)
         annual = {'SPY': 10.0, 'VT': 9.0, 'EEMS': 7.0}.get(ticker, 8.0)
-        for i, current_date in enumerate(normalized_dates):
-            days_from_start = (current_date - first_date).days
-            ret = (annual / 365.0) * days_from_start
-            series.append(round(ret, 2))
-        return series
+        days_from_start = (
+            np.array(normalized_dates, dtype='datetime64[D]') - np.datetime64(first_date, 'D')
+        ).astype('int64')
+        return np.round((annual / 365.0) * days_from_start, 2).tolist()
     
-    # Get all available prices for this ticker up to the last date
+    # Get all available prices for this ticker up to the last date.
+    # Select raw columns only - avoids ORM instance hydration for every price row
     all_prices = {}
-    for bp in BenchmarkPrice.query.filter(
-        BenchmarkPrice.ticker == ticker,
-        BenchmarkPrice.date <= last_date
-    ).all():
-        all_prices[bp.date] = float(bp.close_price)
+    for price_date, close_price in db.session.execute(
+        select(BenchmarkPrice.date, BenchmarkPrice.close_price).where(
+            BenchmarkPrice.ticker == ticker,
+            BenchmarkPrice.date <= last_date
+        ).order_by(BenchmarkPrice.date)
+    ):
+        all_prices[price_date] = float(close_price)
     
     if not all_prices:
         # No prices at all - return flat line
@@ -1794,15 +1817,24 @@ def full_recalculation():
     Uses unified_calculator for progress tracking.
     """
     from .. import create_app
-    from ..utils.unified_calculator import recalculate_all_unified, is_calculation_running
+    from ..utils.unified_calculator import acquire_calculation_lock, release_calculation_lock
     from datetime import date, timedelta
     import threading
 
-    if is_calculation_running():
+    # Taking the lock is the "already running?" check - no race between two clicks
+    lock_token = acquire_calculation_lock()
+    if not lock_token:
         return jsonify({'error': 'A recalculation is already in progress'}), 400
 
     def run_full_recalc():
-        app = create_app()
+        try:
+            _run_full_recalc()
+        finally:
+            release_calculation_lock(lock_token)
+
+    def _run_full_recalc():
+        # No second scheduler or startup pass inside this process
+        app = create_app(worker=True)
         with app.app_context():
             try:
                 from ..extensions import db as db_local
@@ -1860,7 +1892,11 @@ def full_recalculation():
                     pass
 
     thread = threading.Thread(target=run_full_recalc, daemon=True)
-    thread.start()
+    try:
+        thread.start()
+    except Exception:
+        release_calculation_lock(lock_token)
+        raise
 
     return jsonify({'status': 'started', 'message': 'Full recalculation started'})
 
@@ -1873,43 +1909,17 @@ def recalculate_progress():
     """
     SSE endpoint for real-time recalculation progress updates.
     """
-    from ..utils.unified_calculator import get_progress
-    import json
-    import time
+    from ..utils.unified_calculator import iter_progress_updates, encode_progress_event, SSE_KEEPALIVE
 
     def generate():
-        last_status = None
-        last_logs_count = 0
-        idle_count = 0
-
-        while True:
-            progress = get_progress()
-            current_status = progress.status
-            current_logs = progress.logs
-
-            should_send = (last_status is None or
-                          current_status != last_status or
-                          len(current_logs) != last_logs_count)
-
-            if should_send:
-                data = progress.to_dict()
-                yield f"data: {json.dumps(data)}\n\n"
-
-                last_status = current_status
-                last_logs_count = len(current_logs)
-                idle_count = 0
-
-                if current_status in ['completed', 'error']:
-                    time.sleep(2)
-                    yield f"data: {json.dumps(progress.to_dict())}\n\n"
-                    break
-            else:
-                idle_count += 1
-                if idle_count >= 20:
-                    yield f"data: {json.dumps(progress.to_dict())}\n\n"
-                    idle_count = 0
+        # Flush headers immediately so the client's onopen fires right away
+        yield b": connected\n\n"
 
-            time.sleep(0.5)
+        for data in iter_progress_updates(keepalive_interval=15):
+            if data is None:
+                yield SSE_KEEPALIVE
+            else:
+                yield encode_progress_event(data)
 
     return current_app.response_class(
         generate(),
@@ -1917,7 +1927,8 @@ def recalculate_progress():
         headers={
             'Cache-Control': 'no-cache',
             'Connection': 'keep-alive',
-            'X-Accel-Buffering': 'no'
+            'X-Accel-Buffering': 'no',
+            'Content-Encoding': 'identity'
         }
     )
 
@@ -1,18 +1,55 @@
 from flask import Blueprint, render_template, redirect, url_for, flash, request, current_app, jsonify
 from flask_login import login_required, current_user
-from sqlalchemy import desc, func
+from sqlalchemy import desc, func, select
+from sqlalchemy.orm import joinedload
 from datetime import date, timedelta, datetime
 from typing import Optional, Dict, Any, List
+from concurrent.futures import ThreadPoolExecutor
+import hashlib
+import heapq
 import logging
 
+import numpy as np
+
 from ..extensions import db
-from ..models import Analysis, PerformanceCalculation, Company, StockPrice, analysis_analysts, User, ActivityLog, CsvUpload, Vote, PortfolioPurchase, BenchmarkPrice
+from ..models import Analysis, PerformanceCalculation, Company, StockPrice, analysis_analysts, User, ActivityLog, CsvUpload, Vote, PortfolioPurchase, BenchmarkPrice, CompanySectorCache
 from ..utils.performance import PerformanceCalculator
 from ..utils.sector_helper import get_company_sector, get_sector_distribution
+from ..utils.keyset import keyset_page
+from ..utils.memo_cache import MemoCache, MISSING
+from ..admin.routes import (
+    get_cached_benchmark_return as _admin_get_cached_benchmark_return,
+    _get_benchmark_series_from_cache as _admin_get_benchmark_series,
+)
 
 analyst_bp = Blueprint('analyst', __name__, template_folder='../templates/analyst')
 logger = logging.getLogger(__name__)
 
+# Analyst rankings memo (5 minutes). analysis_analysts holds the analyst and
+# opponent roles; the CSV importer rewrites it with Core statements, which no
+# mapper event sees, so the table is hooked directly.
+# A login only touches last_login (and password_hash on a hash upgrade),
+# which rankings do not show, so it keeps the cache
+RANKINGS_CACHE_TTL = 300
+_rankings_cache = MemoCache('analyst_rankings', ttl=RANKINGS_CACHE_TTL, maxsize=1)
+_rankings_cache.clear_on_changes(PerformanceCalculation, Analysis, User,
+                                 ignore_columns=('last_login', 'password_hash'))
+_rankings_cache.clear_on_table_writes(analysis_analysts)
+
+# Benchmark series for a portfolio chart. The portfolio series itself is
+# memoized by generate_portfolio_chart_series; this only holds the three
+# benchmark lines built on its date grid, under the same key. Invalidation
+# is in-process only: writes from the recalculation child process do not
+# clear it, so entries can be up to BENCHMARK_SERIES_CACHE_TTL (1 hour) stale
+BENCHMARK_SERIES_CACHE_TTL = 3600
+_benchmark_series_cache = MemoCache('benchmark_series', ttl=BENCHMARK_SERIES_CACHE_TTL)
+_benchmark_series_cache.clear_on_changes(StockPrice, BenchmarkPrice, Analysis)
+
+# Sector statistics memo, keyed by analysis-set content hash
+SECTOR_STATS_CACHE_TTL = 600
+_sector_stats_cache = MemoCache('sector_stats', ttl=SECTOR_STATS_CACHE_TTL, maxsize=64)
+_sector_stats_cache.clear_on_changes(PerformanceCalculation, Analysis, CompanySectorCache)
+
 @analyst_bp.before_request
 def before_request():
     if not current_user.is_authenticated:
@@ -84,44 +121,34 @@ def generate_ai_insights(performance, comparison_data):
     return insights[:3]  # Limit to top 3 insights
 
 
-def calculate_stock_impacts(analyst_id):
-    """Calculate the impact of each stock on the analyst's portfolio."""
-    calculator = PerformanceCalculator()
-    
-    # Get all approved analyses for this analyst
-    analyses = db.session.query(Analysis).join(
-        analysis_analysts, Analysis.id == analysis_analysts.c.analysis_id
-    ).filter(
-        analysis_analysts.c.user_id == analyst_id,
-        analysis_analysts.c.role == 'analyst',
-        Analysis.status == 'On Watchlist'
-    ).all()
+def calculate_stock_impacts(approved_rows):
+    """
+    Calculate the impact of each stock on the analyst's portfolio.
     
-    if not analyses:
-        return []
+    Args:
+        approved_rows: (Analysis, latest return_pct) pairs for the analyst's
+            approved analyses, as pre-fetched by the dashboard query
+    """
+    calculator = PerformanceCalculator()
     
     # Calculate returns and weights
     stock_data = []
     total_return_sum = 0
     
-    for analysis in analyses:
+    for analysis, return_pct in approved_rows:
         # Skip other events
         if calculator._is_other_event(analysis.company):
             continue
-            
-        pc = PerformanceCalculation.query.filter_by(
-            analysis_id=analysis.id
-        ).order_by(PerformanceCalculation.calculation_date.desc()).first()
         
-        if pc and pc.return_pct is not None:
+        if return_pct is not None:
             stock_data.append({
                 'analysis_id': analysis.id,
                 'name': analysis.company.name,
                 'ticker': analysis.company.ticker_symbol or 'N/A',
-                'return_pct': float(pc.return_pct),
+                'return_pct': float(return_pct),
                 'analysis_date': analysis.analysis_date
             })
-            total_return_sum += float(pc.return_pct)
+            total_return_sum += float(return_pct)
     
     if not stock_data:
         return []
@@ -135,10 +162,8 @@ def calculate_stock_impacts(analyst_id):
         # Contribution = weight * return, normalized to show actual impact
         stock['contribution'] = equal_weight * stock['return_pct']
     
-    # Sort by absolute contribution (impact)
-    stock_data.sort(key=lambda x: abs(x['contribution']), reverse=True)
-    
-    return stock_data[:10]  # Top 10 by impact
+    # Top 10 by absolute contribution (impact)
+    return heapq.nlargest(10, stock_data, key=lambda x: abs(x['contribution']))
 
 
 def get_analysis_ids_for_filter(filter_type):
@@ -152,9 +177,9 @@ def get_analysis_ids_for_filter(filter_type):
     - approved_neutral: Approved + neutral
     - all: All stocks
     """
+    # Select only the id columns - no ORM objects are needed to build the list
     if filter_type == 'purchased':
-        purchases = PortfolioPurchase.query.all()
-        return [p.analysis_id for p in purchases]
+        return db.session.execute(select(PortfolioPurchase.analysis_id)).scalars().all()
     
     elif filter_type == 'board_approved':
         analyses = []
@@ -166,13 +191,19 @@ def get_analysis_ids_for_filter(filter_type):
         return analyses
     
     elif filter_type == 'all_approved':
-        return [a.id for a in Analysis.query.filter_by(status='On Watchlist').all()]
+        return db.session.execute(
+            select(Analysis.id).where(Analysis.status == 'On Watchlist')
+        ).scalars().all()
     
     elif filter_type == 'approved_neutral':
-        return [a.id for a in Analysis.query.filter(Analysis.status.in_(['On Watchlist', 'Neutral'])).all()]
+        return db.session.execute(
+            select(Analysis.id).where(Analysis.status.in_(['On Watchlist', 'Neutral']))
+        ).scalars().all()
     
     else:  # all
-        return [a.id for a in Analysis.query.filter(Analysis.status.in_(['On Watchlist', 'Neutral', 'Refused'])).all()]
+        return db.session.execute(
+            select(Analysis.id).where(Analysis.status.in_(['On Watchlist', 'Neutral', 'Refused']))
+        ).scalars().all()
 
 
 def get_portfolio_performance_for_analyses(analysis_ids):
@@ -190,10 +221,8 @@ def get_portfolio_performance_for_analyses(analysis_ids):
     
     analyses = Analysis.query.filter(Analysis.id.in_(analysis_ids)).all()
     
-    total_return = 0.0
-    annualized_return = 0.0
-    count = 0
-    earliest_date = None
+    returns = []
+    analysis_dates = []
     
     for analysis in analyses:
         perf = PerformanceCalculation.query.filter_by(
@@ -201,22 +230,10 @@ def get_portfolio_performance_for_analyses(analysis_ids):
         ).order_by(PerformanceCalculation.calculation_date.desc()).first()
         
         if perf:
-            ret = float(perf.return_pct)
-            total_return += ret
-            
-            # Calculate annualized return
-            days = (date.today() - analysis.analysis_date).days
-            if days > 365:
-                annualized = ((1 + ret / 100) ** (365 / days) - 1) * 100
-            else:
-                annualized = ret
-            annualized_return += annualized
-            
-            count += 1
-            
-            if earliest_date is None or analysis.analysis_date < earliest_date:
-                earliest_date = analysis.analysis_date
+            returns.append(float(perf.return_pct))
+            analysis_dates.append(analysis.analysis_date)
     
+    count = len(returns)
     if count == 0:
         return {
             'num_positions': 0,
@@ -228,24 +245,42 @@ def get_portfolio_performance_for_analyses(analysis_ids):
             'benchmark_eems': None
         }
     
-    avg_return = total_return / count
-    avg_annualized = annualized_return / count
+    # Annualize all positions at once: holding days for every analysis come
+    # from a single vectorized subtraction against today
+    today = date.today()
+    returns_arr = np.array(returns)
+    holding_days = (np.datetime64(today, 'D') - np.array(analysis_dates, dtype='datetime64[D]')).astype('int64')
+    with np.errstate(divide='ignore', invalid='ignore'):
+        annualized = np.where(
+            holding_days > 365,
+            (np.power(1 + returns_arr / 100, 365 / np.maximum(holding_days, 1)) - 1) * 100,
+            returns_arr
+        )
+    
+    avg_return = float(returns_arr.sum()) / count
+    avg_annualized = float(annualized.sum()) / count
+    earliest_date = min(analysis_dates)
     
     # Calculate benchmark returns for the same period
-    from ..admin.routes import get_cached_benchmark_return
-    days = (date.today() - earliest_date).days if earliest_date else 365
+    days = (today - earliest_date).days
     
     return {
         'num_positions': count,
         'total_return': round(avg_return, 2),
         'annualized_return': round(avg_annualized, 2),
-        'start_date': earliest_date.isoformat() if earliest_date else None,
-        'benchmark_spy': round(get_cached_benchmark_return('SPY', days), 2),
-        'benchmark_ftse': round(get_cached_benchmark_return('VT', days), 2),
-        'benchmark_eems': round(get_cached_benchmark_return('EEMS', days), 2)
+        'start_date': earliest_date.isoformat(),
+        'benchmark_spy': round(_admin_get_cached_benchmark_return('SPY', days), 2),
+        'benchmark_ftse': round(_admin_get_cached_benchmark_return('VT', days), 2),
+        'benchmark_eems': round(_admin_get_cached_benchmark_return('EEMS', days), 2)
     }
 
 
+def _analysis_ids_digest(analysis_ids):
+    """Stable content hash of an analysis id set (order and duplicates ignored)."""
+    normalized = ','.join(str(i) for i in sorted(set(analysis_ids or ())))
+    return hashlib.md5(normalized.encode()).hexdigest()
+
+
 def get_portfolio_series_for_analyses(analysis_ids, years=None, method='incremental'):
     """
     Get portfolio time series data for a list of analysis IDs.
@@ -262,22 +297,34 @@ def get_portfolio_series_for_analyses(analysis_ids, years=None, method='incremen
     """
     from ..utils.presentation_export import generate_portfolio_chart_series
     
-    # Use the centralized function which supports both methods
+    # Use the centralized function which supports both methods (memoized there)
     series_data = generate_portfolio_chart_series(analysis_ids, years=years, method=method)
     
     if not series_data or not series_data.get('dates'):
         return None
     
-    # Get dates for benchmark series
-    import pandas as pd
-    dates = pd.to_datetime(series_data['dates'])
-    
-    # Get benchmark series
-    from ..admin.routes import _get_benchmark_series_from_cache
-    spy_series = _get_benchmark_series_from_cache(dates, 'SPY')
-    vt_series = _get_benchmark_series_from_cache(dates, 'VT')
-    eems_series = _get_benchmark_series_from_cache(dates, 'EEMS')
+    # Same key as generate_portfolio_chart_series - the benchmark lines only
+    # depend on that series' date grid
+    cache_key = (frozenset(analysis_ids or ()), years, method, date.today().toordinal())
+    benchmarks = _benchmark_series_cache.get(cache_key)
+    if benchmarks is MISSING:
+        # Get dates for benchmark series
+        import pandas as pd
+        dates = pd.to_datetime(series_data['dates'])
+        
+        # Get benchmark series - the three lookups are independent, so run them
+        # concurrently; each worker gets its own app context (and DB session)
+        app = current_app._get_current_object()
+        
+        def fetch_benchmark_series(ticker):
+            with app.app_context():
+                return _admin_get_benchmark_series(dates, ticker)
+        
+        with ThreadPoolExecutor(max_workers=3) as executor:
+            benchmarks = list(executor.map(fetch_benchmark_series, ['SPY', 'VT', 'EEMS']))
+        _benchmark_series_cache.set(cache_key, benchmarks)
     
+    spy_series, vt_series, eems_series = benchmarks
     return {
         'dates': series_data['dates'],
         'portfolio_series': series_data['values'],
@@ -289,7 +336,21 @@ def get_portfolio_series_for_analyses(analysis_ids, years=None, method='incremen
 
 
 def get_sector_statistics(analysis_ids, use_cached_only=True):
-    """Get sector statistics for a list of analyses - uses cached data only to avoid blocking."""
+    """
+    Get sector statistics for a list of analyses - uses cached data only to avoid blocking.
+    
+    Results are memoized per analysis-set content hash for SECTOR_STATS_CACHE_TTL.
+    """
+    cache_key = (_analysis_ids_digest(analysis_ids), use_cached_only)
+    sector_statistics = _sector_stats_cache.get(cache_key)
+    if sector_statistics is MISSING:
+        sector_statistics = _compute_sector_statistics(analysis_ids)
+        _sector_stats_cache.set(cache_key, sector_statistics)
+    return sector_statistics
+
+
+def _compute_sector_statistics(analysis_ids):
+    """Compute sector statistics from the database (uncached)."""
     from ..utils.sector_helper import get_company_sector_async, get_sector_stats_cache_info
     
     sector_returns = {}
@@ -348,8 +409,8 @@ def get_sector_statistics(analysis_ids, use_cached_only=True):
             })
     
     # Sort by different metrics
-    by_return = sorted(sector_stats, key=lambda x: x['avg_return'], reverse=True)[:5]
-    by_risk = sorted(sector_stats, key=lambda x: x['risk'], reverse=True)[:5]
+    by_return = heapq.nlargest(5, sector_stats, key=lambda x: x['avg_return'])
+    by_risk = heapq.nlargest(5, sector_stats, key=lambda x: x['risk'])
     
     # Get cache info
     cache_info = get_sector_stats_cache_info()
@@ -372,19 +433,20 @@ def get_cached_benchmark_return(ticker, days):
         end_date = date.today()
         start_date = end_date - timedelta(days=days)
         
-        start_price = BenchmarkPrice.query.filter(
-            BenchmarkPrice.ticker == ticker,
-            BenchmarkPrice.date <= start_date
-        ).order_by(BenchmarkPrice.date.desc()).first()
+        # Fetch both "latest on or before" prices in a single round trip
+        def _latest_close(target_date):
+            return select(BenchmarkPrice.close_price).where(
+                BenchmarkPrice.ticker == ticker,
+                BenchmarkPrice.date <= target_date
+            ).order_by(BenchmarkPrice.date.desc()).limit(1).scalar_subquery()
         
-        end_price = BenchmarkPrice.query.filter(
-            BenchmarkPrice.ticker == ticker,
-            BenchmarkPrice.date <= end_date
-        ).order_by(BenchmarkPrice.date.desc()).first()
+        start_price, end_price = db.session.execute(
+            select(_latest_close(start_date), _latest_close(end_date))
+        ).one()
         
         if start_price and end_price:
-            return ((float(end_price.close_price) - float(start_price.close_price)) / 
-                    float(start_price.close_price)) * 100
+            return ((float(end_price) - float(start_price)) / 
+                    float(start_price)) * 100
     except Exception as e:
         pass
     
@@ -417,18 +479,22 @@ def _get_benchmark_series_from_cache(dates, ticker):
     
     first_date = normalized_dates[0]
     
-    # Get base price (price at or before first date)
-    base_price_rec = BenchmarkPrice.query.filter(
-        BenchmarkPrice.ticker == ticker,
-        BenchmarkPrice.date <= first_date
-    ).order_by(BenchmarkPrice.date.desc()).first()
+    # Get base price (price at or before first date) as a plain (date, close_price) row
+    base_price_rec = db.session.execute(
+        select(BenchmarkPrice.date, BenchmarkPrice.close_price).where(
+            BenchmarkPrice.ticker == ticker,
+            BenchmarkPrice.date <= first_date
+        ).order_by(BenchmarkPrice.date.desc()).limit(1)
+    ).first()
     
     if base_price_rec is None:
         # Try to get earliest price after first date
-        base_price_rec = BenchmarkPrice.query.filter(
-            BenchmarkPrice.ticker == ticker,
-            BenchmarkPrice.date >= first_date
-        ).order_by(BenchmarkPrice.date.asc()).first()
+        base_price_rec = db.session.execute(
+            select(BenchmarkPrice.date, BenchmarkPrice.close_price).where(
+                BenchmarkPrice.ticker == ticker,
+                BenchmarkPrice.date >= first_date
+            ).order_by(BenchmarkPrice.date.asc()).limit(1)
+        ).first()
     
     if base_price_rec is None:
         # No data at all - use approximate synthetic data
@@ -437,23 +503,25 @@ def _get_benchmark_series_from_cache(dates, ticker):
         
         # Generate simple synthetic series based on annual return
         annual = {'SPY': 10.0, 'VT': 9.0, 'EEMS': 7.0}.get(ticker, 8.0)
-        for i, current_date in enumerate(normalized_dates):
-            days_from_start = (current_date - first_date).days
-            ret = (annual / 365.0) * days_from_start
-            series.append(round(ret, 2))
-        return series
+        days_from_start = (
+            np.array(normalized_dates, dtype='datetime64[D]') - np.datetime64(first_date, 'D')
+        ).astype('int64')
+        return np.round((annual / 365.0) * days_from_start, 2).tolist()
     
     base_price = float(base_price_rec.close_price)
     base_price_date = base_price_rec.date
     
     # Get all available prices for this ticker up to the last date
     last_date = normalized_dates[-1]
+    # Select raw columns only - avoids ORM instance hydration for every price row
     all_prices = {}
-    for bp in BenchmarkPrice.query.filter(
-        BenchmarkPrice.ticker == ticker,
-        BenchmarkPrice.date <= last_date
-    ).all():
-        all_prices[bp.date] = float(bp.close_price)
+    for price_date, close_price in db.session.execute(
+        select(BenchmarkPrice.date, BenchmarkPrice.close_price).where(
+            BenchmarkPrice.ticker == ticker,
+            BenchmarkPrice.date <= last_date
+        ).order_by(BenchmarkPrice.date)
+    ):
+        all_prices[price_date] = float(close_price)
     
     if not all_prices:
         # No prices at all - return flat line
@@ -496,7 +564,21 @@ def _get_benchmark_series_from_cache(dates, ticker):
 
 
 def get_analyst_rankings():
-    """Get various analyst rankings."""
+    """
+    Get various analyst rankings.
+    
+    Rankings are global and only change when analyses, users or performance
+    calculations change, so the result is memoized for RANKINGS_CACHE_TTL.
+    """
+    rankings = _rankings_cache.get('rankings')
+    if rankings is MISSING:
+        rankings = _compute_analyst_rankings()
+        _rankings_cache.set('rankings', rankings)
+    return rankings
+
+
+def _compute_analyst_rankings():
+    """Compute analyst rankings from the database (uncached)."""
     calculator = PerformanceCalculator()
     
     # Get all analysts performance
@@ -517,7 +599,7 @@ def get_analyst_rankings():
             'analyst_name': user.full_name or user.email.split('@')[0],
             'count': count
         })
-    top_board_approved = sorted(board_approved_counts, key=lambda x: x['count'], reverse=True)[:5]
+    top_board_approved = heapq.nlargest(5, board_approved_counts, key=lambda x: x['count'])
     
     # 2. Top 5 by total analyses (approved + neutral + refused)
     total_counts = []
@@ -534,7 +616,7 @@ def get_analyst_rankings():
             'analyst_name': user.full_name or user.email.split('@')[0],
             'count': count
         })
-    top_total = sorted(total_counts, key=lambda x: x['count'], reverse=True)[:5]
+    top_total = heapq.nlargest(5, total_counts, key=lambda x: x['count'])
     
     # 3. Top 5 by win rate (min 3 analyses)
     win_rates = []
@@ -546,14 +628,14 @@ def get_analyst_rankings():
                 'win_rate': perf['win_rate'],
                 'num_analyses': perf['num_analyses']
             })
-    top_win_rate = sorted(win_rates, key=lambda x: x['win_rate'], reverse=True)[:5]
+    top_win_rate = heapq.nlargest(5, win_rates, key=lambda x: x['win_rate'])
     
     # 4. Top 5 by performance
-    top_performance = sorted(
+    top_performance = heapq.nlargest(
+        5,
         [p for p in all_perfs if p['avg_return'] is not None],
-        key=lambda x: x['avg_return'],
-        reverse=True
-    )[:5]
+        key=lambda x: x['avg_return']
+    )
     
     return {
         'top_board_approved': top_board_approved,
@@ -600,15 +682,25 @@ def dashboard():
     
     calculator = PerformanceCalculator()
     
-    # Count analyses where user is analyst (role 'analyst')
-    my_analyses = db.session.query(Analysis).join(
+    # Fetch every analysis the user is involved in, with its role and latest
+    # return, in one query; counts, stock impacts and recent analyses are
+    # all derived from these rows.
+    latest_return = select(PerformanceCalculation.return_pct).where(
+        PerformanceCalculation.analysis_id == Analysis.id
+    ).order_by(PerformanceCalculation.calculation_date.desc()).limit(1).correlate(Analysis).scalar_subquery()
+    
+    rows = db.session.query(
+        Analysis, analysis_analysts.c.role, latest_return
+    ).join(
         analysis_analysts, Analysis.id == analysis_analysts.c.analysis_id
     ).filter(
-        analysis_analysts.c.user_id == current_user.id,
-        analysis_analysts.c.role == 'analyst'
-    ).all()
+        analysis_analysts.c.user_id == current_user.id
+    ).options(joinedload(Analysis.company)).order_by(desc(Analysis.analysis_date)).all()
     
-    approved = [a for a in my_analyses if a.status == 'On Watchlist']
+    # Count analyses where user is analyst (role 'analyst')
+    my_analyses = [a for a, role, _ in rows if role == 'analyst']
+    approved_rows = [(a, ret) for a, role, ret in rows
+                     if role == 'analyst' and a.status == 'On Watchlist']
     
     # Calculate performance
     perf = calculator.get_analyst_performance(current_user.id)
@@ -649,18 +741,15 @@ def dashboard():
     ai_insights = generate_ai_insights(perf, comparison_data)
     
     # Calculate stock impacts
-    stock_impacts = calculate_stock_impacts(current_user.id)
+    stock_impacts = calculate_stock_impacts(approved_rows)
     
-    # Recent analyses
-    recent = db.session.query(Analysis).join(
-        analysis_analysts, Analysis.id == analysis_analysts.c.analysis_id
-    ).filter(
-        analysis_analysts.c.user_id == current_user.id
-    ).order_by(desc(Analysis.analysis_date)).limit(10).all()
+    # Recent analyses (rows are already ordered by analysis date, newest first;
+    # an analysis can appear once per role, so de-duplicate by id)
+    recent = list({a.id: a for a, _, _ in rows}.values())[:10]
     
     return render_template('analyst/dashboard.html',
                            total_analyses=len(my_analyses),
-                           approved_analyses=len(approved),
+                           approved_analyses=len(approved_rows),
                            performance=perf,
                            recent_analyses=recent,
                            team_avg_return=team_avg_return,
@@ -744,18 +833,21 @@ def overview():
     # Check if we should auto-refresh (cache older than 7 days)
     cache_key = f"{current_filter}_{calc_method}"
     cache_age_days = get_cache_age_days(cache_key)
-    auto_refresh = cache_age_days is None or cache_age_days >= 7
+    cache_stale = cache_age_days is not None and cache_age_days >= 7
+    auto_refresh = cache_age_days is None or cache_stale
     
     # Try to get cached data
     cache_data = None
     from_cache = False
     
-    if not force_refresh and not auto_refresh:
+    if not force_refresh:
         # Try the specific cache first
-        cache_data = get_cached_overview_data(cache_key)
+        if not auto_refresh:
+            cache_data = get_cached_overview_data(cache_key)
         
-        # If not found, try broader view caches (smart filtering)
-        if not cache_data:
+        # If not found, derive it from the cached view basis (smart filtering).
+        # A stale view is due for a real refresh, so it is never re-derived.
+        if not cache_data and not cache_stale:
             cache_data = _try_broader_view_cache(current_filter, calc_method)
     
     if cache_data and not force_refresh:
@@ -800,7 +892,7 @@ def overview():
     cache_status = get_cache_status() if current_user.is_admin else None
     
     # Check if we need to show auto-refresh notice
-    needs_refresh = cache_age_days is not None and cache_age_days >= 7
+    needs_refresh = cache_stale
     
     return render_template('analyst/overview.html',
                            current_filter=current_filter,
@@ -819,39 +911,57 @@ def overview():
 
 def _try_broader_view_cache(current_filter: str, calc_method: str) -> Optional[Dict]:
     """
-    Try to find cached data from a broader view that can filter to current view.
+    Derive the current view from the cached view basis when its own cache is missing.
     
     View hierarchy: all > approved_neutral > all_approved > board_approved > purchased
     
-    Returns cached data if found and can be filtered, None otherwise.
+    The basis holds every position's return on every date of every view's
+    series grid, so the view's series are re-aggregated in memory and
+    benchmarks are rebuilt for the view's own date range. The derived
+    data is saved as the view's cache with the basis' cached_at, so it
+    expires together with the data it was derived from.
     
-    NOTE: Currently disabled because returning broader view data without
-    recalculating series causes incorrect benchmark values. Each view must
-    have its own correctly calculated series data.
+    Returns derived cache data, or None if no usable basis exists.
     """
-    # DISABLED: Broader view cache lookup causes incorrect benchmark series
-    # because series data needs to be recalculated for each specific view's
-    # date range and analysis set. Returning broader view data results in
-    # wrong benchmark amplitudes for narrower views.
-    return None
+    from ..utils.overview_cache import get_cached_base_data, save_overview_cache
+    from ..utils.unified_calculator import UnifiedDataCalculator
+    
+    cached_base = get_cached_base_data(calc_method)
+    if cached_base is None:
+        return None
+    
+    basis, meta = cached_base
+    view_data = UnifiedDataCalculator().derive_view_from_basis(basis, meta, current_filter, calc_method)
+    if view_data is None:
+        return None
+    
+    logger.info(f"Derived {current_filter}_{calc_method} overview from cached view basis")
+    save_overview_cache(f"{current_filter}_{calc_method}", view_data,
+                        cached_at=datetime.fromisoformat(meta['cached_at']))
+    return view_data
 
 
 @analyst_bp.route('/analyses')
 @login_required
 def analyses():
     """List all analyses where the user is involved (as analyst or opponent)."""
-    page = request.args.get('page', 1, type=int)
     per_page = 20
     
     analyses_query = db.session.query(Analysis).join(
         analysis_analysts, Analysis.id == analysis_analysts.c.analysis_id
     ).filter(
         analysis_analysts.c.user_id == current_user.id
-    ).order_by(desc(Analysis.analysis_date))
+    )
     
-    pagination = analyses_query.paginate(page=page, per_page=per_page)
+    # Keyset pages on (analysis_date, id), so deep pages cost the same as
+    # the first one (no OFFSET scan)
+    items, next_cursor, prev_cursor = keyset_page(
+        analyses_query, per_page, Analysis.analysis_date, Analysis.id,
+        after=request.args.get('after'), before=request.args.get('before')
+    )
     
-    return render_template('analyst/analyses.html', pagination=pagination)
+    return render_template('analyst/analyses.html', analyses=items,
+                           next_cursor=next_cursor, prev_cursor=prev_cursor)
 
 
 # =============================================================================
@@ -865,48 +975,21 @@ def recalculate_progress():
     SSE endpoint for real-time recalculation progress updates.
     Streams progress data as server-sent events.
     """
-    from ..utils.unified_calculator import get_progress
-    import json
-    import time
+    from ..utils.unified_calculator import iter_progress_updates, encode_progress_event, SSE_KEEPALIVE
     
     def generate():
-        last_status = None
-        last_logs_count = 0
-        idle_count = 0
+        # Comment frame flushes headers immediately so the client's onopen
+        # fires without waiting for the first progress payload
+        yield b": connected\n\n"
         
-        while True:
-            progress = get_progress()
-            current_status = progress.status
-            current_logs = progress.logs
-            
-            # Always send first update to establish connection
-            # Then only send if something changed
-            should_send = (last_status is None or 
-                          current_status != last_status or 
-                          len(current_logs) != last_logs_count)
-            
-            if should_send:
-                data = progress.to_dict()
-                yield f"data: {json.dumps(data)}\n\n"
-                
-                last_status = current_status
-                last_logs_count = len(current_logs)
-                idle_count = 0
-                
-                # If completed or error, stop streaming after a few more seconds
-                if current_status in ['completed', 'error']:
-                    # Keep connection open a bit longer to ensure client gets final state
-                    time.sleep(2)
-                    yield f"data: {json.dumps(progress.to_dict())}\n\n"
-                    break
+        # Updates are pushed as soon as the calculator reports a change,
+        # from whichever worker runs it (see iter_progress_updates)
+        for data in iter_progress_updates(keepalive_interval=15):
+            if data is None:
+                # Comment line keeps proxies from closing an idle connection
+                yield SSE_KEEPALIVE
             else:
-                # Send heartbeat every 10 seconds to keep connection alive
-                idle_count += 1
-                if idle_count >= 20:  # 20 * 0.5s = 10 seconds
-                    yield f"data: {json.dumps(progress.to_dict())}\n\n"
-                    idle_count = 0
-            
-            time.sleep(0.5)  # Poll every 500ms
+                yield encode_progress_event(data)
     
     return current_app.response_class(
         generate(),
@@ -914,7 +997,8 @@ def recalculate_progress():
         headers={
             'Cache-Control': 'no-cache',
             'Connection': 'keep-alive',
-            'X-Accel-Buffering': 'no'  # Disable nginx buffering
+            'X-Accel-Buffering': 'no',  # Disable nginx buffering
+            'Content-Encoding': 'identity'  # Keep compressing proxies from buffering
         }
     )
 
@@ -932,48 +1016,14 @@ def recalculate_all():
         logger.warning(f"Unauthorized recalculation attempt by {current_user.email}")
         return jsonify({'error': 'Unauthorized - Admin access required'}), 403
     
-    from ..utils.unified_calculator import recalculate_all_unified, reset_progress, get_progress, is_calculation_running
-    from ..utils.overview_cache import save_overview_cache, invalidate_cache
-    import threading
-    
-    # Check if already running
-    if is_calculation_running():
-        logger.warning("Recalculation already in progress")
-        return jsonify({'error': 'Recalculation already in progress'}), 409
-    
-    # Capture the app in the closure
-    app = current_app._get_current_object()
-    
-    def run_recalculation():
-        """Run recalculation in background thread."""
-        logger.info("Background recalculation thread started")
-        try:
-            with app.app_context():
-                all_views_data = recalculate_all_unified(force=True)
-                
-                # Save all views to cache (keys already include method from calculator)
-                for cache_key, view_data in all_views_data.items():
-                    save_overview_cache(cache_key, view_data)
-                
-                logger.info("Background recalculation completed successfully")
-        except Exception as e:
-            logger.exception("Error during background recalculation")
-            progress = get_progress()
-            progress.update_status("error")
-            progress.log(f"ERROR: {str(e)}")
+    from ..tasks import start_overview_recalculation
     
     try:
-        # Reset progress and start recalculation in background
-        reset_progress()
-        progress = get_progress()
-        progress.log("Recalculation endpoint called - starting background thread...")
-        
-        # Start recalculation in background thread
-        thread = threading.Thread(target=run_recalculation, name="RecalculationThread")
-        thread.daemon = True
-        thread.start()
-        
-        logger.info("Recalculation background thread started successfully")
+        # Start recalculation in background (a separate process when Redis is
+        # configured, otherwise a thread); fails if the lock is already taken
+        if not start_overview_recalculation(current_app._get_current_object(), force=True):
+            logger.warning("Recalculation already in progress")
+            return jsonify({'error': 'Recalculation already in progress'}), 409
         
         return jsonify({
             'success': True,
@@ -3,6 +3,11 @@ from wtforms import StringField, PasswordField, SubmitField, BooleanField
 from wtforms.validators import DataRequired, Email, Length, EqualTo, ValidationError
 import re
 
+# Registration is restricted to club addresses
+ALLOWED_DOMAIN = 'klubinvestoru.com'
+_ALLOWED_SUFFIX = '@' + ALLOWED_DOMAIN
+_EMAIL_RE = re.compile(r'^[^@]+@[^@]+\.[^@]+$')
+
 class LoginForm(FlaskForm):
     email = StringField('Email', validators=[DataRequired(), Email()])
     password = PasswordField('Password', validators=[DataRequired()])
@@ -23,12 +28,12 @@ class RegistrationForm(FlaskForm):
     submit = SubmitField('Register')
 
     def validate_email(self, field):
-        # Domain restriction
-        allowed_domain = 'klubinvestoru.com'
-        if not field.data.lower().endswith('@' + allowed_domain):
-            raise ValidationError(f'Email must end with @{allowed_domain}')
+        email = field.data
+        # Domain restriction (only the domain part is case-insensitive)
+        if email[-len(_ALLOWED_SUFFIX):].lower() != _ALLOWED_SUFFIX:
+            raise ValidationError(f'Email must end with @{ALLOWED_DOMAIN}')
         # Additional email validation (basic)
-        if not re.match(r'^[^@]+@[^@]+\.[^@]+$', field.data):
+        if not _EMAIL_RE.match(email):
             raise ValidationError('Invalid email format')
 
 class ForgotPasswordForm(FlaskForm):
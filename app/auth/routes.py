@@ -1,13 +1,15 @@
 from flask import Blueprint, render_template, redirect, url_for, flash, request, current_app
 from flask_login import login_user, logout_user, current_user, login_required
+from sqlalchemy.orm import load_only
 from .forms import LoginForm, RegistrationForm, ForgotPasswordForm, ResetPasswordForm, TokenForm
-from .utils import create_password_reset_token, validate_token
+from .utils import create_password_reset_token, validate_token, validate_any_token
 from ..email_service import send_password_setup_email, send_password_reset_email
 from ..extensions import db, login_manager
 from ..models import User, ActivityLog
 from ..security import rate_limit, validate_email, validate_password
-from datetime import datetime
 from ..utils.email_normalization import normalize_email
+from ..utils.activity_logger import log_activity_entry
+from ..utils.request_time import utc_now
 
 auth_bp = Blueprint('auth', __name__, template_folder='../templates/auth')
 
@@ -24,18 +26,27 @@ def login():
         if not is_valid:
             flash('Invalid email format.', 'danger')
             return redirect(url_for('auth.login'))
-        user = User.query.filter_by(email=normalized_email).first()
+        # Only the columns the login check needs - no full_name, timestamps, etc.
+        user = User.query.options(
+            load_only(User.id, User.email, User.password_hash, User.is_active, User.is_admin)
+        ).filter_by(email=normalized_email).first()
         if user is None or not user.check_password(form.password.data):
             flash('Invalid email or password.', 'danger')
-            log_activity(user, 'login_failed', f'Failed login attempt for {form.email.data}')
+            # Failed logins are security-relevant - write them immediately
+            log_activity(user, 'login_failed', f'Failed login attempt for {form.email.data}', sync=True)
             return redirect(url_for('auth.login'))
         if not user.is_active:
             flash('Your account is inactive. Please contact an administrator.', 'warning')
             return redirect(url_for('auth.login'))
         login_user(user, remember=form.remember.data)
-        user.last_login = datetime.utcnow()
+        user.last_login = utc_now()
+        # Record the login in the same transaction as last_login - one commit
+        db.session.add(ActivityLog(
+            user_id=user.id,
+            action='login_success',
+            ip_address=request.remote_addr
+        ))
         db.session.commit()
-        log_activity(user, 'login_success')
         flash('Logged in successfully.', 'success')
         next_page = request.args.get('next')
         # Validate redirect URL to prevent open redirect attacks
@@ -72,7 +83,7 @@ def register():
                 log_activity(existing_user, 'registration_resent')
                 return redirect(url_for('auth.login'))
         # Create new inactive user with normalized email
-        is_admin = normalized_email == normalize_email(current_app.config['ADMIN_EMAIL'])
+        is_admin = normalized_email == _get_admin_email_normalized()
         new_user = User(
             email=normalized_email,
             full_name=form.full_name.data,
@@ -161,15 +172,8 @@ def reset_password(token):
     if current_user.is_authenticated:
         return redirect(url_for('analyst.dashboard'))
     
-    # Determine token type without consuming it yet
-    token_type = None
-    user = validate_token(token, token_type='registration', consume=False)
-    if user:
-        token_type = 'registration'
-    else:
-        user = validate_token(token, token_type='reset', consume=False)
-        if user:
-            token_type = 'reset'
+    # Determine token type without consuming it yet (one lookup for either type)
+    user, token_type = validate_any_token(token, consume=False)
     
     if not user:
         flash('Invalid or expired token.', 'danger')
@@ -239,16 +243,26 @@ def logout():
     flash('You have been logged out.', 'info')
     return redirect(url_for('main.index'))
 
-def log_activity(user, action, details=None):
-    """Helper to log an activity."""
-    log = ActivityLog(
+def _get_admin_email_normalized():
+    """Normalized ADMIN_EMAIL, computed once per app."""
+    normalized = current_app.extensions.get('admin_email_norm')
+    if normalized is None:
+        normalized = normalize_email(current_app.config['ADMIN_EMAIL'])
+        current_app.extensions['admin_email_norm'] = normalized
+    return normalized
+
+def log_activity(user, action, details=None, sync=False):
+    """Helper to log an activity.
+    
+    Entries are written in the background unless sync is True.
+    """
+    log_activity_entry(
         user_id=user.id if user else None,
         action=action,
         details=details,
-        ip_address=request.remote_addr
+        ip_address=request.remote_addr,
+        sync=sync
     )
-    db.session.add(log)
-    db.session.commit()
 
 @auth_bp.route('/toggle-user-view', methods=['POST'])
 @login_required
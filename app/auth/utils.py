@@ -1,24 +1,52 @@
+import hashlib
+import hmac
 import secrets
-from datetime import datetime, timedelta
-from werkzeug.security import generate_password_hash, check_password_hash
+from datetime import timedelta
+from werkzeug.security import check_password_hash
 from itsdangerous import URLSafeTimedSerializer
-from flask import current_app, url_for
-from flask_mail import Message
-from ..extensions import mail, db
+from flask import current_app
+from sqlalchemy.orm import joinedload
+from ..extensions import db
+# Email sending lives in email_service (queued, off the request thread); the
+# names stay importable from here for older callers
+from ..email_service import send_email, send_password_reset_email, send_password_setup_email
 from ..models import User, PasswordResetToken
+from ..utils.request_time import utc_now
 
 def generate_token():
     """Generate a secure random token (URL‑safe)."""
     return secrets.token_urlsafe(32)
 
+def token_lookup_digest(token):
+    """Return the deterministic HMAC-SHA256 digest used to look a token up."""
+    key = current_app.config['SECRET_KEY'].encode()
+    return hmac.new(key, token.encode(), hashlib.sha256).hexdigest()
+
+def hash_token(token):
+    """Hash a token for storage.
+    
+    Tokens are 256 bits of randomness, so a keyed HMAC is enough - key
+    stretching (PBKDF2) would only cost CPU on every email and check.
+    """
+    key = current_app.config['TOKEN_HMAC_KEY'].encode()
+    return hmac.new(key, token.encode(), hashlib.sha256).hexdigest()
+
+def check_token_hash(token_hash, token):
+    """Check a token against its stored hash."""
+    if '$' in token_hash:
+        # Werkzeug password hash ("method$salt$hash") of a token issued before HMAC hashing
+        return check_password_hash(token_hash, token)
+    return hmac.compare_digest(token_hash, hash_token(token))
+
 def create_password_reset_token(user, token_type='reset', expires_hours=24):
     """Create a token record in the database."""
     token = generate_token()
-    expires_at = datetime.utcnow() + timedelta(hours=expires_hours)
-    token_hash = generate_password_hash(token)
+    expires_at = utc_now() + timedelta(hours=expires_hours)
+    token_hash = hash_token(token)
     token_record = PasswordResetToken(
         user_id=user.id,
         token_hash=token_hash,
+        token_lookup=token_lookup_digest(token),
         token_type=token_type,
         expires_at=expires_at
     )
@@ -26,182 +54,53 @@ def create_password_reset_token(user, token_type='reset', expires_hours=24):
     db.session.commit()
     return token
 
-def validate_token(token, token_type='reset', consume=True):
-    """Validate a token and return the user if valid.
+def _find_valid_token(token, token_type):
+    """Return the unused, unexpired token record matching token, or None.
     
-    If consume is True (default), the token will be marked as used.
+    token_type=None matches tokens of any type.
     """
-    # Find all token records of the given type that are unused and not expired
-    token_records = PasswordResetToken.query.filter(
-        PasswordResetToken.token_type == token_type,
+    # The caller always needs the user - fetch it in the same round trip
+    active = PasswordResetToken.query.options(
+        joinedload(PasswordResetToken.user)
+    ).filter(
         PasswordResetToken.used == False,
-        PasswordResetToken.expires_at > datetime.utcnow()
-    ).all()
-    for token_record in token_records:
+        PasswordResetToken.expires_at > utc_now()
+    )
+    if token_type is not None:
+        active = active.filter(PasswordResetToken.token_type == token_type)
+    # Indexed lookup by digest - at most one password hash check per attempt
+    token_record = active.filter(
+        PasswordResetToken.token_lookup == token_lookup_digest(token)
+    ).first()
+    if token_record is not None:
+        candidates = [token_record]
+    else:
+        # Tokens issued before token_lookup existed can only be found by scanning
+        candidates = active.filter(PasswordResetToken.token_lookup.is_(None)).all()
+    for token_record in candidates:
         # Verify token hash
-        if check_password_hash(token_record.token_hash, token):
-            if consume:
-                token_record.used = True
-                db.session.commit()
-            return token_record.user
+        if check_token_hash(token_record.token_hash, token):
+            return token_record
     return None
 
-def send_password_setup_email(user, token):
-    """Send email with activation code and clickable link.
-    
-    Returns True if email was sent successfully, False otherwise.
-    """
-    subject = 'Set up your password for Analyst Performance Tracker'
-    setup_url = url_for('auth.set_password', token=token, _external=True)
-    body = f'''Hello,
-
-You have been invited to set up your account at Analyst Performance Tracker.
-
-Please click the following link to create your password (valid for 24 hours):
-
-{setup_url}
-
-If you didn't expect this invitation, please ignore this email.
-
-Best regards,
-The Analyst Performance Tracker Team
-'''
-    html = f'''<!DOCTYPE html>
-<html>
-<head>
-    <meta charset="utf-8">
-    <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>{subject}</title>
-</head>
-<body style="margin: 0; padding: 0; font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, 'Helvetica Neue', Arial, sans-serif; background-color: #f6f9f6; color: #333;">
-    <table role="presentation" width="100%" cellspacing="0" cellpadding="0" style="max-width: 600px; margin: 0 auto; padding: 20px;">
-        <tr>
-            <td style="text-align: center; padding: 30px 0;">
-                <div style="display: inline-block; background: linear-gradient(135deg, #10b981 0%, #059669 100%); padding: 20px 30px; border-radius: 16px; margin-bottom: 20px;">
-                    <span style="font-size: 32px;">📊</span>
-                </div>
-                <h1 style="margin: 0; color: #065f46; font-size: 28px; font-weight: 700;">Analyst Performance Tracker</h1>
-            </td>
-        </tr>
-        <tr>
-            <td style="background: #ffffff; border-radius: 16px; padding: 40px; box-shadow: 0 4px 6px rgba(0, 0, 0, 0.05);">
-                <h2 style="margin: 0 0 20px 0; color: #1f2937; font-size: 24px;">Welcome! 👋</h2>
-                <p style="margin: 0 0 24px 0; color: #4b5563; font-size: 16px; line-height: 1.6;">
-                    You have been invited to set up your account. Click the button below to create your password and get started.
-                </p>
-                <table role="presentation" width="100%" cellspacing="0" cellpadding="0">
-                    <tr>
-                        <td style="text-align: center; padding: 20px 0;">
-                            <a href="{setup_url}" style="display: inline-block; background: linear-gradient(135deg, #10b981 0%, #059669 100%); color: #ffffff; text-decoration: none; padding: 16px 40px; border-radius: 12px; font-size: 16px; font-weight: 600; box-shadow: 0 4px 14px rgba(16, 185, 129, 0.4);">
-                                Set Password →
-                            </a>
-                        </td>
-                    </tr>
-                </table>
-                <p style="margin: 24px 0 0 0; color: #9ca3af; font-size: 14px; text-align: center;">
-                    This link will expire in 24 hours.
-                </p>
-            </td>
-        </tr>
-        <tr>
-            <td style="text-align: center; padding: 30px 0; color: #9ca3af; font-size: 14px;">
-                <p style="margin: 0;">Analyst Performance Tracker</p>
-                <p style="margin: 8px 0 0 0; color: #d1d5db;">If you didn't expect this email, you can safely ignore it.</p>
-            </td>
-        </tr>
-    </table>
-</body>
-</html>'''
-    return send_email(user.email, subject, body, html)
-
-def send_password_reset_email(user, token):
-    """Send password‑reset email.
+def validate_token(token, token_type='reset', consume=True):
+    """Validate a token and return the user if valid.
     
-    Returns True if email was sent successfully, False otherwise.
+    If consume is True (default), the token will be marked as used.
     """
-    subject = 'Reset your password for Analyst Performance Tracker'
-    reset_url = url_for('auth.reset_password', token=token, _external=True)
-    body = f'''Hello,
+    user, _ = validate_any_token(token, token_type=token_type, consume=consume)
+    return user
 
-You have requested to reset your password for Analyst Performance Tracker.
-
-Please click the following link to choose a new password (valid for 24 hours):
-
-{reset_url}
-
-If you did not request this, please ignore this email.
-
-Best regards,
-The Analyst Performance Tracker Team
-'''
-    html = f'''<!DOCTYPE html>
-<html>
-<head>
-    <meta charset="utf-8">
-    <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>{subject}</title>
-</head>
-<body style="margin: 0; padding: 0; font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, 'Helvetica Neue', Arial, sans-serif; background-color: #f6f9f6; color: #333;">
-    <table role="presentation" width="100%" cellspacing="0" cellpadding="0" style="max-width: 600px; margin: 0 auto; padding: 20px;">
-        <tr>
-            <td style="text-align: center; padding: 30px 0;">
-                <div style="display: inline-block; background: linear-gradient(135deg, #10b981 0%, #059669 100%); padding: 20px 30px; border-radius: 16px; margin-bottom: 20px;">
-                    <span style="font-size: 32px;">📊</span>
-                </div>
-                <h1 style="margin: 0; color: #065f46; font-size: 28px; font-weight: 700;">Analyst Performance Tracker</h1>
-            </td>
-        </tr>
-        <tr>
-            <td style="background: #ffffff; border-radius: 16px; padding: 40px; box-shadow: 0 4px 6px rgba(0, 0, 0, 0.05);">
-                <h2 style="margin: 0 0 20px 0; color: #1f2937; font-size: 24px;">Reset Password 🔐</h2>
-                <p style="margin: 0 0 24px 0; color: #4b5563; font-size: 16px; line-height: 1.6;">
-                    You requested to reset your password. Click the button below to choose a new password.
-                </p>
-                <table role="presentation" width="100%" cellspacing="0" cellpadding="0">
-                    <tr>
-                        <td style="text-align: center; padding: 20px 0;">
-                            <a href="{reset_url}" style="display: inline-block; background: linear-gradient(135deg, #10b981 0%, #059669 100%); color: #ffffff; text-decoration: none; padding: 16px 40px; border-radius: 12px; font-size: 16px; font-weight: 600; box-shadow: 0 4px 14px rgba(16, 185, 129, 0.4);">
-                                Reset Password →
-                            </a>
-                        </td>
-                    </tr>
-                </table>
-                <p style="margin: 24px 0 0 0; color: #9ca3af; font-size: 14px; text-align: center;">
-                    This link will expire in 24 hours.
-                </p>
-                <p style="margin: 16px 0 0 0; color: #9ca3af; font-size: 14px; text-align: center;">
-                    If you didn't request this, you can safely ignore this email.
-                </p>
-            </td>
-        </tr>
-        <tr>
-            <td style="text-align: center; padding: 30px 0; color: #9ca3af; font-size: 14px;">
-                <p style="margin: 0;">Analyst Performance Tracker</p>
-            </td>
-        </tr>
-    </table>
-</body>
-</html>'''
-    return send_email(user.email, subject, body, html)
-
-def send_email(to, subject, body, html=None):
-    """Send an email via Flask‑Mail.
+def validate_any_token(token, token_type=None, consume=False):
+    """Validate a token of any type in a single lookup.
     
-    On Render free tier, SMTP may be blocked. Errors are logged but not raised
-    to prevent breaking user registration flow.
+    Returns:
+        Tuple of (user, token_type), or (None, None) if the token is invalid
     """
-    msg = Message(
-        subject=subject,
-        recipients=[to],
-        body=body,
-        html=html
-    )
-    try:
-        mail.send(msg)
-        current_app.logger.info(f'Email sent to {to}')
-        return True
-    except Exception as e:
-        current_app.logger.error(f'Failed to send email to {to}: {e}')
-        # Don't raise - allow registration to continue even if email fails
-        # On Render free tier, SMTP is often blocked
-        return False
\ No newline at end of file
+    token_record = _find_valid_token(token, token_type)
+    if token_record is None:
+        return None, None
+    if consume:
+        token_record.used = True
+        db.session.commit()
+    return token_record.user, token_record.token_type
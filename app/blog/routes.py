@@ -9,28 +9,107 @@ This module handles all blog-related functionality including:
 
 from flask import (
     Blueprint, render_template, redirect, url_for, flash, request, 
-    abort, current_app, jsonify, make_response
+    abort, current_app, jsonify, make_response, Response, stream_template
 )
 from flask_login import login_required, current_user
 from datetime import datetime
-from sqlalchemy import or_, desc
+from sqlalchemy import delete, or_, desc, false, func, not_, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import joinedload, load_only
+from sqlalchemy.orm.attributes import set_committed_value
+import hashlib
 import re
 import json
 import os
+import threading
 
 from ..extensions import db, csrf
-from ..models import BlogPost, User, Analysis, Company
+from ..models import BlogPost, BlogPostAttachment, User, Analysis, Company, DocumentImportJob
 from ..security import rate_limit, InputValidator, sanitize_input
+from ..utils.keyset import keyset_page
+from ..utils.request_time import utc_now
+from ..utils.view_counter import record_view, pending_views
+from ..utils.memo_cache import MemoCache, MISSING
+from ..utils.neon_cache import (
+    NEON_OPTIMIZE, get_cached_blog_index, get_cached_rss_posts, get_cached_sitemap_posts,
+    invalidate_blog_cache, invalidate_blog_post_cache, invalidate_main_cache
+)
 from . import blog_bp
 from ..utils.blog_ai_utils import (
     generate_seo_from_content,
     search_unsplash_images,
     get_featured_images_for_article,
     parse_document_file,
-    generate_complete_article_from_file,
     enhance_existing_post
 )
 
+# Editor category dropdown memo (10 minutes), dropped on any BlogPost write
+BLOG_CATEGORIES_CACHE_TTL = 600
+_categories_cache = MemoCache('blog_categories', ttl=BLOG_CATEGORIES_CACHE_TTL, maxsize=1)
+_categories_cache.clear_on_changes(BlogPost)
+
+# Filename patterns for parse_stock_analysis_filename, compiled once
+_PDF_EXTENSION_RE = re.compile(r'\.(pdf|PDF)$', re.IGNORECASE)
+# "Company Name (TICKER) Stock Analysis - KI AM"
+_STOCK_ANALYSIS_TITLE_RE = re.compile(r'^(.+?)\s*\(([A-Za-z]+)\)\s*Stock\s*Analysis\s*-\s*KI\s*AM$', re.IGNORECASE)
+# "Company TICKER Stock Analysis" or "Company (TICKER) Analysis"
+_ANALYSIS_TITLE_RE = re.compile(r'^(.+?)\s*\(?([A-Za-z]{2,5})\)?\s*(?:Stock\s*)?Analysis.*$', re.IGNORECASE)
+_PAREN_TICKER_RE = re.compile(r'\(([A-Za-z]{2,5})\)')
+_WHITESPACE_RE = re.compile(r'\s+')
+
+
+# Related post cards under an article (5 minutes), dropped on any BlogPost write
+RELATED_POSTS_CACHE_TTL = 300
+_related_posts_cache = MemoCache('blog_related_posts', ttl=RELATED_POSTS_CACHE_TTL, maxsize=512)
+_related_posts_cache.clear_on_changes(BlogPost)
+
+
+def _related_post_cards(blog_post) -> list:
+    """
+    Get up to three related published posts for the "Related Research" cards.
+    
+    Args:
+        blog_post: The post being viewed
+        
+    Returns:
+        List of dicts with slug, title, formatted_date and excerpt
+    """
+    # Published posts in NEON_OPTIMIZE mode use the simpler latest-posts query
+    latest_only = bool(blog_post.is_published and NEON_OPTIMIZE)
+    cache_key = (blog_post.id, blog_post.category, blog_post.author_id, latest_only)
+    cards = _related_posts_cache.get(cache_key)
+    if cards is not MISSING:
+        return cards
+    
+    # Related post cards only need these columns (never the PDF blob)
+    query = BlogPost.query.options(load_only(
+        BlogPost.id, BlogPost.slug, BlogPost.title, BlogPost.excerpt,
+        BlogPost.content, BlogPost.published_at, BlogPost.created_at
+    )).filter(
+        BlogPost.id != blog_post.id,
+        BlogPost.status == 'published',
+        BlogPost.is_public == True
+    )
+    
+    if not latest_only:
+        same_author = BlogPost.author_id == blog_post.author_id
+        if blog_post.category:
+            query = query.filter(or_(BlogPost.category == blog_post.category, same_author))
+        else:
+            query = query.filter(same_author)
+    
+    cards = [
+        {
+            'slug': related.slug,
+            'title': related.title,
+            'formatted_date': related.formatted_date,
+            'excerpt': related.get_excerpt(80),
+        }
+        for related in query.order_by(desc(BlogPost.published_at)).limit(3).all()
+    ]
+    _related_posts_cache.set(cache_key, cards)
+    return cards
+
 
 def parse_stock_analysis_filename(filename: str) -> tuple:
     """
@@ -48,11 +127,10 @@ def parse_stock_analysis_filename(filename: str) -> tuple:
         tuple: (suggested_title, company_name, ticker)
     """
     # Remove .pdf extension
-    name = re.sub(r'\.(pdf|PDF)$', '', filename, flags=re.IGNORECASE)
+    name = _PDF_EXTENSION_RE.sub('', filename)
     
     # Try to match pattern: "Company Name (TICKER) Stock Analysis - KI AM"
-    pattern = r'^(.+?)\s*\(([A-Za-z]+)\)\s*Stock\s*Analysis\s*-\s*KI\s*AM$'
-    match = re.match(pattern, name, re.IGNORECASE)
+    match = _STOCK_ANALYSIS_TITLE_RE.match(name)
     
     if match:
         company_name = match.group(1).strip()
@@ -62,8 +140,7 @@ def parse_stock_analysis_filename(filename: str) -> tuple:
     
     # Try alternative patterns
     # Pattern: "Company TICKER Stock Analysis" or "Company (TICKER) Analysis"
-    alt_pattern = r'^(.+?)\s*\(?([A-Za-z]{2,5})\)?\s*(?:Stock\s*)?Analysis.*$'
-    alt_match = re.match(alt_pattern, name, re.IGNORECASE)
+    alt_match = _ANALYSIS_TITLE_RE.match(name)
     
     if alt_match:
         company_name = alt_match.group(1).strip()
@@ -72,7 +149,7 @@ def parse_stock_analysis_filename(filename: str) -> tuple:
         return suggested_title, company_name, ticker
     
     # If no pattern matches, try to extract any ticker-like code (2-5 uppercase letters in parentheses)
-    ticker_match = re.search(r'\(([A-Za-z]{2,5})\)', name)
+    ticker_match = _PAREN_TICKER_RE.search(name)
     if ticker_match:
         ticker = ticker_match.group(1).upper()
         # Get text before the ticker
@@ -83,7 +160,7 @@ def parse_stock_analysis_filename(filename: str) -> tuple:
     
     # Fallback: clean up the filename and use as-is
     clean_name = name.replace('_', ' ').replace('-', ' ')
-    clean_name = re.sub(r'\s+', ' ', clean_name).strip()
+    clean_name = _WHITESPACE_RE.sub(' ', clean_name).strip()
     clean_name = ' '.join(word.capitalize() for word in clean_name.split())
     
     # If it doesn't end with KI AM branding, add it
@@ -111,8 +188,6 @@ def index():
     tag = request.args.get('tag', '')
     
     # Use cached data to avoid DB calls (Neon optimization)
-    from ..utils.neon_cache import get_cached_blog_index
-    
     cache_data = get_cached_blog_index(page=page, category=category, tag=tag)
     
     return render_template('blog/index.html',
@@ -137,11 +212,13 @@ def post(slug):
     Args:
         slug: URL-friendly unique identifier for the post
     """
-    import os
     from ..routes_webflow import webflow_aware_render
     
-    # Find post by slug (always hit DB for permissions check)
-    blog_post = BlogPost.query.filter_by(slug=slug).first_or_404()
+    # Find post by slug (always hit DB for permissions check); the author is
+    # shown on the page, so load it in the same query
+    blog_post = BlogPost.query.options(
+        joinedload(BlogPost.author)
+    ).filter_by(slug=slug).first_or_404()
     
     # Check visibility permissions
     if not blog_post.is_published:
@@ -155,43 +232,51 @@ def post(slug):
     if blog_post.is_published:
         if not current_user.is_authenticated or current_user.id != blog_post.author_id:
             # Skip view count increment in NEON_OPTIMIZE mode to reduce writes
-            if os.environ.get('NEON_OPTIMIZE', 'true').lower() != 'true':
-                blog_post.view_count += 1
-                db.session.commit()
+            if not NEON_OPTIMIZE:
+                # Buffered in memory and written in batches (see view_counter)
+                record_view(blog_post.id)
+        # Include views counted by this worker but not written yet
+        pending = pending_views(blog_post.id)
+        if pending:
+            set_committed_value(blog_post, 'view_count', (blog_post.view_count or 0) + pending)
     
-    # Get related posts (cached for public posts)
-    if blog_post.is_published and os.environ.get('NEON_OPTIMIZE', 'true').lower() == 'true':
-        # Use simpler related posts query to reduce DB load
-        related_posts = BlogPost.query.filter(
-            BlogPost.id != blog_post.id,
-            BlogPost.status == 'published',
-            BlogPost.is_public == True
-        ).order_by(desc(BlogPost.published_at)).limit(3).all()
-    else:
-        related_posts = BlogPost.query.filter(
-            BlogPost.id != blog_post.id,
-            BlogPost.status == 'published',
-            BlogPost.is_public == True
-        ).filter(
-            or_(
-                BlogPost.category == blog_post.category if blog_post.category else False,
-                BlogPost.author_id == blog_post.author_id
-            )
-        ).order_by(desc(BlogPost.published_at)).limit(3).all()
+    related_posts = _related_post_cards(blog_post)
     
     # SEO meta values
     seo_title = blog_post.title
     seo_description = blog_post.meta_description or blog_post.get_excerpt(160)
     seo_keywords = blog_post.meta_keywords or 'investment, analysis, KI Asset Management, finance, research'
-    og_image = blog_post.og_image or url_for('static', filename='images/og-default.jpg', _external=True)
+    og_image = blog_post.og_image or _og_default_url()
     
-    return webflow_aware_render('blog/post.html',
+    response = make_response(webflow_aware_render('blog/post.html',
                          post=blog_post,
                          related_posts=related_posts,
                          seo_title=seo_title,
                          seo_description=seo_description,
                          seo_keywords=seo_keywords,
-                         og_image=og_image)
+                         og_image=og_image))
+    # The page shows view counts and per-user controls, so the ETag is a hash
+    # of the rendered body; repeat loads of an unchanged page get a 304
+    response.add_etag()
+    return response.make_conditional(request)
+
+
+# Absolute URL of the default share image per URL root the site is served on
+# (the Host header is client-controlled, so the map is capped)
+_og_default_urls = {}
+OG_DEFAULT_URLS_MAX = 16
+
+
+def _og_default_url():
+    """Return the external URL of the default Open Graph image for this request's host."""
+    root = request.url_root
+    url = _og_default_urls.get(root)
+    if url is None:
+        if len(_og_default_urls) >= OG_DEFAULT_URLS_MAX:
+            _og_default_urls.clear()
+        url = url_for('static', filename='images/og-default.jpg', _external=True)
+        _og_default_urls[root] = url
+    return url
 
 
 @blog_bp.route('/pdf/<int:post_id>')
@@ -203,6 +288,8 @@ def serve_pdf(post_id):
     from flask import send_file
     import io
     
+    # The PDF bytes are deferred on the model and only loaded once we know
+    # the client does not already have them
     blog_post = BlogPost.query.get_or_404(post_id)
     
     # Check visibility - only serve published posts or if user has permission
@@ -212,16 +299,37 @@ def serve_pdf(post_id):
         if current_user.id != blog_post.author_id and not current_user.is_admin:
             abort(404)
     
-    # Check if PDF is stored in database
-    if blog_post.pdf_binary:
-        # Serve from database with caching
-        response = make_response(blog_post.pdf_binary)
-        response.headers['Content-Type'] = blog_post.pdf_content_type or 'application/pdf'
-        response.headers['Content-Disposition'] = f'inline; filename="{blog_post.pdf_filename or "document.pdf"}"'
-        # Cache for 24 hours (PDFs don't change often)
-        response.headers['Cache-Control'] = 'public, max-age=86400'
+    # Revalidation of an unchanged stored PDF: answer from the digest
+    # without pulling the blob out of the database
+    etag = blog_post.pdf_etag
+    if etag and blog_post.has_pdf_binary and etag in request.if_none_match:
+        response = Response(status=304)
+        response.set_etag(etag)
+        response.cache_control.public = True
+        response.cache_control.max_age = 86400
         return response
     
+    # Check if PDF is stored in database
+    pdf_data = blog_post.pdf_binary if blog_post.has_pdf_binary else None
+    if pdf_data:
+        # Serve from database with caching. send_file streams the body in
+        # blocks and answers Range requests (206), so PDF viewers can fetch
+        # the pages they show instead of the whole document.
+        if not etag:
+            # Stored before pdf_etag existed (see scripts/migrate_pdf_etag.py)
+            version = blog_post.updated_at.timestamp() if blog_post.updated_at else 0
+            etag = f'pdf-{blog_post.id}-{version:.0f}-{len(pdf_data)}'
+        return send_file(
+            io.BytesIO(pdf_data),
+            mimetype=blog_post.pdf_content_type or 'application/pdf',
+            download_name=blog_post.pdf_filename or 'document.pdf',
+            conditional=True,
+            etag=etag,
+            last_modified=blog_post.updated_at,
+            # Cache for 24 hours (PDFs don't change often)
+            max_age=86400
+        )
+    
     # Fallback to filesystem if not in database (legacy)
     if blog_post.pdf_path:
         full_path = os.path.join(current_app.root_path, 'static', blog_post.pdf_path)
@@ -236,161 +344,276 @@ def author_posts(user_id):
     """Show all posts by a specific author."""
     author = User.query.get_or_404(user_id)
     
-    page = request.args.get('page', 1, type=int)
     per_page = 9
     
-    # Only show published posts for public view
-    query = BlogPost.query.filter(
+    # Only show published posts for public view (a post without a publish
+    # date is not viewable, see BlogPost.is_published); load just what the
+    # cards show - content is the excerpt fallback and reading time
+    query = BlogPost.query.options(load_only(
+        BlogPost.id, BlogPost.title, BlogPost.slug, BlogPost.og_image, BlogPost.category,
+        BlogPost.excerpt, BlogPost.content, BlogPost.published_at, BlogPost.created_at,
+        BlogPost.pdf_path, BlogPost.has_pdf_binary
+    )).filter(
         BlogPost.author_id == user_id,
         BlogPost.status == 'published',
-        BlogPost.is_public == True
-    ).order_by(desc(BlogPost.published_at))
+        BlogPost.is_public == True,
+        BlogPost.published_at != None
+    )
     
-    pagination = query.paginate(page=page, per_page=per_page)
-    posts = pagination.items
+    # Keyset pages on (published_at, id) - no COUNT query per view
+    posts, next_cursor, prev_cursor = keyset_page(
+        query, per_page, BlogPost.published_at, BlogPost.id,
+        after=request.args.get('after'), before=request.args.get('before')
+    )
     
     author_name = author.full_name or author.email.split('@')[0]
     
     return render_template('blog/author.html',
                          posts=posts,
-                         pagination=pagination,
+                         next_cursor=next_cursor,
+                         prev_cursor=prev_cursor,
                          author=author,
                          author_name=author_name,
                          seo_title=f'Articles by {author_name} | KI Asset Management Research',
                          seo_description=f'Read investment research and analysis by {author_name} from KI Asset Management. Student research for educational purposes only.')
 
 
+def _buffered(chunks, size=64):
+    """Join streamed template chunks into groups so the server makes fewer writes."""
+    buffer = []
+    for chunk in chunks:
+        buffer.append(chunk)
+        if len(buffer) >= size:
+            yield ''.join(buffer)
+            buffer.clear()
+    if buffer:
+        yield ''.join(buffer)
+
+
+def _conditional_listing(response, posts, weak=False):
+    """
+    Tag a feed response with an ETag built from its posts' slugs and update times.
+    
+    The ETag is known before the streamed body is rendered, so a matching
+    If-None-Match gets a 304 without rendering the template at all.
+    """
+    digest = hashlib.blake2b(request.url_root.encode('utf-8'), digest_size=16)
+    for post in posts:
+        digest.update(f'{post.slug}|{post.updated_at}\n'.encode('utf-8'))
+    response.set_etag(digest.hexdigest(), weak=weak)
+    return response.make_conditional(request)
+
+
 @blog_bp.route('/feed.rss')
 def rss_feed():
     """Generate RSS feed for blog posts. Uses caching to minimize DB calls."""
-    from ..utils.neon_cache import get_cached_rss_posts
-    
     posts = get_cached_rss_posts()
     
-    response = make_response(render_template('blog/rss.xml', posts=posts))
-    response.headers['Content-Type'] = 'application/rss+xml; charset=utf-8'
-    return response
+    response = Response(_buffered(stream_template('blog/rss.xml', posts=posts)),
+                        content_type='application/rss+xml; charset=utf-8')
+    # Weak - lastBuildDate changes on every render even when the items do not
+    return _conditional_listing(response, posts, weak=True)
 
 
 @blog_bp.route('/sitemap.xml')
 def sitemap():
     """Generate XML sitemap for SEO. Uses caching to minimize DB calls."""
-    from ..utils.neon_cache import get_cached_sitemap_posts
-    
     posts = get_cached_sitemap_posts()
     
-    response = make_response(render_template('blog/sitemap.xml', posts=posts))
-    response.headers['Content-Type'] = 'application/xml; charset=utf-8'
-    return response
+    # Streamed - one <url> per published post, so the document grows with the blog
+    response = Response(_buffered(stream_template('blog/sitemap.xml', posts=posts)),
+                        content_type='application/xml; charset=utf-8')
+    return _conditional_listing(response, posts)
 
 
 # ============================================================================
 # MEMBER ROUTES (Blog Editor)
 # ============================================================================
 
+# Columns the post management tables show (plus the is_pdf_post inputs)
+_POST_LIST_COLUMNS = (
+    BlogPost.id, BlogPost.title, BlogPost.slug, BlogPost.og_image,
+    BlogPost.category, BlogPost.status, BlogPost.is_public, BlogPost.is_featured,
+    BlogPost.view_count, BlogPost.author_id, BlogPost.updated_at,
+    BlogPost.pdf_path, BlogPost.has_pdf_binary,
+)
+
+
 @blog_bp.route('/my-posts')
 @login_required
 def my_posts():
     """Show current user's blog posts (drafts and published)."""
-    page = request.args.get('page', 1, type=int)
     per_page = 12
     status_filter = request.args.get('status', '')
     
-    query = BlogPost.query.filter(BlogPost.author_id == current_user.id)
+    # Only what the table shows (content is the excerpt fallback)
+    query = BlogPost.query.options(load_only(
+        *_POST_LIST_COLUMNS, BlogPost.excerpt, BlogPost.content, BlogPost.published_at
+    )).filter(BlogPost.author_id == current_user.id)
     
     if status_filter:
         query = query.filter(BlogPost.status == status_filter)
     
-    query = query.order_by(desc(BlogPost.updated_at))
-    pagination = query.paginate(page=page, per_page=per_page)
+    # Keyset pages on (updated_at, id) - no COUNT query per view
+    posts, next_cursor, prev_cursor = keyset_page(
+        query, per_page, BlogPost.updated_at, BlogPost.id,
+        after=request.args.get('after'), before=request.args.get('before')
+    )
     
     return render_template('blog/my_posts.html',
-                         posts=pagination.items,
-                         pagination=pagination,
+                         posts=posts,
+                         next_cursor=next_cursor,
+                         prev_cursor=prev_cursor,
                          status_filter=status_filter)
 
 
+# Free-text fields of the post editor form
+_POST_FORM_FIELDS = (
+    'title', 'content', 'excerpt', 'meta_description', 'meta_keywords',
+    'category', 'tags', 'og_image', 'pdf_path', 'additional_pdfs',
+)
+
+# Checkbox fields of the post editor form, and the values that mean "checked"
+_POST_FORM_FLAGS = ('is_public', 'is_featured')
+_CHECKED_VALUES = frozenset({'on', 'true', '1', 'yes'})
+
+
+# Bounds on the editor's additional_pdfs JSON ([{name, path, type, desc}, ...])
+ADDITIONAL_PDFS_MAX_LENGTH = 64 * 1024
+ADDITIONAL_PDFS_MAX_ITEMS = 50
+ADDITIONAL_PDFS_MAX_KEYS = 20
+
+
+def _is_additional_pdfs_list(value):
+    """Check decoded additional_pdfs JSON is a short list of small objects."""
+    return (isinstance(value, list)
+            and len(value) <= ADDITIONAL_PDFS_MAX_ITEMS
+            and all(isinstance(item, dict) and len(item) <= ADDITIONAL_PDFS_MAX_KEYS for item in value))
+
+
+def _parse_post_form(form):
+    """
+    Read the editor's fields in one pass.
+    
+    Values are stripped and blank ones become None. meta_description and
+    meta_keywords are cut to their column sizes, and additional_pdfs is
+    decoded from JSON (None unless it is a list). content_type defaults to
+    'html', and the is_public/is_featured checkboxes become booleans.
+    
+    Args:
+        form: The submitted request.form
+    
+    Returns:
+        Dict of field name to value
+    """
+    get = form.get
+    fields = {name: get(name, '').strip() or None for name in _POST_FORM_FIELDS}
+    fields['content_type'] = get('content_type', 'html')
+    for name in _POST_FORM_FLAGS:
+        fields[name] = get(name, '').lower() in _CHECKED_VALUES
+    
+    if fields['meta_description']:
+        fields['meta_description'] = fields['meta_description'][:300]
+    if fields['meta_keywords']:
+        fields['meta_keywords'] = fields['meta_keywords'][:255]
+    
+    # Parse additional PDFs
+    additional_pdfs_json = fields['additional_pdfs']
+    fields['additional_pdfs'] = None
+    if additional_pdfs_json and len(additional_pdfs_json) > ADDITIONAL_PDFS_MAX_LENGTH:
+        current_app.logger.warning(f"Ignoring oversized additional_pdfs JSON ({len(additional_pdfs_json)} chars)")
+    elif additional_pdfs_json:
+        try:
+            additional_pdfs = json.loads(additional_pdfs_json)
+            if _is_additional_pdfs_list(additional_pdfs):
+                fields['additional_pdfs'] = additional_pdfs
+        except (json.JSONDecodeError, RecursionError):
+            current_app.logger.warning(f"Invalid additional_pdfs JSON: {additional_pdfs_json[:200]}")
+    
+    return fields
+
+
+# Slug suffixes tried (-2, -3, ...) before giving up on a new post
+SLUG_INSERT_ATTEMPTS = 5
+
+
+def _validate_post_form(fields):
+    """
+    Check the fields shared by the new and edit forms.
+    
+    Args:
+        fields: Dict from _parse_post_form
+    
+    Returns:
+        Tuple of (sanitized_title, error) - error is None when valid
+    """
+    if not fields['title']:
+        return None, 'Title is required.'
+    
+    # Either content or PDF is required
+    if not fields['content'] and not fields['pdf_path']:
+        return None, 'Either content or a PDF file is required.'
+    
+    is_valid, sanitized_title, error = InputValidator.validate_length('title', fields['title'], max_length=255)
+    if not is_valid:
+        return None, error
+    return sanitized_title, None
+
+
 @blog_bp.route('/new', methods=['GET', 'POST'])
 @login_required
 @rate_limit(limit=10, window=3600)  # 10 new posts per hour
 def new_post():
     """Create a new blog post. If is_public is checked, publish immediately."""
     if request.method == 'POST':
-        title = request.form.get('title', '').strip()
-        content = request.form.get('content', '').strip()
-        excerpt = request.form.get('excerpt', '').strip()
-        meta_description = request.form.get('meta_description', '').strip()
-        meta_keywords = request.form.get('meta_keywords', '').strip()
-        category = request.form.get('category', '').strip()
-        tags = request.form.get('tags', '').strip()
-        content_type = request.form.get('content_type', 'html')
-        is_public = request.form.get('is_public') == 'on'
-        pdf_path = request.form.get('pdf_path', '').strip()
-        additional_pdfs_json = request.form.get('additional_pdfs', '').strip()
-        
-        # Parse additional PDFs
-        additional_pdfs = None
-        if additional_pdfs_json:
-            try:
-                additional_pdfs = json.loads(additional_pdfs_json)
-                if not isinstance(additional_pdfs, list):
-                    additional_pdfs = None
-            except json.JSONDecodeError:
-                current_app.logger.warning(f"Invalid additional_pdfs JSON: {additional_pdfs_json}")
-                additional_pdfs = None
-        
-        # Validation
-        if not title:
-            flash('Title is required.', 'danger')
-            return redirect(url_for('blog.new_post'))
-        
-        # Either content or PDF is required
-        if not content and not pdf_path:
-            flash('Either content or a PDF file is required.', 'danger')
-            return redirect(url_for('blog.new_post'))
+        fields = _parse_post_form(request.form)
+        content_type = fields['content_type']
+        is_public = fields['is_public']
         
-        # Validate title length
-        is_valid, sanitized_title, error = InputValidator.validate_length('title', title, max_length=255)
-        if not is_valid:
+        sanitized_title, error = _validate_post_form(fields)
+        if error:
             flash(error, 'danger')
             return redirect(url_for('blog.new_post'))
         
         # Determine status based on is_public
         status = 'published' if is_public else 'draft'
-        published_at = datetime.utcnow() if is_public else None
+        published_at = utc_now() if is_public else None
         
         # Create post
         blog_post = BlogPost(
             title=sanitized_title,
-            content=content if content else '',
-            excerpt=excerpt if excerpt else None,
-            meta_description=meta_description[:300] if meta_description else None,
-            meta_keywords=meta_keywords[:255] if meta_keywords else None,
-            category=category if category else None,
-            tags=tags if tags else None,
+            content=fields['content'] or '',
+            excerpt=fields['excerpt'],
+            meta_description=fields['meta_description'],
+            meta_keywords=fields['meta_keywords'],
+            category=fields['category'],
+            tags=fields['tags'],
             content_type=content_type,
-            pdf_path=pdf_path if pdf_path else None,
-            additional_pdfs=additional_pdfs,
+            pdf_path=fields['pdf_path'],
+            additional_pdfs=fields['additional_pdfs'],
             is_public=is_public,
             author_id=current_user.id,
             status=status,
             published_at=published_at
         )
         
-        # Generate unique slug
-        blog_post.slug = blog_post.generate_slug()
-        
-        db.session.add(blog_post)
+        # Slugs end in a per-second timestamp, so two posts with the same
+        # title can collide - the UNIQUE index decides, retry with a suffix
+        base_slug = blog_post.generate_slug()
+        for attempt in range(1, SLUG_INSERT_ATTEMPTS + 1):
+            blog_post.slug = base_slug if attempt == 1 else f"{base_slug}-{attempt}"
+            try:
+                with db.session.begin_nested():
+                    db.session.add(blog_post)
+                break
+            except IntegrityError:
+                if attempt == SLUG_INSERT_ATTEMPTS:
+                    raise
         db.session.commit()
         
         # Invalidate caches if published
         if is_public:
-            from ..utils.neon_cache import invalidate_blog_cache, invalidate_main_cache
-            try:
-                invalidate_blog_cache()
-                invalidate_main_cache()
-            except Exception as e:
-                current_app.logger.warning(f"Failed to invalidate caches: {e}")
+            _invalidate_post_caches(blog_post.id)
             flash('Research article published successfully!', 'success')
         else:
             flash('Research article saved as draft. Check "Public" and save to publish.', 'success')
@@ -402,6 +625,30 @@ def new_post():
                          categories=get_blog_categories())
 
 
+def _invalidate_post_caches(post_id, listings=True):
+    """
+    Drop shared caches after a post change has been committed.
+    
+    Args:
+        post_id: ID of the changed post - entries showing it are dropped
+        listings: Also rebuild every blog and main-page listing (when the
+            set of listed posts changed)
+    """
+    try:
+        invalidate_blog_post_cache(post_id)
+        if listings:
+            invalidate_blog_cache()
+            invalidate_main_cache()
+    except Exception as e:
+        current_app.logger.warning(f"Failed to invalidate caches: {e}")
+
+
+def _listing_state(blog_post) -> tuple:
+    """Fields that decide which cached listings a post appears in."""
+    return (bool(blog_post.is_published), blog_post.category, blog_post.tags,
+            blog_post.is_featured, blog_post.published_at)
+
+
 @blog_bp.route('/edit/<int:post_id>', methods=['GET', 'POST'])
 @login_required
 def edit_post(post_id):
@@ -418,67 +665,42 @@ def edit_post(post_id):
         return redirect(url_for('blog.my_posts'))
     
     if request.method == 'POST':
-        title = request.form.get('title', '').strip()
-        content = request.form.get('content', '').strip()
-        excerpt = request.form.get('excerpt', '').strip()
-        meta_description = request.form.get('meta_description', '').strip()
-        meta_keywords = request.form.get('meta_keywords', '').strip()
-        category = request.form.get('category', '').strip()
-        tags = request.form.get('tags', '').strip()
-        content_type = request.form.get('content_type', 'html')
-        og_image = request.form.get('og_image', '').strip()
-        is_public = request.form.get('is_public') == 'on'
-        is_featured = request.form.get('is_featured') == 'on'
-        pdf_path = request.form.get('pdf_path', '').strip()
-        additional_pdfs_json = request.form.get('additional_pdfs', '').strip()
-        
-        # Parse additional PDFs
-        additional_pdfs = None
-        if additional_pdfs_json:
-            try:
-                additional_pdfs = json.loads(additional_pdfs_json)
-                if not isinstance(additional_pdfs, list):
-                    additional_pdfs = None
-            except json.JSONDecodeError:
-                current_app.logger.warning(f"Invalid additional_pdfs JSON: {additional_pdfs_json}")
-                additional_pdfs = None
-        
-        # Validation
-        if not title:
-            flash('Title is required.', 'danger')
-            return redirect(url_for('blog.edit_post', post_id=post_id))
+        fields = _parse_post_form(request.form)
+        content_type = fields['content_type']
+        is_public = fields['is_public']
+        is_featured = fields['is_featured']
         
-        # Either content or PDF is required
-        if not content and not pdf_path:
-            flash('Either content or a PDF file is required.', 'danger')
-            return redirect(url_for('blog.edit_post', post_id=post_id))
-        
-        # Validate title length
-        is_valid, sanitized_title, error = InputValidator.validate_length('title', title, max_length=255)
-        if not is_valid:
+        sanitized_title, error = _validate_post_form(fields)
+        if error:
             flash(error, 'danger')
             return redirect(url_for('blog.edit_post', post_id=post_id))
         
+        # What decides where the post is listed, to compare after the edit
+        listing_before = _listing_state(blog_post)
+        
+        # One timestamp for the whole save
+        now = utc_now()
+        
         # Update fields
         blog_post.title = sanitized_title
-        blog_post.content = content if content else ''
-        blog_post.excerpt = excerpt if excerpt else None
-        blog_post.meta_description = meta_description[:300] if meta_description else None
-        blog_post.meta_keywords = meta_keywords[:255] if meta_keywords else None
-        blog_post.category = category if category else None
-        blog_post.tags = tags if tags else None
+        blog_post.content = fields['content'] or ''
+        blog_post.excerpt = fields['excerpt']
+        blog_post.meta_description = fields['meta_description']
+        blog_post.meta_keywords = fields['meta_keywords']
+        blog_post.category = fields['category']
+        blog_post.tags = fields['tags']
         blog_post.content_type = content_type
-        blog_post.og_image = og_image if og_image else None
-        blog_post.pdf_path = pdf_path if pdf_path else None
-        blog_post.additional_pdfs = additional_pdfs
+        blog_post.og_image = fields['og_image']
+        blog_post.pdf_path = fields['pdf_path']
+        blog_post.additional_pdfs = fields['additional_pdfs']
         blog_post.is_public = is_public
-        blog_post.updated_at = datetime.utcnow()
+        blog_post.updated_at = now
         
         # Handle publishing: if is_public is checked and post is draft, publish it
         was_published = False
         if is_public and blog_post.status == 'draft':
             blog_post.status = 'published'
-            blog_post.published_at = datetime.utcnow()
+            blog_post.published_at = now
             was_published = True
         elif not is_public and blog_post.status == 'published':
             # If unchecked, unpublish (make draft)
@@ -500,14 +722,14 @@ def edit_post(post_id):
         
         db.session.commit()
         
-        # Invalidate caches if published
+        # Drop cached pages showing this post; only rebuild every listing
+        # when the edit changes which listings the post belongs to
+        listing_after = _listing_state(blog_post)
+        _invalidate_post_caches(post_id, listings=(
+            listing_after != listing_before and (listing_before[0] or listing_after[0])
+        ))
+        
         if was_published:
-            from ..utils.neon_cache import invalidate_blog_cache, invalidate_main_cache
-            try:
-                invalidate_blog_cache()
-                invalidate_main_cache()
-            except Exception as e:
-                current_app.logger.warning(f"Failed to invalidate caches: {e}")
             flash('Research article published successfully!', 'success')
         else:
             flash('Research article updated successfully!', 'success')
@@ -527,33 +749,57 @@ def delete_post(post_id):
     Users can delete their own posts; admins can delete any post.
     Invalidates blog caches after deletion.
     """
-    from ..utils.neon_cache import invalidate_blog_cache, invalidate_main_cache
-    
-    blog_post = BlogPost.query.get_or_404(post_id)
+    # Only the author is needed - never load the content or PDF to delete
+    author_id = db.session.query(BlogPost.author_id).filter_by(id=post_id).scalar()
+    if author_id is None:
+        abort(404)
     
     # Check permissions
-    if current_user.id != blog_post.author_id and not current_user.is_admin:
+    if current_user.id != author_id and not current_user.is_admin:
         flash('You can only delete your own posts.', 'danger')
         return redirect(url_for('blog.my_posts'))
     
-    db.session.delete(blog_post)
+    # Attachments first (the ORM cascade would have loaded them one by one)
+    db.session.execute(delete(BlogPostAttachment).where(BlogPostAttachment.post_id == post_id))
+    db.session.execute(delete(BlogPost).where(BlogPost.id == post_id))
     db.session.commit()
     
     # Invalidate caches after deletion
-    try:
-        invalidate_blog_cache()
-        invalidate_main_cache()
-    except Exception as e:
-        current_app.logger.warning(f"Failed to invalidate caches: {e}")
+    _invalidate_post_caches(post_id)
     
     flash('Research article deleted successfully.', 'success')
     
     # Redirect based on who deleted
-    if current_user.is_admin and current_user.id != blog_post.author_id:
+    if current_user.is_admin and current_user.id != author_id:
         return redirect(url_for('blog.admin_posts'))
     return redirect(url_for('blog.my_posts'))
 
 
+def _update_post(post_id, values, *returning):
+    """
+    Apply values to one post with a single UPDATE, without loading it first.
+    
+    Non-admins only match their own posts. The caller commits.
+    
+    Args:
+        post_id: ID of the post to update
+        values: Column values for the UPDATE
+        *returning: Columns to return from the updated row
+    
+    Returns:
+        Row with the returning columns, or None if the post belongs to someone
+        else (aborts with 404 if it does not exist)
+    """
+    stmt = update(BlogPost).where(BlogPost.id == post_id).values(**values)
+    if not current_user.is_admin:
+        stmt = stmt.where(BlogPost.author_id == current_user.id)
+    row = db.session.execute(stmt.returning(BlogPost.id, *returning)).first()
+    
+    if row is None and db.session.query(BlogPost.id).filter_by(id=post_id).first() is None:
+        abort(404)
+    return row
+
+
 @blog_bp.route('/publish/<int:post_id>', methods=['POST'])
 @login_required
 def publish_post(post_id):
@@ -562,54 +808,39 @@ def publish_post(post_id):
     Sets the post status to published and sets published_at date.
     Invalidates blog caches after publishing.
     """
-    from ..utils.neon_cache import invalidate_blog_cache, invalidate_main_cache
-    
-    blog_post = BlogPost.query.get_or_404(post_id)
+    published = _update_post(post_id, {
+        'status': 'published',
+        'published_at': utc_now(),
+        'is_public': True,  # Auto-set public when publishing
+    }, BlogPost.slug)
     
     # Check permissions
-    if current_user.id != blog_post.author_id and not current_user.is_admin:
+    if published is None:
         flash('You can only publish your own posts.', 'danger')
         return redirect(url_for('blog.my_posts'))
     
-    blog_post.status = 'published'
-    blog_post.published_at = datetime.utcnow()
-    blog_post.is_public = True  # Auto-set public when publishing
     db.session.commit()
     
     # Invalidate caches after publishing
-    try:
-        invalidate_blog_cache()
-        invalidate_main_cache()
-    except Exception as e:
-        current_app.logger.warning(f"Failed to invalidate caches: {e}")
+    _invalidate_post_caches(post_id)
     
     flash('Research article published successfully!', 'success')
-    return redirect(url_for('blog.post', slug=blog_post.slug))
+    return redirect(url_for('blog.post', slug=published.slug))
 
 
 @blog_bp.route('/unpublish/<int:post_id>', methods=['POST'])
 @login_required
 def unpublish_post(post_id):
     """Unpublish a post - revert to draft status. Invalidates blog caches."""
-    from ..utils.neon_cache import invalidate_blog_cache, invalidate_main_cache
-    
-    blog_post = BlogPost.query.get_or_404(post_id)
-    
     # Check permissions
-    if current_user.id != blog_post.author_id and not current_user.is_admin:
+    if _update_post(post_id, {'status': 'draft', 'is_public': False}) is None:
         flash('You can only unpublish your own posts.', 'danger')
         return redirect(url_for('blog.my_posts'))
     
-    blog_post.status = 'draft'
-    blog_post.is_public = False
     db.session.commit()
     
     # Invalidate caches after unpublishing
-    try:
-        invalidate_blog_cache()
-        invalidate_main_cache()
-    except Exception as e:
-        current_app.logger.warning(f"Failed to invalidate caches: {e}")
+    _invalidate_post_caches(post_id)
     
     flash('Research article unpublished and moved to drafts.', 'success')
     return redirect(url_for('blog.my_posts'))
@@ -646,21 +877,28 @@ def admin_posts():
     if not current_user.is_admin:
         abort(403)
     
-    page = request.args.get('page', 1, type=int)
     per_page = 20
     status_filter = request.args.get('status', '')
     
-    query = BlogPost.query
+    # The table shows each post's author - load them with the page query
+    query = BlogPost.query.options(
+        load_only(*_POST_LIST_COLUMNS),
+        joinedload(BlogPost.author)
+    )
     
     if status_filter:
         query = query.filter(BlogPost.status == status_filter)
     
-    query = query.order_by(desc(BlogPost.updated_at))
-    pagination = query.paginate(page=page, per_page=per_page)
+    # Keyset pages on (updated_at, id) - no COUNT query per view
+    posts, next_cursor, prev_cursor = keyset_page(
+        query, per_page, BlogPost.updated_at, BlogPost.id,
+        after=request.args.get('after'), before=request.args.get('before')
+    )
     
     return render_template('blog/admin_posts.html',
-                         posts=pagination.items,
-                         pagination=pagination,
+                         posts=posts,
+                         next_cursor=next_cursor,
+                         prev_cursor=prev_cursor,
                          status_filter=status_filter)
 
 
@@ -671,11 +909,12 @@ def toggle_featured(post_id):
     if not current_user.is_admin:
         abort(403)
     
-    blog_post = BlogPost.query.get_or_404(post_id)
-    blog_post.is_featured = not blog_post.is_featured
+    toggled = _update_post(post_id, {
+        'is_featured': not_(func.coalesce(BlogPost.is_featured, false()))
+    }, BlogPost.is_featured)
     db.session.commit()
     
-    status = 'featured' if blog_post.is_featured else 'unfeatured'
+    status = 'featured' if toggled.is_featured else 'unfeatured'
     flash(f'Post {status} successfully!', 'success')
     
     return redirect(request.referrer or url_for('blog.admin_posts'))
@@ -685,6 +924,58 @@ def toggle_featured(post_id):
 # AJAX/API ROUTES
 # ============================================================================
 
+# Copy uploads to disk in 1 MB chunks (Werkzeug's default is 16 KB)
+UPLOAD_COPY_BUFFER_SIZE = 1024 * 1024
+
+# Room for multipart boundaries, part headers and the small form fields
+# sent along with an uploaded file
+MULTIPART_OVERHEAD_ALLOWANCE = 64 * 1024
+
+
+# Accepted upload types, by lowercase file extension
+IMAGE_UPLOAD_EXTENSIONS = frozenset({'png', 'jpg', 'jpeg', 'gif', 'webp'})
+DOCUMENT_UPLOAD_EXTENSIONS = frozenset({'pdf', 'docx', 'doc'})
+ATTACHMENT_UPLOAD_EXTENSIONS = frozenset({
+    'pdf', 'xlsx', 'xls', 'docx', 'doc', 'pptx', 'ppt',
+    'csv', 'zip', 'rar', 'txt', 'json', 'xml'
+})
+
+# Article styles generate_complete_article_from_file accepts
+DOCUMENT_ARTICLE_STYLES = frozenset({'seo_article', 'academic_paper', 'blog_post', 'investment_pitch'})
+
+
+def _file_extension(filename):
+    """Lowercase extension after the last dot, or '' if there is none."""
+    return filename.rpartition('.')[2].lower() if '.' in filename else ''
+
+
+def _is_image_upload(stream):
+    """
+    Check an upload's leading bytes against the accepted image formats.
+    
+    The extension is chosen by the client, so this is what keeps other
+    files from being served out of the public uploads folder. The stream is
+    rewound afterwards.
+    """
+    header = stream.read(12)
+    stream.seek(0)
+    return (header.startswith(b'\x89PNG\r\n\x1a\n')
+            or header.startswith(b'\xff\xd8\xff')
+            or header[:6] in (b'GIF87a', b'GIF89a')
+            or (header[:4] == b'RIFF' and header[8:12] == b'WEBP'))
+
+
+def _declared_upload_too_large(max_file_size):
+    """
+    Check the request's Content-Length against a file size limit.
+    
+    Content-Length covers the whole multipart form, so this only rejects
+    requests that cannot contain an acceptable file. The exact file size is
+    still checked after parsing (chunked requests declare no length).
+    """
+    return (request.content_length or 0) > max_file_size + MULTIPART_OVERHEAD_ALLOWANCE
+
+
 @blog_bp.route('/api/upload-image', methods=['POST'])
 @login_required
 def upload_image():
@@ -697,39 +988,72 @@ def upload_image():
         return jsonify({'error': 'No file selected'}), 400
     
     # Validate file type
-    allowed_extensions = {'png', 'jpg', 'jpeg', 'gif', 'webp'}
-    ext = file.filename.rsplit('.', 1)[1].lower() if '.' in file.filename else ''
+    ext = _file_extension(file.filename)
     
-    if ext not in allowed_extensions:
+    if ext not in IMAGE_UPLOAD_EXTENSIONS or not _is_image_upload(file.stream):
         return jsonify({'error': 'Invalid file type. Allowed: PNG, JPG, GIF, WebP'}), 400
     
-    # Save file with unique name
-    from werkzeug.utils import secure_filename
+    # Save under a random name - unique even within the same second, and no
+    # part of the client's filename reaches the filesystem
     import os
+    import uuid
     from flask import current_app
     
-    filename = secure_filename(f"blog_{datetime.utcnow().strftime('%Y%m%d%H%M%S')}_{file.filename}")
+    filename = f"blog_{uuid.uuid4().hex}.{ext}"
     upload_folder = os.path.join(current_app.root_path, 'static', 'uploads', 'blog')
     os.makedirs(upload_folder, exist_ok=True)
     
     filepath = os.path.join(upload_folder, filename)
-    file.save(filepath)
+    file.save(filepath, buffer_size=UPLOAD_COPY_BUFFER_SIZE)
     
     # Return URL
     image_url = url_for('static', filename=f'uploads/blog/{filename}')
     return jsonify({'url': image_url})
 
 
+# Shared Markdown converter for render_markdown (created on first use)
+_markdown = None
+_markdown_lock = threading.Lock()
+
+# Preview HTML by content digest - the editor re-sends the whole, mostly
+# unchanged buffer; tiny documents are cheaper to convert than to hash
+MARKDOWN_PREVIEW_CACHE_MIN_LENGTH = 32
+_markdown_preview_cache = MemoCache('markdown_preview', ttl=3600, maxsize=256)
+
+# Longest preview rendered - Markdown's regex passes get slow on huge input
+MARKDOWN_PREVIEW_MAX_LENGTH = 100 * 1024
+
+
 @blog_bp.route('/api/render-markdown', methods=['POST'])
 @login_required
 def render_markdown():
     """Render markdown content to HTML for preview."""
+    global _markdown
     content = request.json.get('content', '')
+    if len(content) > MARKDOWN_PREVIEW_MAX_LENGTH:
+        return jsonify({'error': 'Content too long to preview'}), 413
+    
+    cache_key = None
+    if len(content) >= MARKDOWN_PREVIEW_CACHE_MIN_LENGTH:
+        cache_key = hashlib.blake2b(content.encode(), digest_size=16).digest()
+        html = _markdown_preview_cache.get(cache_key)
+        if html is not MISSING:
+            return jsonify({'html': html})
     
     try:
-        import markdown
-        md = markdown.Markdown(extensions=['extra', 'codehilite', 'toc'])
-        html = md.convert(content)
+        # One converter per worker - building the extension pipeline costs far
+        # more than a preview-sized conversion. Markdown instances keep parser
+        # state, so conversions are serialized and the state reset after each.
+        with _markdown_lock:
+            if _markdown is None:
+                import markdown
+                _markdown = markdown.Markdown(extensions=['extra', 'codehilite', 'toc'])
+            try:
+                html = _markdown.convert(content)
+            finally:
+                _markdown.reset()
+        if cache_key is not None:
+            _markdown_preview_cache.set(cache_key, html)
         return jsonify({'html': html})
     except ImportError:
         # Fallback: simple formatting
@@ -743,24 +1067,16 @@ def render_markdown():
 
 def get_blog_categories():
     """Get list of existing categories for dropdown."""
-    categories = db.session.query(BlogPost.category).filter(
-        BlogPost.category != None,
-        BlogPost.category != ''
-    ).distinct().all()
-    return sorted([c[0] for c in categories])
-
-
-def get_latest_posts(limit=6, featured_only=False):
-    """Helper to get latest posts for embedding in other pages."""
-    query = BlogPost.query.filter(
-        BlogPost.status == 'published',
-        BlogPost.is_public == True
-    )
-    
-    if featured_only:
-        query = query.filter(BlogPost.is_featured == True)
-    
-    return query.order_by(desc(BlogPost.published_at)).limit(limit).all()
+    categories = _categories_cache.get('categories')
+    if categories is MISSING:
+        # Same predicate as the partial ix_blog_posts_category_nn index
+        rows = db.session.query(BlogPost.category).filter(
+            BlogPost.category != None,
+            BlogPost.category != ''
+        ).distinct().all()
+        categories = sorted([c[0] for c in rows])
+        _categories_cache.set('categories', categories)
+    return categories
 
 
 # ============================================================================
@@ -869,11 +1185,24 @@ def search_unsplash_api():
 @blog_bp.route('/api/upload-document', methods=['POST'])
 @login_required
 @rate_limit(limit=5, window=3600)  # 5 document uploads per hour
+@csrf.exempt
 def upload_document():
     """
     Upload and parse a PDF or DOCX file, then generate a complete blog article.
     Security: Max file size 10MB, allowed types: PDF, DOCX, DOC
     """
+    max_file_size = 10 * 1024 * 1024  # 10MB
+    
+    # Reject from the header before the body is parsed and spooled to disk.
+    # The global CSRF check would parse the form first, so the route is
+    # exempt and runs the check itself once the size is known to be fine.
+    if _declared_upload_too_large(max_file_size):
+        return jsonify({
+            'error': 'File too large. Maximum size is 10MB.'
+        }), 413
+    
+    csrf.protect()
+    
     if 'document' not in request.files:
         return jsonify({'error': 'No document provided'}), 400
     
@@ -882,16 +1211,14 @@ def upload_document():
         return jsonify({'error': 'No file selected'}), 400
     
     # Validate file type
-    allowed_extensions = {'pdf', 'docx', 'doc'}
-    ext = file.filename.rsplit('.', 1)[1].lower() if '.' in file.filename else ''
+    ext = _file_extension(file.filename)
     
-    if ext not in allowed_extensions:
+    if ext not in DOCUMENT_UPLOAD_EXTENSIONS:
         return jsonify({
             'error': 'Invalid file type. Allowed: PDF, DOCX, DOC'
         }), 400
     
     # Validate file size (10MB max)
-    max_file_size = 10 * 1024 * 1024  # 10MB
     file.seek(0, 2)  # Seek to end of file
     file_size = file.tell()
     file.seek(0)  # Reset to beginning
@@ -907,38 +1234,62 @@ def upload_document():
     target_style = request.form.get('target_style', 'seo_article')
     
     # Validate style
-    valid_styles = {'seo_article', 'academic_paper', 'blog_post', 'investment_pitch'}
-    if target_style not in valid_styles:
+    if target_style not in DOCUMENT_ARTICLE_STYLES:
         target_style = 'seo_article'
     
     try:
-        # Save file temporarily
-        from werkzeug.utils import secure_filename
-        import os
+        # Save file temporarily; the import job deletes it when done
         import tempfile
-        
-        filename = secure_filename(f"upload_{datetime.utcnow().strftime('%Y%m%d%H%M%S')}_{file.filename}")
+        from ..utils.document_jobs import start_document_job
         
         with tempfile.NamedTemporaryFile(delete=False, suffix=f'.{ext}') as tmp:
-            file.save(tmp.name)
+            file.save(tmp, buffer_size=UPLOAD_COPY_BUFFER_SIZE)
             tmp_path = tmp.name
         
-        try:
-            # Process the document
-            result = generate_complete_article_from_file(tmp_path, ext, target_style)
-            return jsonify(result)
-        finally:
-            # Clean up temp file
-            try:
-                os.unlink(tmp_path)
-            except:
-                pass
+        # Parsing and generation run in the background - the editor polls for the result
+        job_id = start_document_job(current_user.id, tmp_path, ext, target_style)
+        return jsonify({
+            'job_id': job_id,
+            'status_url': url_for('blog.document_status', job_id=job_id)
+        }), 202
                 
     except Exception as e:
         current_app.logger.error(f"Error processing document: {e}")
         return jsonify({'error': f'Failed to process document: {str(e)}'}), 500
 
 
+@blog_bp.route('/api/document-status/<job_id>')
+@login_required
+def document_status(job_id):
+    """
+    Poll a document import started by upload_document.
+    Returns {'status': 'pending'} until done, then the generated article once.
+    Unknown jobs and jobs pending past JOB_TIMEOUT report {'status': 'failed'}.
+    """
+    from ..utils.document_jobs import job_timed_out
+    
+    job = DocumentImportJob.query.filter_by(id=job_id, user_id=current_user.id).first()
+    if job is None:
+        # Also what a poller sees after its job was cleaned up
+        return jsonify({'status': 'failed', 'error': 'Unknown or expired import job'}), 404
+    
+    if job_timed_out(job):
+        db.session.delete(job)
+        db.session.commit()
+        return jsonify({'status': 'failed', 'error': 'Document import timed out. Please try again.'}), 504
+    
+    if job.status != 'done':
+        return jsonify({'status': 'pending'}), 202
+    
+    result = dict(job.result or {})
+    # The result is delivered once; drop the row (and its large payload)
+    db.session.delete(job)
+    db.session.commit()
+    
+    result['status'] = 'done'
+    return jsonify(result)
+
+
 @blog_bp.route('/api/upload-pdf', methods=['POST'])
 @login_required
 @rate_limit(limit=30, window=3600)
@@ -951,6 +1302,12 @@ def upload_pdf_api():
     """
     from ..utils.blog_ai_utils import parse_pdf
     
+    max_file_size = 25 * 1024 * 1024  # 25MB
+    
+    # Reject from the header before the body is parsed and spooled to disk
+    if _declared_upload_too_large(max_file_size):
+        return jsonify({'error': 'File too large. Maximum size is 25MB.'}), 413
+    
     if 'pdf' not in request.files:
         return jsonify({'error': 'No file uploaded'}), 400
     
@@ -962,19 +1319,14 @@ def upload_pdf_api():
         return jsonify({'error': 'No file selected'}), 400
     
     # Validate file type - allow PDFs and common document formats
-    allowed_extensions = {
-        'pdf', 'xlsx', 'xls', 'docx', 'doc', 'pptx', 'ppt', 
-        'csv', 'zip', 'rar', 'txt', 'json', 'xml'
-    }
-    ext = file.filename.rsplit('.', 1)[1].lower() if '.' in file.filename else ''
+    ext = _file_extension(file.filename)
     
-    if ext not in allowed_extensions:
+    if ext not in ATTACHMENT_UPLOAD_EXTENSIONS:
         return jsonify({
             'error': f'File type .{ext} not allowed. Allowed: PDF, Excel, Word, PowerPoint, CSV, ZIP, TXT'
         }), 400
     
     # Validate file size (25MB max)
-    max_file_size = 25 * 1024 * 1024  # 25MB
     file.seek(0, 2)
     file_size = file.tell()
     file.seek(0)
@@ -1355,6 +1707,10 @@ def enhance_post_api():
         return jsonify({'error': 'Failed to enhance post'}), 500
 
 
+# Most analyses returned by the editor's analysis-date search
+ANALYSIS_DATE_RESULTS_MAX = 50
+
+
 @blog_bp.route('/api/find-analysis-date', methods=['POST'])
 @login_required
 @rate_limit(limit=20, window=3600)  # 20 searches per hour
@@ -1378,39 +1734,44 @@ def find_analysis_date_api():
     try:
         search_pattern = f"%{search_term}%"
         
-        # Search for companies matching the term (by name or ticker)
-        matching_companies = Company.query.filter(
+        # Matching companies with their analyses in one query; the outer join
+        # keeps companies without analyses so the "no companies" case still shows
+        rows = db.session.query(
+            Company.name,
+            Company.ticker_symbol,
+            Analysis.id,
+            Analysis.analysis_date,
+            Analysis.status
+        ).outerjoin(
+            Analysis, Analysis.company_id == Company.id
+        ).filter(
             db.or_(
                 Company.name.ilike(search_pattern),
                 Company.ticker_symbol.ilike(search_pattern)
             )
-        ).all()
+        ).order_by(
+            Analysis.analysis_date.desc().nulls_last(), Analysis.id.desc()
+        ).limit(ANALYSIS_DATE_RESULTS_MAX).all()
         
-        if not matching_companies:
+        if not rows:
             return jsonify({
                 'success': True,
                 'analyses': [],
                 'message': 'No companies found matching your search'
             })
         
-        # Get analyses for these companies
-        company_ids = [c.id for c in matching_companies]
-        analyses = Analysis.query.filter(
-            Analysis.company_id.in_(company_ids)
-        ).order_by(Analysis.analysis_date.desc()).all()
-        
         results = []
-        for analysis in analyses:
-            company = Company.query.get(analysis.company_id)
-            if company:
-                results.append({
-                    'analysis_id': analysis.id,
-                    'company_name': company.name,
-                    'ticker_symbol': company.ticker_symbol,
-                    'analysis_date': analysis.analysis_date.isoformat() if analysis.analysis_date else None,
-                    'formatted_date': analysis.analysis_date.strftime('%Y-%m-%d') if analysis.analysis_date else 'Unknown',
-                    'status': analysis.status
-                })
+        for name, ticker_symbol, analysis_id, analysis_date, status in rows:
+            if analysis_id is None:
+                continue
+            results.append({
+                'analysis_id': analysis_id,
+                'company_name': name,
+                'ticker_symbol': ticker_symbol,
+                'analysis_date': analysis_date.isoformat() if analysis_date else None,
+                'formatted_date': analysis_date.strftime('%Y-%m-%d') if analysis_date else 'Unknown',
+                'status': status
+            })
         
         return jsonify({
             'success': True,
@@ -97,6 +97,12 @@ class Config:
     PASSWORD_RESET_EXPIRATION = 86400  # 24 hours
     REGISTRATION_EXPIRATION = 86400    # 24 hours
     
+    # bcrypt cost factor for user passwords (2^12 rounds, ~250 ms per check)
+    BCRYPT_LOG_ROUNDS = int(os.environ.get('BCRYPT_LOG_ROUNDS', 12))
+    
+    # Key for HMAC-hashing activation/reset tokens before storing them
+    TOKEN_HMAC_KEY = os.environ.get('TOKEN_HMAC_KEY') or SECRET_KEY
+    
     # File upload settings
     MAX_CONTENT_LENGTH = 32 * 1024 * 1024  # 32MB max file size (for PDF research reports)
     
@@ -112,6 +118,13 @@ class Config:
     
     # Security headers (managed by security.py middleware)
     SECURITY_HEADERS_ENABLED = True
+    
+    # Run queued email/activity-log work on the request thread instead of
+    # background worker threads (utils/batch_worker.py)
+    BACKGROUND_WORKERS_SYNC = False
+    
+    # Pre-populate the public caches when the app starts (NEON_OPTIMIZE)
+    WARM_CACHES_ON_STARTUP = True
 
 
 class DevelopmentConfig(Config):
@@ -155,6 +168,9 @@ class TestingConfig(Config):
     SQLALCHEMY_DATABASE_URI = 'sqlite:///:memory:'  # In-memory database
     WTF_CSRF_ENABLED = False  # Disable CSRF for testing
     MAIL_SUPPRESS_SEND = True  # Don't send emails during tests
+    BCRYPT_LOG_ROUNDS = 4  # Minimum cost - keeps password hashing fast in tests
+    BACKGROUND_WORKERS_SYNC = True  # Emails and activity logs are written before the response
+    WARM_CACHES_ON_STARTUP = False  # Tests start from an empty database and cache
 
 
 # Configuration mapping
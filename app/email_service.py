@@ -13,9 +13,40 @@ To use SendGrid:
 4. Set MAIL_DEFAULT_SENDER to your verified sender email
 """
 
-import logging
 from flask import current_app
 
+from .utils.batch_worker import BatchWorker
+
+# Seconds to wait for queued emails at interpreter shutdown
+SHUTDOWN_TIMEOUT = 30
+
+# Maximum number of queued emails sent over one SMTP connection
+BATCH_SIZE = 50
+
+# Batches at least this large are abandoned once a third of the sends fail
+BULK_ABORT_MIN = 30
+
+# External URL per (endpoint, URL root) with a placeholder in place of the token
+# (the Host header is client-controlled, so the map is capped)
+_TOKEN_PLACEHOLDER = '__TOKEN__'
+_token_url_templates = {}
+TOKEN_URL_TEMPLATES_MAX = 16
+
+
+def send_email_async(to, subject, body, html=None):
+    """
+    Queue an email for sending by a background thread.
+    
+    The request returns without waiting for SendGrid/SMTP; failures are
+    logged by the senders. Apps with BACKGROUND_WORKERS_SYNC send on the
+    calling thread.
+    
+    Returns:
+        bool: True once queued (the send result when sent synchronously)
+    """
+    return bool(_worker.submit((to, subject, body, html)))
+
+
 def send_email(to, subject, body, html=None):
     """
     Send an email using SendGrid API (preferred) or SMTP fallback.
@@ -46,6 +77,47 @@ def send_email(to, subject, body, html=None):
         return False
 
 
+def send_emails_bulk(messages):
+    """
+    Send several emails, reusing one SMTP connection for the whole batch.
+    
+    With SendGrid configured each email goes through send_email() (one
+    HTTPS call each, SMTP fallback included).
+    
+    Args:
+        messages: List of (to, subject, body, html) tuples
+    
+    Returns:
+        int: Number of emails sent successfully
+    """
+    if current_app.config.get('SENDGRID_API_KEY'):
+        return sum(1 for args in messages if send_email(*args))
+    
+    from .extensions import mail
+    
+    sent = failed = 0
+    try:
+        with mail.connect() as conn:
+            for to, subject, body, html in messages:
+                try:
+                    _send_smtp(to, subject, body, html, connection=conn)
+                    sent += 1
+                except Exception as e:
+                    failed += 1
+                    current_app.logger.error(f'SMTP failed for {to}: {e}')
+                    if len(messages) >= BULK_ABORT_MIN and failed * 3 >= len(messages):
+                        current_app.logger.error(
+                            f'Aborting email batch after {failed} of {len(messages)} failed'
+                        )
+                        break
+    except Exception as e:
+        current_app.logger.error(f'SMTP failed: {e}')
+    return sent
+
+
+_worker = BatchWorker('email-sender', send_emails_bulk, BATCH_SIZE, SHUTDOWN_TIMEOUT)
+
+
 def _send_sendgrid(to, subject, body, html=None):
     """Send email using SendGrid API."""
     from sendgrid import SendGridAPIClient
@@ -75,8 +147,14 @@ def _send_sendgrid(to, subject, body, html=None):
         raise Exception(f'SendGrid returned status {response.status_code}')
 
 
-def _send_smtp(to, subject, body, html=None):
-    """Send email using SMTP (Flask-Mail)."""
+def _send_smtp(to, subject, body, html=None, connection=None):
+    """
+    Send email using SMTP (Flask-Mail).
+    
+    Args:
+        connection: Open Flask-Mail connection to reuse (send_emails_bulk);
+            a new connection is opened for this email when omitted
+    """
     from flask_mail import Message
     from .extensions import mail
     
@@ -86,38 +164,34 @@ def _send_smtp(to, subject, body, html=None):
         body=body,
         html=html
     )
-    mail.send(msg)
+    (connection or mail).send(msg)
     current_app.logger.info(f'Email sent to {to} via SMTP')
     return True
 
 
-def send_password_setup_email(user, token):
-    """Send email with activation code and clickable link."""
-    from flask import url_for
-    
-    subject = 'Set up your password for Analyst Performance Tracker'
-    setup_url = url_for('auth.set_password', token=token, _external=True)
-    
-    body = f'''Hello,
+# Account emails are built once at import from the shared layouts below;
+# only the link differs per recipient and is substituted for the {URL}
+# placeholder at send time
+_TEXT_LAYOUT = '''Hello,
 
-You have been invited to set up your account at Analyst Performance Tracker.
+{INTRO}
 
-Please click the following link to create your password (valid for 24 hours):
+Please click the following link to {ACTION} (valid for 24 hours):
 
-{setup_url}
+{URL}
 
-If you did not expect this invitation, please ignore this email.
+{IGNORE}
 
 Best regards,
 The Analyst Performance Tracker Team
 '''
-    
-    html = f'''<!DOCTYPE html>
+
+_HTML_LAYOUT = '''<!DOCTYPE html>
 <html>
 <head>
     <meta charset="utf-8">
     <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>{subject}</title>
+    <title>{TITLE}</title>
 </head>
 <body style="margin: 0; padding: 0; font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, 'Helvetica Neue', Arial, sans-serif; background-color: #f6f9f6; color: #333;">
     <table role="presentation" width="100%" cellspacing="0" cellpadding="0" style="max-width: 600px; margin: 0 auto; padding: 20px;">
@@ -131,105 +205,125 @@ The Analyst Performance Tracker Team
         </tr>
         <tr>
             <td style="background: #ffffff; border-radius: 16px; padding: 40px; box-shadow: 0 4px 6px rgba(0, 0, 0, 0.05);">
-                <h2 style="margin: 0 0 20px 0; color: #1f2937; font-size: 24px;">Welcome! 👋</h2>
+                <h2 style="margin: 0 0 20px 0; color: #1f2937; font-size: 24px;">{HEADING}</h2>
                 <p style="margin: 0 0 24px 0; color: #4b5563; font-size: 16px; line-height: 1.6;">
-                    You have been invited to set up your account. Click the button below to create your password and get started.
+                    {INTRO}
                 </p>
                 <table role="presentation" width="100%" cellspacing="0" cellpadding="0">
                     <tr>
                         <td style="text-align: center; padding: 20px 0;">
-                            <a href="{setup_url}" style="display: inline-block; background: linear-gradient(135deg, #10b981 0%, #059669 100%); color: #ffffff; text-decoration: none; padding: 16px 40px; border-radius: 12px; font-size: 16px; font-weight: 600; box-shadow: 0 4px 14px rgba(16, 185, 129, 0.4);">
-                                Set Password →
+                            <a href="{URL}" style="display: inline-block; background: linear-gradient(135deg, #10b981 0%, #059669 100%); color: #ffffff; text-decoration: none; padding: 16px 40px; border-radius: 12px; font-size: 16px; font-weight: 600; box-shadow: 0 4px 14px rgba(16, 185, 129, 0.4);">
+                                {BUTTON} →
                             </a>
                         </td>
                     </tr>
                 </table>
                 <p style="margin: 24px 0 0 0; color: #9ca3af; font-size: 14px; text-align: center;">
                     This link will expire in 24 hours.
-                </p>
+                </p>{CARD_NOTE}
             </td>
         </tr>
         <tr>
             <td style="text-align: center; padding: 30px 0; color: #9ca3af; font-size: 14px;">
-                <p style="margin: 0;">Analyst Performance Tracker</p>
-                <p style="margin: 8px 0 0 0; color: #d1d5db;">If you didn't expect this email, you can safely ignore it.</p>
+                <p style="margin: 0;">Analyst Performance Tracker</p>{FOOTER_NOTE}
             </td>
         </tr>
     </table>
 </body>
 </html>'''
-    
-    return send_email(user.email, subject, body, html)
 
 
-def send_password_reset_email(user, token):
-    """Send password‑reset email."""
-    from flask import url_for
-    
-    subject = 'Reset your password for Analyst Performance Tracker'
-    reset_url = url_for('auth.reset_password', token=token, _external=True)
-    
-    body = f'''Hello,
+def _fill(layout, **slots):
+    """Fill {NAME} slots of a layout, leaving {URL} for send time."""
+    for name, value in slots.items():
+        layout = layout.replace('{' + name + '}', value)
+    return layout
 
-You have requested to reset your password for Analyst Performance Tracker.
 
-Please click the following link to choose a new password (valid for 24 hours):
+_SETUP_SUBJECT = 'Set up your password for Analyst Performance Tracker'
 
-{reset_url}
+_SETUP_TEXT = _fill(
+    _TEXT_LAYOUT,
+    INTRO='You have been invited to set up your account at Analyst Performance Tracker.',
+    ACTION='create your password',
+    IGNORE='If you did not expect this invitation, please ignore this email.',
+)
 
-If you did not request this, please ignore this email.
+_SETUP_HTML = _fill(
+    _HTML_LAYOUT,
+    TITLE=_SETUP_SUBJECT,
+    HEADING='Welcome! 👋',
+    INTRO='You have been invited to set up your account. Click the button below to create your password and get started.',
+    BUTTON='Set Password',
+    CARD_NOTE='',
+    FOOTER_NOTE='''
+                <p style="margin: 8px 0 0 0; color: #d1d5db;">If you didn't expect this email, you can safely ignore it.</p>''',
+)
 
-Best regards,
-The Analyst Performance Tracker Team
-'''
-    
-    html = f'''<!DOCTYPE html>
-<html>
-<head>
-    <meta charset="utf-8">
-    <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>{subject}</title>
-</head>
-<body style="margin: 0; padding: 0; font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, 'Helvetica Neue', Arial, sans-serif; background-color: #f6f9f6; color: #333;">
-    <table role="presentation" width="100%" cellspacing="0" cellpadding="0" style="max-width: 600px; margin: 0 auto; padding: 20px;">
-        <tr>
-            <td style="text-align: center; padding: 30px 0;">
-                <div style="display: inline-block; background: linear-gradient(135deg, #10b981 0%, #059669 100%); padding: 20px 30px; border-radius: 16px; margin-bottom: 20px;">
-                    <span style="font-size: 32px;">📊</span>
-                </div>
-                <h1 style="margin: 0; color: #065f46; font-size: 28px; font-weight: 700;">Analyst Performance Tracker</h1>
-            </td>
-        </tr>
-        <tr>
-            <td style="background: #ffffff; border-radius: 16px; padding: 40px; box-shadow: 0 4px 6px rgba(0, 0, 0, 0.05);">
-                <h2 style="margin: 0 0 20px 0; color: #1f2937; font-size: 24px;">Reset Password 🔐</h2>
-                <p style="margin: 0 0 24px 0; color: #4b5563; font-size: 16px; line-height: 1.6;">
-                    You requested to reset your password. Click the button below to choose a new password.
-                </p>
-                <table role="presentation" width="100%" cellspacing="0" cellpadding="0">
-                    <tr>
-                        <td style="text-align: center; padding: 20px 0;">
-                            <a href="{reset_url}" style="display: inline-block; background: linear-gradient(135deg, #10b981 0%, #059669 100%); color: #ffffff; text-decoration: none; padding: 16px 40px; border-radius: 12px; font-size: 16px; font-weight: 600; box-shadow: 0 4px 14px rgba(16, 185, 129, 0.4);">
-                                Reset Password →
-                            </a>
-                        </td>
-                    </tr>
-                </table>
-                <p style="margin: 24px 0 0 0; color: #9ca3af; font-size: 14px; text-align: center;">
-                    This link will expire in 24 hours.
-                </p>
+_RESET_SUBJECT = 'Reset your password for Analyst Performance Tracker'
+
+_RESET_TEXT = _fill(
+    _TEXT_LAYOUT,
+    INTRO='You have requested to reset your password for Analyst Performance Tracker.',
+    ACTION='choose a new password',
+    IGNORE='If you did not request this, please ignore this email.',
+)
+
+_RESET_HTML = _fill(
+    _HTML_LAYOUT,
+    TITLE=_RESET_SUBJECT,
+    HEADING='Reset Password 🔐',
+    INTRO='You requested to reset your password. Click the button below to choose a new password.',
+    BUTTON='Reset Password',
+    CARD_NOTE='''
                 <p style="margin: 16px 0 0 0; color: #9ca3af; font-size: 14px; text-align: center;">
                     If you didn't request this, you can safely ignore this email.
-                </p>
-            </td>
-        </tr>
-        <tr>
-            <td style="text-align: center; padding: 30px 0; color: #9ca3af; font-size: 14px;">
-                <p style="margin: 0;">Analyst Performance Tracker</p>
-            </td>
-        </tr>
-    </table>
-</body>
-</html>'''
+                </p>''',
+    FOOTER_NOTE='',
+)
+
+
+def _token_url(endpoint, token):
+    """
+    Build the external URL of a token endpoint.
+    
+    The URL is built once per endpoint and host with url_for and reused as a
+    template, so bulk invitations skip the URL map for every email. Tokens
+    are URL-safe and need no quoting.
+    
+    Args:
+        endpoint: Endpoint taking a single token argument
+        token: Token to put in the URL
+    
+    Returns:
+        Absolute URL string
+    """
+    from flask import has_request_context, request, url_for
+    
+    root = request.url_root if has_request_context() else current_app.config.get('SERVER_NAME')
+    key = (endpoint, root)
+    template = _token_url_templates.get(key)
+    if template is None:
+        if len(_token_url_templates) >= TOKEN_URL_TEMPLATES_MAX:
+            _token_url_templates.clear()
+        template = url_for(endpoint, token=_TOKEN_PLACEHOLDER, _external=True)
+        _token_url_templates[key] = template
+    return template.replace(_TOKEN_PLACEHOLDER, token)
+
+
+def send_password_setup_email(user, token):
+    """Send email with activation code and clickable link."""
+    setup_url = _token_url('auth.set_password', token)
+    body = _SETUP_TEXT.replace('{URL}', setup_url)
+    html = _SETUP_HTML.replace('{URL}', setup_url)
+    
+    return send_email_async(user.email, _SETUP_SUBJECT, body, html)
+
+
+def send_password_reset_email(user, token):
+    """Send password‑reset email."""
+    reset_url = _token_url('auth.reset_password', token)
+    body = _RESET_TEXT.replace('{URL}', reset_url)
+    html = _RESET_HTML.replace('{URL}', reset_url)
     
-    return send_email(user.email, subject, body, html)
+    return send_email_async(user.email, _RESET_SUBJECT, body, html)
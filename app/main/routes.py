@@ -696,7 +696,7 @@ def like_idea(idea_id):
     Returns:
         JSON response with updated like count
     """
-    import os
+    from ..utils.neon_cache import NEON_OPTIMIZE
     
     idea = Idea.query.get_or_404(idea_id)
     idea.likes_count += 1
@@ -704,7 +704,7 @@ def like_idea(idea_id):
     
     # Skip cache invalidation for likes in NEON_OPTIMIZE mode
     # Likes are non-critical and will refresh on next page load
-    if os.environ.get('NEON_OPTIMIZE', 'true').lower() != 'true':
+    if not NEON_OPTIMIZE:
         try:
             from ..utils.neon_cache import invalidate_wall_cache
             invalidate_wall_cache()
@@ -1,7 +1,12 @@
 from datetime import datetime, date, timedelta
 from typing import Dict
-from werkzeug.security import generate_password_hash, check_password_hash
+import hashlib
+import bcrypt
+from werkzeug.security import check_password_hash
+from flask import current_app, has_app_context
 from flask_login import UserMixin
+from sqlalchemy import DDL, event
+from sqlalchemy.orm import validates
 from .extensions import db
 
 # Association table for many-to-many between analyses and analysts (including opponents)
@@ -13,6 +18,10 @@ analysis_analysts = db.Table(
     db.UniqueConstraint('analysis_id', 'user_id', 'role', name='unique_analysis_user_role')
 )
 
+def _bcrypt_input(password):
+    """Encode password for bcrypt, which only uses the first 72 bytes."""
+    return password.encode('utf-8')[:72]
+
 class User(UserMixin, db.Model):
     __tablename__ = 'users'
     id = db.Column(db.Integer, primary_key=True)
@@ -30,12 +39,25 @@ class User(UserMixin, db.Model):
                                backref=db.backref('analysts', lazy='dynamic'))
 
     def set_password(self, password):
-        self.password_hash = generate_password_hash(password)
+        rounds = current_app.config.get('BCRYPT_LOG_ROUNDS', 12) if has_app_context() else 12
+        self.password_hash = bcrypt.hashpw(_bcrypt_input(password), bcrypt.gensalt(rounds)).decode()
 
     def check_password(self, password):
+        """
+        Verify password against the stored hash.
+
+        Accounts still holding a Werkzeug PBKDF2 hash are verified with it and
+        rehashed with bcrypt on success; the caller's commit persists the
+        upgrade.
+        """
         if not self.password_hash:
             return False
-        return check_password_hash(self.password_hash, password)
+        if not self.password_hash.startswith('$2'):
+            if not check_password_hash(self.password_hash, password):
+                return False
+            self.set_password(password)
+            return True
+        return bcrypt.checkpw(_bcrypt_input(password), self.password_hash.encode())
 
     def get_id(self):
         return str(self.id)
@@ -55,10 +77,25 @@ class Company(db.Model):
     analyses = db.relationship('Analysis', backref='company', lazy='dynamic')
     stock_prices = db.relationship('StockPrice', backref='company', lazy='dynamic')
 
+    # Trigram indexes make substring ILIKE searches index-assisted (PostgreSQL only)
+    __table_args__ = (
+        db.Index('ix_companies_name_trgm', 'name', postgresql_using='gin',
+                 postgresql_ops={'name': 'gin_trgm_ops'}).ddl_if(dialect='postgresql'),
+        db.Index('ix_companies_ticker_trgm', 'ticker_symbol', postgresql_using='gin',
+                 postgresql_ops={'ticker_symbol': 'gin_trgm_ops'}).ddl_if(dialect='postgresql'),
+    )
+
     def __repr__(self):
         return f'<Company {self.name} ({self.ticker_symbol})>'
 
 
+# gin_trgm_ops comes from the pg_trgm extension
+event.listen(
+    Company.__table__, 'before_create',
+    DDL('CREATE EXTENSION IF NOT EXISTS pg_trgm').execute_if(dialect='postgresql')
+)
+
+
 class CompanyTickerMapping(db.Model):
     __tablename__ = 'company_ticker_maps'
     id = db.Column(db.Integer, primary_key=True)
@@ -85,6 +122,11 @@ class Analysis(db.Model):
     purchase_date = db.Column(db.Date, nullable=True)
     is_in_portfolio = db.Column(db.Boolean, default=False)
 
+    # Keyset pagination of analysis lists seeks on (analysis_date, id)
+    __table_args__ = (
+        db.Index('ix_analyses_date_id', 'analysis_date', 'id'),
+    )
+
     # Generated column for approval (SQLite does not support generated columns directly,
     # we'll compute it as a property)
     @property
@@ -138,6 +180,11 @@ class PerformanceCalculation(db.Model):
 
     db.UniqueConstraint('analysis_id', 'calculation_date', name='unique_analysis_calculation')
 
+    # "Latest calculation per analysis" lookups become an index seek instead of a sort
+    __table_args__ = (
+        db.Index('ix_pc_analysis_calcdate', 'analysis_id', 'calculation_date'),
+    )
+
     # Relationship
     analysis = db.relationship('Analysis', backref='performance_calculations')
 
@@ -178,11 +225,21 @@ class PasswordResetToken(db.Model):
     id = db.Column(db.Integer, primary_key=True)
     user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False)
     token_hash = db.Column(db.String(255), nullable=False)
+    # HMAC-SHA256 of the raw token, used to find the record without scanning
+    token_lookup = db.Column(db.String(64), unique=True, index=True)
     token_type = db.Column(db.String(20), nullable=False)  # 'registration' or 'reset'
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     expires_at = db.Column(db.DateTime, nullable=False)
     used = db.Column(db.Boolean, default=False)
 
+    # Serves the "unused, unexpired tokens of a type" filter in validate_token;
+    # partial on PostgreSQL/SQLite so consumed tokens never enter the index
+    __table_args__ = (
+        db.Index('ix_prt_active', 'token_type', 'used', 'expires_at',
+                 postgresql_where=db.text('used = false'),
+                 sqlite_where=db.text('used = 0')),
+    )
+
     user = db.relationship('User', backref='tokens')
 
     def __repr__(self):
@@ -247,6 +304,12 @@ class BenchmarkPrice(db.Model):
     
     db.UniqueConstraint('ticker', 'date', name='unique_ticker_date')
     
+    # Covering index for "latest price on or before date" and range scans;
+    # close_price is included so lookups never touch the table heap
+    __table_args__ = (
+        db.Index('ix_benchmarkprice_ticker_date', 'ticker', 'date', 'close_price'),
+    )
+    
     def __repr__(self):
         return f'<BenchmarkPrice {self.ticker} {self.date} {self.close_price}>'
 
@@ -380,10 +443,14 @@ class BlogPost(db.Model):
     content = db.Column(db.Text, nullable=False)  # Main content (HTML/Markdown)
     content_type = db.Column(db.String(20), default='html')  # 'html' or 'markdown'
     pdf_path = db.Column(db.String(500), nullable=True)  # Path to PDF file for PDF blog posts
-    pdf_binary = db.Column(db.LargeBinary, nullable=True)  # PDF stored in DB for Render deployment
+    # PDF stored in DB for Render deployment - deferred, only serve_pdf needs the bytes
+    pdf_binary = db.deferred(db.Column(db.LargeBinary, nullable=True))
     pdf_content_type = db.Column(db.String(100), nullable=True)  # MIME type of stored PDF
     pdf_filename_db = db.Column(db.String(255), nullable=True)  # Original filename for download
+    pdf_etag = db.Column(db.String(32), nullable=True)  # Digest of pdf_binary, set with the bytes
     additional_pdfs = db.Column(db.JSON, nullable=True)  # List of additional PDFs [{name, path, type, desc}]
+    # "Is a PDF stored" flag computed by the database, so pages never fetch the blob to check
+    has_pdf_binary = db.column_property(pdf_binary.columns[0].isnot(None))
     
     # Author & Publishing
     author_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False)
@@ -407,6 +474,18 @@ class BlogPost(db.Model):
     author = db.relationship('User', backref='blog_posts')
     attachments = db.relationship('BlogPostAttachment', backref='post', lazy='dynamic', cascade='all, delete-orphan')
     
+    # Keyset pagination of the post management lists (newest update first)
+    # and author pages (newest publish date first), and the editor's
+    # DISTINCT category list as an index-only scan
+    __table_args__ = (
+        db.Index('ix_blog_posts_updated_id', 'updated_at', 'id'),
+        db.Index('ix_blog_posts_author_updated_id', 'author_id', 'updated_at', 'id'),
+        db.Index('ix_blog_posts_author_published_id', 'author_id', 'published_at', 'id'),
+        db.Index('ix_blog_posts_category_nn', 'category',
+                 postgresql_where=db.text("category IS NOT NULL AND category <> ''"),
+                 sqlite_where=db.text("category IS NOT NULL AND category <> ''")),
+    )
+    
     @property
     def author_name(self):
         """Get author display name."""
@@ -419,11 +498,19 @@ class BlogPost(db.Model):
         """Check if post is published and public."""
         return self.status == 'published' and self.is_public and self.published_at
     
+    @property
+    def has_stored_pdf(self):
+        """Check if a PDF is stored in the database, without loading the blob."""
+        if 'pdf_binary' in self.__dict__:
+            # Loaded or assigned in this session - more current than the flag
+            return bool(self.pdf_binary)
+        return bool(self.has_pdf_binary)
+    
     @property
     def is_pdf_post(self):
         """Check if this is a PDF-only blog post with accessible PDF."""
         # Database PDF always works
-        if self.pdf_binary:
+        if self.has_stored_pdf:
             return True
         # Filesystem PDF - check if file exists
         if self.pdf_path:
@@ -449,7 +536,7 @@ class BlogPost(db.Model):
     def pdf_url(self):
         """Get the URL to serve the PDF (from database or filesystem)."""
         # Priority 1: Database storage (preferred for Render/Neon)
-        if self.pdf_binary:
+        if self.has_stored_pdf:
             return f"/blog/pdf/{self.id}"
         
         # Priority 2: Filesystem (legacy) - only if file actually exists
@@ -519,6 +606,17 @@ class BlogPost(db.Model):
         timestamp = datetime.utcnow().strftime('%Y%m%d%H%M%S')
         return f"{slug}-{timestamp}"
     
+    @staticmethod
+    def pdf_digest(data):
+        """Digest of stored PDF bytes, used as its ETag (None when empty)."""
+        return hashlib.blake2b(data, digest_size=16).hexdigest() if data else None
+    
+    @validates('pdf_binary')
+    def _set_pdf_etag(self, key, value):
+        """Fingerprint the PDF once on write so serve_pdf can answer 304s without loading it."""
+        self.pdf_etag = self.pdf_digest(value)
+        return value
+    
     def __repr__(self):
         return f'<BlogPost {self.title}>'
 
@@ -546,6 +644,20 @@ class BlogPostAttachment(db.Model):
         return f'<BlogPostAttachment {self.file_name} ({self.file_type})>'
 
 
+class DocumentImportJob(db.Model):
+    """Background document-to-article import, polled by the blog editor."""
+    __tablename__ = 'document_import_jobs'
+
+    id = db.Column(db.String(32), primary_key=True)  # uuid4 hex
+    user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False, index=True)
+    status = db.Column(db.String(20), default='pending')  # 'pending', 'done'
+    result = db.Column(db.JSON, nullable=True)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow, index=True)
+
+    def __repr__(self):
+        return f'<DocumentImportJob {self.id} ({self.status})>'
+
+
 class SystemSettings(db.Model):
     """System settings for automated recalculation and other configuration."""
     __tablename__ = 'system_settings'
@@ -41,7 +41,9 @@ def refresh_all_cached_data(run_type='scheduled'):
     from .utils.export_helper import generate_comprehensive_export
     from .utils.neon_cache import warm_public_caches, invalidate_all_public_cache
     from .utils.performance import PerformanceCalculator
-    from .utils.unified_calculator import recalculate_all_unified
+    from .utils.unified_calculator import (
+        recalculate_all_unified, acquire_calculation_lock, release_calculation_lock
+    )
     from .utils.yahooquery_helper import fetch_benchmark_prices
     from .extensions import db
     from datetime import date, timedelta
@@ -95,11 +97,18 @@ def refresh_all_cached_data(run_type='scheduled'):
         
         # Step 3: Unified recalculation
         logger.info("Running unified recalculation...")
-        try:
-            recalculate_all_unified(force=True)
-        except Exception as e:
+        lock_token = acquire_calculation_lock()
+        if lock_token:
+            try:
+                recalculate_all_unified(force=True)
+            except Exception as e:
+                stats['errors_count'] += 1
+                logger.error(f"Unified recalculation error: {e}")
+            finally:
+                release_calculation_lock(lock_token)
+        else:
             stats['errors_count'] += 1
-            logger.error(f"Unified recalculation error: {e}")
+            logger.error("Unified recalculation skipped: another recalculation is in progress")
         
         # Step 4: Invalidate caches
         logger.info("Invalidating caches...")
@@ -176,6 +176,22 @@ def rate_limit(limit=5, window=900, key_func=None):
     return decorator
 
 
+# Stripped from user HTML, in this order (a removal can expose a later match)
+_DANGEROUS_HTML_PATTERNS = tuple(
+    re.compile(pattern, re.IGNORECASE | re.DOTALL) for pattern in (
+        r'<script[^>]*>.*?</script>',
+        r'javascript:',
+        r'on\w+\s*=',
+        r'<iframe[^>]*>.*?</iframe>',
+        r'<object[^>]*>.*?</object>',
+        r'<embed[^>]*>.*?</embed>',
+    )
+)
+
+# Basic email pattern
+_EMAIL_RE = re.compile(r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$')
+
+
 def sanitize_input(text, max_length=None, allow_html=False):
     """
     Sanitize user input to prevent XSS attacks.
@@ -203,16 +219,8 @@ def sanitize_input(text, max_length=None, allow_html=False):
     else:
         # Even when allowing HTML, sanitize potentially dangerous tags
         # This is a basic implementation - for production, consider bleach library
-        dangerous_patterns = [
-            r'<script[^>]*>.*?</script>',
-            r'javascript:',
-            r'on\w+\s*=',
-            r'<iframe[^>]*>.*?</iframe>',
-            r'<object[^>]*>.*?</object>',
-            r'<embed[^>]*>.*?</embed>',
-        ]
-        for pattern in dangerous_patterns:
-            text = re.sub(pattern, '', text, flags=re.IGNORECASE | re.DOTALL)
+        for pattern in _DANGEROUS_HTML_PATTERNS:
+            text = pattern.sub('', text)
     
     # Truncate if max_length is specified
     if max_length and len(text) > max_length:
@@ -237,9 +245,7 @@ def validate_email(email):
     if len(email) > 254:
         return False, "Email is too long (max 254 characters)"
     
-    # Basic email pattern
-    pattern = r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$'
-    if not re.match(pattern, email):
+    if not _EMAIL_RE.match(email):
         return False, "Invalid email format"
     
     return True, None
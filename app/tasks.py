@@ -0,0 +1,138 @@
+"""
+Background tasks for KI Asset Management.
+
+Long-running jobs started from request handlers. When Redis is configured
+(REDIS_URL) the overview recalculation runs in a separate process, so its
+number crunching does not hold the GIL against request threads; progress
+still reaches the SSE streams through Redis pub/sub. Without Redis it runs in
+a background thread of the current process, as the in-process progress
+tracker requires.
+"""
+
+import logging
+import multiprocessing
+import threading
+
+logger = logging.getLogger(__name__)
+
+
+def run_overview_recalculation(force: bool = True):
+    """
+    Recalculate all overview views and save them to the overview cache.
+    
+    Must be called inside an app context.
+    """
+    from .utils.unified_calculator import recalculate_all_unified, get_progress
+    from .utils.overview_cache import save_overview_cache
+    
+    try:
+        all_views_data = recalculate_all_unified(force=force)
+        
+        # Save all views to cache (keys already include method from calculator)
+        for cache_key, view_data in all_views_data.items():
+            save_overview_cache(cache_key, view_data)
+        
+        logger.info("Background recalculation completed successfully")
+    except Exception as e:
+        logger.exception("Error during background recalculation")
+        progress = get_progress()
+        progress.update_status("error")
+        progress.log(f"ERROR: {str(e)}")
+
+
+def start_overview_recalculation(app, force: bool = True) -> bool:
+    """
+    Start a full overview recalculation in the background.
+    
+    Taking the recalculation lock is the only "already running?" check, so two
+    simultaneous requests cannot both start a run.
+    
+    Args:
+        app: The Flask application (used by the thread fallback)
+        force: Passed through to the unified calculator
+    
+    Returns:
+        False if a recalculation is already running, True once started
+    """
+    from .utils.unified_calculator import (
+        get_redis_client, acquire_calculation_lock, release_calculation_lock, reset_progress
+    )
+    
+    lock_token = acquire_calculation_lock()
+    if not lock_token:
+        return False
+    
+    try:
+        # Only the lock holder may reset the shared progress tracker
+        progress = reset_progress()
+        progress.log("Recalculation endpoint called - starting background job...")
+        
+        if get_redis_client() is not None:
+            # The child process releases the lock when it finishes
+            process = multiprocessing.get_context('spawn').Process(
+                target=_recalculation_process, args=(force, lock_token), name="RecalculationProcess"
+            )
+            process.start()
+            logger.info(f"Recalculation process started (pid {process.pid})")
+            threading.Thread(
+                target=_watch_recalculation_process, args=(process, lock_token),
+                name="RecalculationWatcher", daemon=True
+            ).start()
+            return True
+        
+        def run_recalculation():
+            """Run recalculation in background thread."""
+            logger.info("Background recalculation thread started")
+            try:
+                with app.app_context():
+                    run_overview_recalculation(force=force)
+            finally:
+                release_calculation_lock(lock_token)
+        
+        thread = threading.Thread(target=run_recalculation, name="RecalculationThread")
+        thread.daemon = True
+        thread.start()
+        logger.info("Recalculation background thread started successfully")
+        return True
+    except Exception:
+        release_calculation_lock(lock_token)
+        raise
+
+
+def _watch_recalculation_process(process, lock_token: str):
+    """
+    Reap the recalculation process and clean up after an abnormal exit.
+    
+    A child killed before its finally block (OOM, signal) leaves the lock
+    held until its TTL and the progress tracker 'running'; on a non-zero
+    exit code both are reset here. The lock is only released if the child's
+    token still holds it.
+    """
+    from .utils.unified_calculator import release_calculation_lock, get_progress
+    
+    process.join()
+    if process.exitcode == 0:
+        logger.info(f"Recalculation process {process.pid} finished")
+        return
+    
+    logger.error(f"Recalculation process {process.pid} exited with code {process.exitcode}")
+    try:
+        progress = get_progress()
+        progress.update_status("error")
+        progress.log(f"ERROR: recalculation process exited with code {process.exitcode}")
+    finally:
+        release_calculation_lock(lock_token)
+
+
+def _recalculation_process(force: bool, lock_token: str):
+    """Entry point of the recalculation process; releases the lock when done."""
+    from . import create_app
+    from .utils.unified_calculator import release_calculation_lock
+    
+    try:
+        # No scheduler or startup work - the web process owns those
+        app = create_app(worker=True)
+        with app.app_context():
+            run_overview_recalculation(force=force)
+    finally:
+        release_calculation_lock(lock_token)
@@ -0,0 +1,62 @@
+"""
+Background writer for activity log entries.
+
+Auth views record an ActivityLog row on every login, logout, activation and
+reset. Instead of committing each row on the request thread, entries are
+queued and a daemon thread inserts them in batches with a single commit.
+"""
+
+import logging
+
+from ..extensions import db
+from ..models import ActivityLog
+from .batch_worker import BatchWorker
+from .request_time import utc_now
+
+logger = logging.getLogger(__name__)
+
+# Maximum number of entries written per commit
+BATCH_SIZE = 100
+
+# Seconds to wait for pending entries at interpreter shutdown
+SHUTDOWN_TIMEOUT = 5
+
+
+def log_activity_entry(user_id, action, details=None, ip_address=None, sync=False):
+    """
+    Record an activity log entry.
+
+    Args:
+        user_id: ID of the acting user (or None)
+        action: Short action name, e.g. 'login_success'
+        details: Optional free-text details
+        ip_address: Client IP address
+        sync: Write and commit on the calling thread instead of queueing
+    """
+    entry = {
+        'user_id': user_id,
+        'action': action,
+        'details': details,
+        'ip_address': ip_address,
+        # Stamp now - the row may only be inserted a moment later
+        'timestamp': utc_now(),
+    }
+
+    if sync:
+        _write_batch([entry])
+        return
+
+    _worker.submit(entry)
+
+
+def _write_batch(entries):
+    """Insert entries in one statement and commit (requires an app context)."""
+    try:
+        db.session.bulk_insert_mappings(ActivityLog, entries)
+        db.session.commit()
+    except Exception as e:
+        db.session.rollback()
+        logger.error(f"Failed to write {len(entries)} activity log entries: {e}")
+
+
+_worker = BatchWorker('activity-logger', _write_batch, BATCH_SIZE, SHUTDOWN_TIMEOUT)
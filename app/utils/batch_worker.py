@@ -0,0 +1,117 @@
+"""
+Background batch worker shared by the email sender and activity logger.
+
+Items are queued from request threads together with the app they belong
+to; a daemon thread drains the queue, hands whatever is already waiting
+(up to batch_size items) to a handler inside that app's context, and is
+started on first use in each process (again after a fork). Pending items
+are processed at interpreter shutdown.
+
+Apps with BACKGROUND_WORKERS_SYNC set run the handler on the calling
+thread instead.
+"""
+
+import atexit
+import logging
+import os
+import queue
+import threading
+from typing import Any, Callable, List, Optional
+
+from flask import current_app
+
+logger = logging.getLogger(__name__)
+
+_STOP = object()
+
+
+class BatchWorker:
+    """Queue plus daemon thread that processes items in batches."""
+
+    def __init__(self, name: str, handler: Callable[[List[Any]], Any],
+                 batch_size: int, shutdown_timeout: float):
+        """
+        Args:
+            name: Thread name, also used in log messages
+            handler: Called with a list of items inside their app's context
+            batch_size: Maximum number of items per handler call
+            shutdown_timeout: Seconds to wait for pending items at shutdown
+        """
+        self.name = name
+        self.handler = handler
+        self.batch_size = batch_size
+        self.shutdown_timeout = shutdown_timeout
+        self._queue: "queue.Queue" = queue.Queue()
+        self._worker: Optional[threading.Thread] = None
+        self._worker_pid: Optional[int] = None
+        self._lock = threading.Lock()
+
+    def submit(self, item: Any) -> Any:
+        """
+        Queue item for the current app.
+
+        Returns:
+            True once queued; the handler's result when the app runs
+            workers synchronously
+        """
+        app = current_app._get_current_object()
+        if app.config.get('BACKGROUND_WORKERS_SYNC'):
+            return self.handler([item])
+
+        self._ensure_worker()
+        self._queue.put((app, item))
+        return True
+
+    def shutdown(self):
+        """Process pending items and stop the thread (restarted by the next submit)."""
+        worker = self._worker
+        if worker is not None and worker.is_alive() and self._worker_pid == os.getpid():
+            self._queue.put(_STOP)
+            worker.join(timeout=self.shutdown_timeout)
+
+    def _ensure_worker(self):
+        """Start the thread on first use (and again after a fork)."""
+        if self._worker is not None and self._worker.is_alive() and self._worker_pid == os.getpid():
+            return
+
+        with self._lock:
+            if self._worker is not None and self._worker.is_alive() and self._worker_pid == os.getpid():
+                return
+            if self._worker_pid is None:
+                atexit.register(self.shutdown)
+            self._worker = threading.Thread(target=self._run, name=self.name, daemon=True)
+            self._worker_pid = os.getpid()
+            self._worker.start()
+
+    def _run(self):
+        """Drain the queue until stopped, batching whatever is already waiting."""
+        while True:
+            item = self._queue.get()
+            if item is _STOP:
+                return
+
+            batch = [item]
+            stop = False
+            while len(batch) < self.batch_size:
+                try:
+                    item = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if item is _STOP:
+                    stop = True
+                    break
+                batch.append(item)
+
+            # Items carry their app so each batch uses the right config/database
+            by_app = {}
+            for app, payload in batch:
+                by_app.setdefault(app, []).append(payload)
+            for app, payloads in by_app.items():
+                with app.app_context():
+                    try:
+                        self.handler(payloads)
+                    except Exception as e:
+                        logger.error(f"{self.name}: batch of {len(payloads)} failed: {e}")
+
+            if stop:
+                return
@@ -11,11 +11,21 @@ import logging
 import requests
 import json
 import re
+import threading
 from typing import Optional, Dict, Any, List
 from flask import current_app
+from requests.adapters import HTTPAdapter
+
+from .memo_cache import MemoCache, MISSING
 
 logger = logging.getLogger(__name__)
 
+# Shared HTTP session so DeepSeek/Unsplash calls reuse keep-alive TLS
+# connections instead of handshaking on every request. Sized for the
+# background import pool plus concurrent editor requests.
+_http = requests.Session()
+_http.mount('https://', HTTPAdapter(pool_connections=4, pool_maxsize=10))
+
 
 # =============================================================================
 # DeepSeek API Functions
@@ -315,7 +325,7 @@ def call_deepseek(prompt: str, max_tokens: int = 500, temperature: float = 0.3)
     
     try:
         logger.debug(f"Calling DeepSeek API with prompt length: {len(prompt)}")
-        resp = requests.post(url, headers=headers, json=payload, timeout=60)
+        resp = _http.post(url, headers=headers, json=payload, timeout=60)
         resp.raise_for_status()
         data = resp.json()
         response_text = data['choices'][0]['message']['content'].strip()
@@ -330,6 +340,25 @@ def call_deepseek(prompt: str, max_tokens: int = 500, temperature: float = 0.3)
 # Unsplash API Functions
 # =============================================================================
 
+# Unsplash search memo (1 hour) - repeated SEO runs on the same title send the
+# same query, and the API is rate limited per hour
+UNSPLASH_CACHE_TTL = 3600
+_unsplash_cache = MemoCache('unsplash_search', ttl=UNSPLASH_CACHE_TTL, maxsize=1024)
+
+
+# Picker thumbnails are resized by Unsplash's image CDN to the editor's
+# 16:10 tiles (~200px wide) instead of the 400px "small" rendition
+UNSPLASH_THUMB_PARAMS = 'w=320&h=200&fit=crop&q=60&auto=format'
+
+
+def _unsplash_thumb_url(urls: Dict[str, str]) -> str:
+    """Build a small picker thumbnail URL from an Unsplash photo's urls."""
+    raw = urls.get('raw')
+    if not raw:
+        return urls['small']
+    return f"{raw}{'&' if '?' in raw else '?'}{UNSPLASH_THUMB_PARAMS}"
+
+
 def search_unsplash_images(query: str, orientation: str = 'landscape', 
                            count: int = 6) -> List[Dict[str, Any]]:
     """
@@ -359,9 +388,14 @@ def search_unsplash_images(query: str, orientation: str = 'landscape',
         "order_by": "relevant"
     }
     
+    cache_key = (query.strip().lower(), str(orientation), str(count))
+    cached = _unsplash_cache.get(cache_key)
+    if cached is not MISSING:
+        return cached
+    
     try:
         logger.debug(f"Searching Unsplash for: {query}")
-        resp = requests.get(url, headers=headers, params=params, timeout=30)
+        resp = _http.get(url, headers=headers, params=params, timeout=30)
         resp.raise_for_status()
         data = resp.json()
         
@@ -371,7 +405,7 @@ def search_unsplash_images(query: str, orientation: str = 'landscape',
                 results.append({
                     'id': image['id'],
                     'url': image['urls']['regular'],
-                    'thumb_url': image['urls']['small'],
+                    'thumb_url': _unsplash_thumb_url(image['urls']),
                     'download_url': image['urls']['full'],
                     'author_name': image['user']['name'],
                     'author_username': image['user']['username'],
@@ -385,6 +419,8 @@ def search_unsplash_images(query: str, orientation: str = 'landscape',
         if not results:
             logger.warning(f"No Unsplash results for query: {query}")
         
+        # Only successful responses are cached; errors are retried next time
+        _unsplash_cache.set(cache_key, results)
         return results
             
     except Exception as e:
@@ -514,10 +550,36 @@ def parse_document_file(file_path: str, file_extension: str) -> str:
             return ""
 
 
+# PDFium is not thread-safe, not even across separate documents, and
+# parse_pdf runs on the document-import pool as well as request threads
+_pdfium_lock = threading.Lock()
+
+
 def parse_pdf(file_path: str) -> str:
     """Extract text from a PDF file."""
     try:
-        # Try PyPDF2 first (usually available)
+        # pypdfium2 (native PDFium) is much faster than the pure-Python parsers
+        import pypdfium2 as pdfium
+        with _pdfium_lock:
+            pdf = pdfium.PdfDocument(file_path)
+            try:
+                pages = []
+                for page in pdf:
+                    textpage = page.get_textpage()
+                    # PDFium separates lines with CRLF
+                    pages.append(textpage.get_text_bounded().replace('\r\n', '\n'))
+                    textpage.close()
+                    page.close()
+            finally:
+                pdf.close()
+        return "\n\n".join(pages).strip()
+    except ImportError:
+        logger.warning("pypdfium2 not installed, trying PyPDF2")
+    except Exception as e:
+        logger.error(f"pypdfium2 error: {e}")
+    
+    try:
+        # Pure-Python fallback
         import PyPDF2
         text = ""
         with open(file_path, 'rb') as f:
@@ -0,0 +1,119 @@
+"""
+Background document-to-article imports.
+
+Parsing an uploaded PDF/DOCX and generating an article from it takes
+seconds to minutes (text extraction plus AI and Unsplash calls), which used
+to hold a gunicorn worker for the whole request. The upload view now only
+saves the file and starts a job here; a small thread pool does the work and
+stores the result in a DocumentImportJob row that the editor polls.
+
+Results live in the database rather than in memory because the polling
+request may be served by a different worker process.
+"""
+
+import logging
+import os
+import threading
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from typing import Optional
+
+from flask import current_app
+
+from ..extensions import db
+from ..models import DocumentImportJob
+
+logger = logging.getLogger(__name__)
+
+# Imports processed concurrently per worker process
+MAX_WORKERS = 2
+
+# Jobs whose result was never collected are deleted after this long
+JOB_RETENTION = timedelta(days=1)
+
+# A job still pending after this long is reported as failed (its worker
+# was restarted or the import hung)
+JOB_TIMEOUT = timedelta(minutes=10)
+
+_executor: Optional[ThreadPoolExecutor] = None
+_executor_pid: Optional[int] = None
+_executor_lock = threading.Lock()
+
+
+def start_document_job(user_id: int, tmp_path: str, ext: str, target_style: str) -> str:
+    """
+    Queue an article import from an uploaded document.
+
+    Args:
+        user_id: ID of the uploading user (only they can read the result)
+        tmp_path: Path of the saved upload; deleted once processed
+        ext: File extension ('pdf', 'docx' or 'doc')
+        target_style: Article style passed to the generator
+
+    Returns:
+        The job ID to poll
+    """
+    job_id = uuid.uuid4().hex
+
+    # Drop results nobody came back for
+    DocumentImportJob.query.filter(
+        DocumentImportJob.created_at < datetime.utcnow() - JOB_RETENTION
+    ).delete(synchronize_session=False)
+    db.session.add(DocumentImportJob(id=job_id, user_id=user_id, status='pending'))
+    db.session.commit()
+
+    app = current_app._get_current_object()
+    if app.testing:
+        _run(app, job_id, tmp_path, ext, target_style)
+    else:
+        _get_executor().submit(_run, app, job_id, tmp_path, ext, target_style)
+    return job_id
+
+
+def job_timed_out(job: DocumentImportJob) -> bool:
+    """Whether a pending job has run past JOB_TIMEOUT."""
+    return (job.status == 'pending' and job.created_at is not None
+            and datetime.utcnow() - job.created_at > JOB_TIMEOUT)
+
+
+def _get_executor() -> ThreadPoolExecutor:
+    """Create the pool on first use (and again after a fork)."""
+    global _executor, _executor_pid
+
+    if _executor is not None and _executor_pid == os.getpid():
+        return _executor
+
+    with _executor_lock:
+        if _executor is None or _executor_pid != os.getpid():
+            _executor = ThreadPoolExecutor(max_workers=MAX_WORKERS,
+                                           thread_name_prefix='document-import')
+            _executor_pid = os.getpid()
+    return _executor
+
+
+def _run(app, job_id: str, tmp_path: str, ext: str, target_style: str):
+    """Generate the article and store the outcome on the job row."""
+    from .blog_ai_utils import generate_complete_article_from_file
+
+    with app.app_context():
+        try:
+            result = generate_complete_article_from_file(tmp_path, ext, target_style)
+        except Exception as e:
+            logger.error(f"Error processing document: {e}")
+            result = {'error': f'Failed to process document: {str(e)}'}
+        finally:
+            try:
+                os.unlink(tmp_path)
+            except OSError:
+                pass
+
+        try:
+            job = db.session.get(DocumentImportJob, job_id)
+            if job is not None:
+                job.status = 'done'
+                job.result = result
+                db.session.commit()
+        except Exception as e:
+            db.session.rollback()
+            logger.error(f"Failed to store document import {job_id}: {e}")
@@ -0,0 +1,79 @@
+"""
+Keyset (cursor) pagination for newest-first listings.
+
+Pages are addressed by the (sort column, id) pair of the last/first row of
+the neighbouring page, passed as ?after= / ?before= cursors of the form
+'<iso value>,<id>'. Deep pages cost the same as the first one: there is
+no OFFSET scan and no COUNT query.
+"""
+
+from typing import Any, List, Optional, Tuple
+
+from sqlalchemy import desc, tuple_
+
+
+def parse_cursor(value: Optional[str], column) -> Optional[Tuple[Any, int]]:
+    """
+    Parse a '<iso value>,<id>' cursor for column.
+
+    Args:
+        value: Raw cursor from the query string
+        column: Date or datetime column the cursor positions on
+
+    Returns:
+        (value, id) tuple, or None if missing or malformed
+    """
+    if not value:
+        return None
+    try:
+        cursor_value, cursor_id = value.split(',', 1)
+        return column.type.python_type.fromisoformat(cursor_value), int(cursor_id)
+    except ValueError:
+        return None
+
+
+def make_cursor(row, column, id_column) -> str:
+    """Build the cursor pointing at row (a model instance or result row)."""
+    return f"{getattr(row, column.key).isoformat()},{getattr(row, id_column.key)}"
+
+
+def keyset_page(query, per_page: int, column, id_column,
+                after: Optional[str] = None, before: Optional[str] = None) -> Tuple[List, Optional[str], Optional[str]]:
+    """
+    Fetch one page of query, newest first by (column, id_column).
+
+    Args:
+        query: Query with the page's filters applied; column must be
+            non-null for every matching row
+        per_page: Number of rows per page
+        column: Non-null date/datetime column to order by
+        id_column: Unique tie-breaker column (the primary key)
+        after: Cursor of the last row of the previous page
+        before: Cursor of the first row of the next page (ignored with after)
+
+    Returns:
+        Tuple of (rows, next_cursor, prev_cursor); cursors are None when
+        there is no such page
+    """
+    after = parse_cursor(after, column)
+    before = parse_cursor(before, column) if after is None else None
+
+    key = tuple_(column, id_column)
+    if before is not None:
+        # Walk backwards from the cursor, then restore newest-first order
+        rows = query.filter(key > before).order_by(column, id_column).limit(per_page + 1).all()
+        has_prev = len(rows) > per_page
+        items = rows[:per_page][::-1]
+        has_next = True
+    else:
+        if after is not None:
+            query = query.filter(key < after)
+        # One extra row tells whether there is a next page
+        rows = query.order_by(desc(column), desc(id_column)).limit(per_page + 1).all()
+        has_next = len(rows) > per_page
+        items = rows[:per_page]
+        has_prev = after is not None
+
+    next_cursor = make_cursor(items[-1], column, id_column) if has_next and items else None
+    prev_cursor = make_cursor(items[0], column, id_column) if has_prev and items else None
+    return items, next_cursor, prev_cursor
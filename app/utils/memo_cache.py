@@ -0,0 +1,114 @@
+"""
+Small in-process memo cache with per-entry expiry.
+
+Used for expensive, deterministic computations (chart series, rankings,
+sector statistics) that are requested repeatedly between data changes.
+Entries live in the worker process only; values are deep-copied on the way
+in and out so callers can freely mutate what they get back.
+"""
+
+import copy
+import logging
+import threading
+import time
+from typing import Any, Dict, Hashable, Iterable, Tuple
+
+from sqlalchemy import event, inspect
+from sqlalchemy.orm import Session
+
+logger = logging.getLogger(__name__)
+
+# Sentinel for "not in cache" (None is a valid cached value)
+MISSING = object()
+
+
+class MemoCache:
+    """Thread-safe dict cache with a TTL, cleared on model writes."""
+
+    def __init__(self, name: str, ttl: int, maxsize: int = 128):
+        self.name = name
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self._data: Dict[Hashable, Tuple[float, Any]] = {}
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable) -> Any:
+        """Return a copy of the cached value, or MISSING if absent/expired."""
+        with self._lock:
+            entry = self._data.get(key)
+        if entry is None or entry[0] <= time.monotonic():
+            return MISSING
+        return copy.deepcopy(entry[1])
+
+    def set(self, key: Hashable, value: Any):
+        """Store a copy of value under key."""
+        now = time.monotonic()
+        stored = copy.deepcopy(value)
+        with self._lock:
+            # Drop expired entries, then the oldest ones if still over size
+            for stale_key in [k for k, (expires_at, _) in self._data.items() if expires_at <= now]:
+                del self._data[stale_key]
+            while len(self._data) >= self.maxsize:
+                del self._data[next(iter(self._data))]
+            self._data[key] = (now + self.ttl, stored)
+
+    def clear(self, *args):
+        """
+        Drop all entries.
+
+        Accepts and ignores positional arguments so it can be registered
+        directly as an SQLAlchemy event listener.
+        """
+        with self._lock:
+            if self._data:
+                self._data.clear()
+                logger.debug(f"Memo cache '{self.name}' invalidated")
+
+    def clear_on_changes(self, *models, ignore_columns: Iterable[str] = ()):
+        """
+        Clear the cache whenever a row of any of models is inserted, updated or deleted.
+
+        Args:
+            models: Model classes the cached values are computed from
+            ignore_columns: Attribute names that do not affect the cached
+                values; an update changing only these keeps the cache
+        """
+        ignore_columns = frozenset(ignore_columns)
+
+        def clear_on_update(mapper, connection, target):
+            if ignore_columns:
+                changed = {attr.key for attr in inspect(target).attrs if attr.history.has_changes()}
+                if changed <= ignore_columns:
+                    return
+            self.clear()
+
+        for model in models:
+            event.listen(model, 'after_insert', self.clear)
+            event.listen(model, 'after_update', clear_on_update)
+            event.listen(model, 'after_delete', self.clear)
+
+        # Bulk UPDATE/DELETE statements (session.execute(update(Model)...))
+        # bypass the mapper events above
+        def clear_on_bulk_write(orm_execute_state):
+            if orm_execute_state.is_update or orm_execute_state.is_delete:
+                if any(mapper.class_ in models for mapper in orm_execute_state.all_mappers):
+                    self.clear()
+
+        event.listen(Session, 'do_orm_execute', clear_on_bulk_write)
+
+    def clear_on_table_writes(self, *tables):
+        """
+        Clear the cache whenever a statement run through a Session writes to any of tables.
+
+        For association tables (e.g. analysis_analysts), which have no mapper
+        events and are often written with Core insert()/delete() statements.
+        """
+        def clear_on_write(orm_execute_state):
+            if orm_execute_state.is_insert or orm_execute_state.is_update or orm_execute_state.is_delete:
+                if getattr(orm_execute_state.statement, 'table', None) in tables:
+                    self.clear()
+
+        event.listen(Session, 'do_orm_execute', clear_on_write)
+
+    def __len__(self):
+        return len(self._data)
@@ -21,6 +21,7 @@ import os
 import json
 import logging
 import hashlib
+import time
 from datetime import datetime, timedelta
 from functools import wraps
 from typing import Optional, Any, Callable
@@ -80,8 +81,14 @@ KEY_PREFIX = {
     'board_purchased_series': 'board:purchased:series',
     'overview_data': 'overview:data',
     'last_recalculation': 'system:last_recalculation',
+    'dep_blog_post': 'dep:blog_post',
+    'blog_listings_gen': 'blog:listings_gen',
 }
 
+# Most cache keys recorded per blog post; the oldest entry is dropped
+# from the cache when a post's dependency list is full
+MAX_BLOG_DEPENDENTS = 200
+
 
 def get_cache_key(prefix: str, *args, **kwargs) -> str:
     """Generate a cache key from prefix and arguments."""
@@ -99,6 +106,74 @@ def get_cache_key(prefix: str, *args, **kwargs) -> str:
     return ':'.join(key_parts)
 
 
+def _blog_listings_generation(cache) -> str:
+    """
+    Get the current generation of the blog listings.
+    
+    Listing cache keys include the generation, so bumping it with
+    _bump_blog_listings_generation() retires every page, category and tag
+    variant at once without tracking their keys. A missing generation is
+    started from the clock, so it can never come back to a retired value.
+    """
+    gen_key = KEY_PREFIX['blog_listings_gen']
+    try:
+        generation = cache.get(gen_key)
+        if generation is None:
+            cache.add(gen_key, str(time.time_ns()), timeout=STATIC_DATA_TIMEOUT)
+            generation = cache.get(gen_key)
+    except Exception as e:
+        logger.warning(f"Failed to read blog listings generation: {e}")
+        generation = None
+    return generation or '0'
+
+
+def _bump_blog_listings_generation(cache):
+    """Start a new listings generation; old listing entries expire unread."""
+    cache.set(KEY_PREFIX['blog_listings_gen'], str(time.time_ns()), timeout=STATIC_DATA_TIMEOUT)
+
+
+def _track_blog_dependencies(cache, cache_key: str, post_ids=()):
+    """
+    Record which blog posts a cached entry was built from.
+    
+    Each post gets a dependency list ('dep:blog_post:<id>') of the cache
+    keys that show it, so an edit only drops those entries instead of every
+    blog cache. A list holds at most MAX_BLOG_DEPENDENTS keys; the oldest
+    entry is deleted from the cache when it falls off the list.
+    
+    Args:
+        cache: Cache instance the entry was stored in
+        cache_key: Key of the cached entry
+        post_ids: IDs of the posts shown in the entry
+    """
+    for post_id in post_ids:
+        dep_key = f"{KEY_PREFIX['dep_blog_post']}:{post_id}"
+        try:
+            keys = cache.get(dep_key) or []
+            if cache_key not in keys:
+                keys = keys + [cache_key]
+                for evicted in keys[:-MAX_BLOG_DEPENDENTS]:
+                    cache.delete(evicted)
+                # Read-modify-write: a lost update only means that entry
+                # waits for its TTL, as it did before dependency tracking
+                cache.set(dep_key, keys[-MAX_BLOG_DEPENDENTS:], timeout=STATIC_DATA_TIMEOUT)
+        except Exception as e:
+            logger.warning(f"Failed to track cache dependency {dep_key}: {e}")
+
+
+def _delete_dependents(cache, dep_key: str) -> int:
+    """Delete every cache key recorded under dep_key, then the set itself."""
+    try:
+        keys = cache.get(dep_key) or []
+        for key in keys:
+            cache.delete(key)
+        cache.delete(dep_key)
+        return len(keys)
+    except Exception as e:
+        logger.warning(f"Failed to invalidate dependents of {dep_key}: {e}")
+        return 0
+
+
 def cached(prefix: str, timeout: Optional[int] = None, unless: Optional[Callable] = None):
     """
     Decorator to cache function results.
@@ -347,7 +422,9 @@ def _serialize_blog_post(post) -> dict:
 def get_cached_latest_blog_posts(limit: int = 3, force_refresh: bool = False) -> list:
     """Get cached latest blog posts for main page. Prioritizes PDF stock research. Returns list of SimpleBlogPost objects."""
     cache = get_cache()
-    cache_key = get_cache_key(KEY_PREFIX['main_blog_posts'], limit)
+    cache_key = None
+    if cache and NEON_OPTIMIZE:
+        cache_key = get_cache_key(KEY_PREFIX['main_blog_posts'], _blog_listings_generation(cache), limit)
     
     if not force_refresh and cache and NEON_OPTIMIZE:
         try:
@@ -385,6 +462,7 @@ def get_cached_latest_blog_posts(limit: int = 3, force_refresh: bool = False) ->
     if cache and NEON_OPTIMIZE:
         try:
             cache.set(cache_key, posts_data, timeout=PUBLIC_DATA_TIMEOUT)
+            _track_blog_dependencies(cache, cache_key, [p['id'] for p in posts_data])
         except Exception as e:
             logger.warning(f"Failed to cache blog posts: {e}")
     
@@ -396,7 +474,10 @@ def get_cached_blog_index(page: int = 1, category: str = '', tag: str = '',
                           force_refresh: bool = False) -> dict:
     """Get cached blog index data. Returns dict with SimpleBlogPost objects."""
     cache = get_cache()
-    cache_key = get_cache_key(KEY_PREFIX['blog_index'], page, category, tag)
+    cache_key = None
+    if cache and NEON_OPTIMIZE:
+        cache_key = get_cache_key(KEY_PREFIX['blog_index'], _blog_listings_generation(cache),
+                                  page, category, tag)
     
     if not force_refresh and cache and NEON_OPTIMIZE:
         try:
@@ -417,7 +498,7 @@ def get_cached_blog_index(page: int = 1, category: str = '', tag: str = '',
     
     # Fetch from DB with eager loading
     from ..models import BlogPost
-    from sqlalchemy import desc, or_
+    from sqlalchemy import desc, func, or_
     from sqlalchemy.orm import joinedload
     
     per_page = 9
@@ -441,22 +522,16 @@ def get_cached_blog_index(page: int = 1, category: str = '', tag: str = '',
     
     pagination = query.paginate(page=page, per_page=per_page)
     
-    # Get categories for sidebar
-    categories = BlogPost.query.filter(
+    # Get categories and their post counts for the sidebar in one GROUP BY
+    # (instead of one COUNT query per category)
+    category_rows = BlogPost.query.filter(
         BlogPost.status == 'published',
         BlogPost.is_public == True
-    ).with_entities(BlogPost.category).distinct().all()
-    categories = [c[0] for c in categories if c[0]]
-    
-    # Get category counts
-    category_counts = {}
-    for cat in categories:
-        count = BlogPost.query.filter_by(
-            category=cat,
-            status='published',
-            is_public=True
-        ).count()
-        category_counts[cat] = count
+    ).with_entities(
+        BlogPost.category, func.count(BlogPost.id)
+    ).group_by(BlogPost.category).order_by(BlogPost.category).all()
+    categories = [cat for cat, _ in category_rows if cat]
+    category_counts = {cat: count for cat, count in category_rows if cat}
     
     # Get featured posts with eager loading
     featured_posts = BlogPost.query.options(
@@ -485,6 +560,8 @@ def get_cached_blog_index(page: int = 1, category: str = '', tag: str = '',
     if cache and NEON_OPTIMIZE:
         try:
             cache.set(cache_key, result, timeout=PUBLIC_DATA_TIMEOUT)
+            _track_blog_dependencies(cache, cache_key,
+                                    {p['id'] for p in posts_data + featured_data})
         except Exception as e:
             logger.warning(f"Failed to cache blog index: {e}")
     
@@ -528,6 +605,7 @@ def get_cached_blog_post(slug: str, force_refresh: bool = False):
     if cache and NEON_OPTIMIZE:
         try:
             cache.set(cache_key, post_dict, timeout=PUBLIC_DATA_TIMEOUT)
+            _track_blog_dependencies(cache, cache_key, [post.id])
         except Exception as e:
             logger.warning(f"Failed to cache blog post: {e}")
     
@@ -795,6 +873,7 @@ def get_cached_rss_posts(force_refresh: bool = False) -> list:
     if cache and NEON_OPTIMIZE:
         try:
             cache.set(cache_key, posts_data, timeout=PUBLIC_DATA_TIMEOUT)
+            _track_blog_dependencies(cache, cache_key, [p['id'] for p in posts_data])
         except Exception as e:
             logger.warning(f"Failed to cache RSS posts: {e}")
     
@@ -814,23 +893,25 @@ def get_cached_sitemap_posts(force_refresh: bool = False) -> list:
         except Exception:
             pass
     
-    # Fetch from DB with eager loading
+    # The sitemap only needs each post's URL and last modification date -
+    # no content, author or other columns in the query or the cache
     from ..models import BlogPost
-    from sqlalchemy.orm import joinedload
     
-    posts = BlogPost.query.options(
-        joinedload(BlogPost.author)
-    ).filter(
+    rows = BlogPost.query.with_entities(BlogPost.id, BlogPost.slug, BlogPost.updated_at).filter(
         BlogPost.status == 'published',
         BlogPost.is_public == True
     ).all()
     
     # Serialize before caching
-    posts_data = [_serialize_blog_post(post) for post in posts]
+    posts_data = [
+        {'slug': slug, 'updated_at': updated_at.isoformat() if updated_at else None}
+        for _, slug, updated_at in rows
+    ]
     
     if cache and NEON_OPTIMIZE:
         try:
             cache.set(cache_key, posts_data, timeout=STATIC_DATA_TIMEOUT)  # Longer for sitemap
+            _track_blog_dependencies(cache, cache_key, [post_id for post_id, _, _ in rows])
         except Exception as e:
             logger.warning(f"Failed to cache sitemap posts: {e}")
     
@@ -861,7 +942,13 @@ def invalidate_main_cache():
 
 
 def invalidate_blog_cache():
-    """Invalidate all blog-related caches."""
+    """
+    Invalidate all blog-related caches.
+    
+    Use when the set of published posts changes (publish, unpublish,
+    delete); for edits to a post that stays listed use
+    invalidate_blog_post_cache().
+    """
     keys = [
         KEY_PREFIX['main_blog_posts'],
         KEY_PREFIX['blog_categories'],
@@ -876,9 +963,33 @@ def invalidate_blog_cache():
                 cache.delete(key)
             except Exception:
                 pass
+        # Paginated and per-limit listings are keyed by the listings generation
+        try:
+            _bump_blog_listings_generation(cache)
+        except Exception as e:
+            logger.warning(f"Failed to bump blog listings generation: {e}")
     logger.info("Blog cache invalidated")
 
 
+def invalidate_blog_post_cache(post_id: int) -> int:
+    """
+    Invalidate only the cached entries that show one blog post.
+    
+    Args:
+        post_id: ID of the changed post
+        
+    Returns:
+        Number of cache entries dropped
+    """
+    cache = get_cache()
+    if not cache:
+        return 0
+    
+    dropped = _delete_dependents(cache, f"{KEY_PREFIX['dep_blog_post']}:{post_id}")
+    logger.info(f"Blog post {post_id} cache invalidated ({dropped} entries)")
+    return dropped
+
+
 def invalidate_wall_cache():
     """Invalidate wall/ideas caches."""
     keys = [
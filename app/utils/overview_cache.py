@@ -10,7 +10,9 @@ import os
 import json
 import logging
 from datetime import datetime, timedelta
-from typing import Dict, Optional, Any
+from typing import Dict, Optional, Any, Tuple
+
+import numpy as np
 
 from ..extensions import db
 
@@ -43,6 +45,12 @@ def get_cache_path(filter_type: str) -> str:
     return os.path.join(CACHE_DIR, f'{filter_type}_cache.json')
 
 
+def get_base_cache_path(calc_method: str) -> str:
+    """Get file path of the view basis arrays for a calculation method."""
+    ensure_cache_dir()
+    return os.path.join(CACHE_DIR, f'base_{calc_method}.npz')
+
+
 def get_cached_overview_data(filter_type: str) -> Optional[Dict[str, Any]]:
     """
     Get cached overview data for a filter type if valid.
@@ -114,11 +122,21 @@ def _serialize_for_json(obj):
         return obj
 
 
-def save_overview_cache(filter_type: str, data: Dict):
+def save_overview_cache(filter_type: str, data: Dict, cached_at: Optional[datetime] = None):
     """
     Save overview data to cache.
     Saves to both database (primary) and file (backup).
+    
+    Args:
+        filter_type: Cache key of the view
+        data: View data to cache
+        cached_at: When the data was calculated (default: now). Data derived
+            from an older cache passes that cache's timestamp so it does not
+            outlive it.
     """
+    if cached_at is None:
+        cached_at = datetime.utcnow()
+    
     # Ensure clean transaction state
     try:
         db.session.rollback()
@@ -146,8 +164,8 @@ def save_overview_cache(filter_type: str, data: Dict):
             db_cache.analyst_rankings = serialized_data.get('analyst_rankings', [])
             db_cache.positive_ratio = serialized_data.get('positive_ratio', 0)
             db_cache.total_positions = serialized_data.get('total_positions', 0)
-            db_cache.cached_at = datetime.utcnow()
-            db_cache.expires_at = datetime.utcnow() + timedelta(days=CACHE_EXPIRY_DAYS)
+            db_cache.cached_at = cached_at
+            db_cache.expires_at = cached_at + timedelta(days=CACHE_EXPIRY_DAYS)
             
             db.session.commit()
             db_success = True
@@ -160,7 +178,7 @@ def save_overview_cache(filter_type: str, data: Dict):
     cache_path = get_cache_path(filter_type)
     
     cache_data = {
-        'cached_at': datetime.utcnow().isoformat(),
+        'cached_at': cached_at.isoformat(),
         'filter_type': filter_type,
         'data': data
     }
@@ -173,6 +191,48 @@ def save_overview_cache(filter_type: str, data: Dict):
         logger.error(f"Error saving file cache for {filter_type}: {e}")
 
 
+def save_base_cache(calc_method: str, basis: Dict[str, np.ndarray], meta: Dict[str, Any]):
+    """
+    Save the view basis (per-position arrays shared by all views) for a method.
+    
+    Stored as a compressed .npz file next to the file cache; narrower views
+    missing from the overview cache are derived from it.
+    """
+    meta = dict(meta, cached_at=datetime.utcnow().isoformat())
+    try:
+        with open(get_base_cache_path(calc_method), 'wb') as f:
+            np.savez_compressed(f, meta=np.array(json.dumps(meta, default=str)), **basis)
+        logger.info(f"Saved view basis for {calc_method} ({len(basis['position_ids'])} positions)")
+    except Exception as e:
+        logger.error(f"Error saving view basis for {calc_method}: {e}")
+
+
+def get_cached_base_data(calc_method: str) -> Optional[Tuple[Dict[str, np.ndarray], Dict[str, Any]]]:
+    """
+    Get the view basis for a calculation method if present and fresh.
+    
+    Returns:
+        Tuple of (arrays, metadata) or None
+    """
+    base_path = get_base_cache_path(calc_method)
+    if not os.path.exists(base_path):
+        return None
+    
+    try:
+        with np.load(base_path, allow_pickle=False) as npz:
+            basis = {key: npz[key] for key in npz.files if key != 'meta'}
+            meta = json.loads(str(npz['meta']))
+        
+        age_days = (datetime.utcnow() - datetime.fromisoformat(meta['cached_at'])).days
+        if age_days >= CACHE_EXPIRY_DAYS:
+            logger.info(f"View basis for {calc_method} expired ({age_days} days)")
+            return None
+        return basis, meta
+    except Exception as e:
+        logger.warning(f"Error reading view basis for {calc_method}: {e}")
+        return None
+
+
 def invalidate_cache(filter_type: str = None):
     """
     Invalidate cache for a specific filter or all filters.
@@ -209,6 +269,10 @@ def invalidate_cache(filter_type: str = None):
             cache_path = get_cache_path(ft)
             if os.path.exists(cache_path):
                 os.remove(cache_path)
+        for calc_method in ('incremental', 'equal'):
+            base_path = get_base_cache_path(calc_method)
+            if os.path.exists(base_path):
+                os.remove(base_path)
         logger.info("Invalidated all FILE caches")
 
 
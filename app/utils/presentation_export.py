@@ -31,11 +31,21 @@ from ..extensions import db
 from ..models import (
     Analysis, User, Company, PerformanceCalculation, 
     AnalystMapping, PortfolioPurchase, CompanySectorCache, Vote,
-    StockPrice
+    StockPrice, BenchmarkPrice
 )
+from . import overview_cache
+from .memo_cache import MemoCache, MISSING
 
 logger = logging.getLogger(__name__)
 
+# Per-process memo for generate_portfolio_chart_series.
+# Key: (frozenset(analysis_ids), years, method, today's ordinal)
+CHART_SERIES_CACHE_TTL = int(os.environ.get('CHART_SERIES_CACHE_TTL', 3600))  # 1 hour
+_series_cache = MemoCache('chart_series', ttl=CHART_SERIES_CACHE_TTL)
+
+# Any new/changed price or analysis row can change a chart series
+_series_cache.clear_on_changes(StockPrice, BenchmarkPrice, Analysis)
+
 # Professional color palette
 COLORS = {
     'primary': '#2563eb',      # Blue
@@ -75,6 +85,26 @@ def format_return_pct(x, pos):
 
 
 def generate_portfolio_chart_series(analysis_ids: List[int], years: Optional[int] = None, method: str = 'incremental') -> Dict:
+    """
+    Generate portfolio performance chart data, memoized per process.
+    
+    The result is deterministic for a given analysis set, range and method on
+    a given day, so it is cached for CHART_SERIES_CACHE_TTL seconds (and until
+    the next price/analysis write). Callers receive a copy they may mutate.
+    
+    See _compute_portfolio_chart_series for the calculation itself.
+    """
+    key = (frozenset(analysis_ids or ()), years, method, date.today().toordinal())
+    series_data = _series_cache.get(key)
+    if series_data is not MISSING:
+        return series_data
+    
+    series_data = _compute_portfolio_chart_series(analysis_ids, years=years, method=method)
+    _series_cache.set(key, series_data)
+    return series_data
+
+
+def _compute_portfolio_chart_series(analysis_ids: List[int], years: Optional[int] = None, method: str = 'incremental') -> Dict:
     """
     Generate portfolio performance chart data with monthly datapoints.
     
@@ -579,7 +609,7 @@ def get_sector_analysis(use_cache: bool = True) -> Dict[str, Any]:
         Dict with best_sectors and risk_sectors tables
     """
     import os
-    cache_dir = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'instance', 'overview_cache')
+    cache_dir = overview_cache.CACHE_DIR
     cache_file = os.path.join(cache_dir, 'sector_analysis_cache.json')
     
     # Try to get from file cache
@@ -694,7 +724,7 @@ def get_growth_timeline(use_cache: bool = True) -> Dict[str, Any]:
     import os
     import json
     
-    cache_dir = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'instance', 'overview_cache')
+    cache_dir = overview_cache.CACHE_DIR
     cache_file = os.path.join(cache_dir, 'growth_timeline_cache.json')
     
     # Try to get from file cache
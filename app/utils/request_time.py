@@ -0,0 +1,34 @@
+"""
+Per-request "current time" helper.
+
+A single naive-UTC timestamp is taken when a request starts and reused by
+the auth code, instead of calling datetime.utcnow() (deprecated since
+Python 3.12) at every call site.
+"""
+from datetime import datetime, timezone
+
+from flask import g, has_request_context
+
+
+def _now_utc() -> datetime:
+    """Current UTC time as a naive datetime (matches the DB columns)."""
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
+def cache_request_now():
+    """before_request hook: remember the request start time in g.now_utc."""
+    g.now_utc = _now_utc()
+
+
+def utc_now() -> datetime:
+    """
+    Return the current request's start time in UTC (naive).
+    
+    Outside a request (CLI, scheduler, background threads) the actual
+    current time is returned.
+    """
+    if has_request_context():
+        now = g.get('now_utc')
+        if now is not None:
+            return now
+    return _now_utc()
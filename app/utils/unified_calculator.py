@@ -10,22 +10,141 @@ This module provides a unified approach to calculating all overview data:
 This is much more efficient than fetching data separately for each view.
 """
 
+import json
 import logging
+import os
+import socket
 from datetime import date, datetime, timedelta
 from typing import Dict, List, Optional, Any, Tuple
 from dataclasses import dataclass, field
 from concurrent.futures import ThreadPoolExecutor, as_completed
 import time
 import threading
+import uuid
 
+import numpy as np
 from sqlalchemy import func
 from ..extensions import db
 from ..models import Analysis, PerformanceCalculation, Company, StockPrice, User, analysis_analysts, Vote, PortfolioPurchase
 from .yahooquery_helper import fetch_prices, get_price_on_date, get_latest_price
 from .performance import PerformanceCalculator
 
+try:
+    import orjson
+except ImportError:  # optional - stdlib json is used instead
+    orjson = None
+
 logger = logging.getLogger(__name__)
 
+# Redis channel/key used to share recalculation progress between worker
+# processes (only when REDIS_URL is set and the redis package is installed)
+PROGRESS_CHANNEL = 'overview:recalc'
+PROGRESS_STATE_KEY = 'overview:recalc:state'
+PROGRESS_STATE_TTL = 3600
+
+# Cross-process "recalculation running" lock; the TTL releases it if the
+# process holding it dies mid-run
+RECALC_LOCK_KEY = 'overview:recalc:lock'
+RECALC_LOCK_TTL = 30 * 60
+
+# Most log lines sent in one progress update (clients keep the full log)
+PROGRESS_LOG_TAIL = 50
+
+_redis_client = None
+_redis_checked = False
+
+
+def get_redis_client():
+    """Return a shared Redis client, or None to keep progress in-process."""
+    global _redis_client, _redis_checked
+    
+    if not _redis_checked:
+        _redis_checked = True
+        redis_url = os.environ.get('REDIS_URL')
+        if redis_url:
+            try:
+                import redis
+                _redis_client = redis.Redis.from_url(redis_url, decode_responses=True)
+            except ImportError:
+                logger.warning("REDIS_URL is set but the redis package is not installed; "
+                               "recalculation progress stays per-process")
+    return _redis_client
+
+
+# Overview views, broadest first; the index is the view's bit in view_mask_bits
+VIEW_NAMES = ['all', 'approved_neutral', 'all_approved', 'board_approved', 'purchased']
+
+
+def monthly_dates(earliest_date: date, end_date: date) -> List[str]:
+    """Generate the monthly ISO date grid used by overview series."""
+    dates = []
+    current = earliest_date
+    while current <= end_date:
+        dates.append(current.isoformat())
+        if current.month == 12:
+            current = current.replace(year=current.year + 1, month=1)
+        else:
+            # Handle months with different days
+            next_month = current.month + 1
+            next_year = current.year
+            if next_month > 12:
+                next_month = 1
+                next_year += 1
+            try:
+                current = current.replace(year=next_year, month=next_month)
+            except ValueError:
+                # Handle end of month (e.g., Jan 31 -> Feb 28)
+                current = current.replace(year=next_year, month=next_month, day=1)
+                # Go to last day of previous month
+                current = current - timedelta(days=1)
+                current = current.replace(day=min(current.day, 28))
+    
+    if not dates:
+        dates = [earliest_date.isoformat(), end_date.isoformat()]
+    return dates
+
+
+def summarize_sector_returns(sector_returns: Dict[str, List[float]]) -> Dict[str, Any]:
+    """Build overview sector statistics from per-sector lists of returns."""
+    sector_counts = {sector: len(returns) for sector, returns in sector_returns.items()}
+    
+    # Calculate statistics per sector
+    sector_stats = []
+    for sector, returns in sector_returns.items():
+        if returns:
+            avg_return = sum(returns) / len(returns)
+            positive_count = sum(1 for r in returns if r > 0)
+            positive_ratio = (positive_count / len(returns)) * 100
+            
+            # Calculate risk (standard deviation)
+            if len(returns) > 1:
+                mean = avg_return
+                variance = sum((r - mean) ** 2 for r in returns) / len(returns)
+                risk = variance ** 0.5
+            else:
+                risk = 0
+            
+            sector_stats.append({
+                'sector': sector,
+                'count': sector_counts[sector],
+                'avg_return': round(avg_return, 2),
+                'positive_ratio': round(positive_ratio, 2),
+                'risk': round(risk, 2),
+                'min_return': round(min(returns), 2),
+                'max_return': round(max(returns), 2)
+            })
+    
+    # Sort by different metrics
+    by_return = sorted(sector_stats, key=lambda x: x['avg_return'], reverse=True)[:5]
+    by_risk = sorted(sector_stats, key=lambda x: x['risk'], reverse=True)[:5]
+    
+    return {
+        'all_sectors': sector_stats,
+        'top_by_return': by_return,
+        'top_by_risk': by_risk,
+        'sector_counts': sector_counts
+    }
+
 
 @dataclass
 class CalculationProgress:
@@ -36,19 +155,37 @@ class CalculationProgress:
     status: str = "idle"  # idle, fetching_prices, calculating, completed, error
     message: str = ""
     logs: List[str] = field(default_factory=list)
+    version: int = 0  # bumped on every status/log change
     _lock: Any = field(default_factory=threading.Lock)
+    _changed: Any = field(default_factory=threading.Condition)
+    
+    def _state(self) -> Dict[str, Any]:
+        """Progress fields without the log lines (caller holds the lock)."""
+        return {
+            'total': self.total_companies,
+            'processed': self.processed_companies,
+            'current': self.current_company,
+            'status': self.status,
+            'message': self.message,
+            'progress_pct': round((self.processed_companies / self.total_companies * 100), 1) if self.total_companies > 0 else 0,
+            'log_count': len(self.logs)
+        }
     
     def to_dict(self) -> Dict[str, Any]:
         with self._lock:
-            return {
-                'total': self.total_companies,
-                'processed': self.processed_companies,
-                'current': self.current_company,
-                'status': self.status,
-                'message': self.message,
-                'progress_pct': round((self.processed_companies / self.total_companies * 100), 1) if self.total_companies > 0 else 0,
-                'logs': list(self.logs[-50:])  # Keep last 50 logs
-            }
+            data = self._state()
+            data['logs'] = list(self.logs[-PROGRESS_LOG_TAIL:])
+            return data
+    
+    def get_delta(self, since_index: int) -> Tuple[Dict[str, Any], List[str]]:
+        """
+        Return the progress fields and the log lines added since since_index.
+        
+        At most the last PROGRESS_LOG_TAIL new lines are returned.
+        """
+        with self._lock:
+            start = max(since_index, len(self.logs) - PROGRESS_LOG_TAIL)
+            return self._state(), list(self.logs[start:])
     
     def log(self, message: str):
         """Add a log message with timestamp."""
@@ -56,12 +193,44 @@ class CalculationProgress:
         with self._lock:
             self.logs.append(f"[{timestamp}] {message}")
             self.message = message
+        self.notify_changed()
+        self._publish()
         logger.info(message)
         
     def update_status(self, status: str):
         """Update status thread-safely."""
         with self._lock:
             self.status = status
+        self.notify_changed()
+        self._publish()
+    
+    def notify_changed(self):
+        """Wake up every SSE stream waiting on this progress object."""
+        with self._changed:
+            self.version += 1
+            self._changed.notify_all()
+    
+    def _publish(self):
+        """Mirror the shared tracker's state to Redis so every worker can stream it."""
+        client = get_redis_client()
+        if client is None or self is not current_progress:
+            return
+        try:
+            payload = json.dumps(self.to_dict())
+            client.set(PROGRESS_STATE_KEY, payload, ex=PROGRESS_STATE_TTL)
+            client.publish(PROGRESS_CHANNEL, payload)
+        except Exception as e:
+            logger.warning(f"Could not publish recalculation progress: {e}")
+    
+    def wait_for_change(self, since_version: int, timeout: float) -> int:
+        """
+        Block until the version moves past since_version or timeout expires.
+        
+        Returns the current version (equal to since_version on timeout).
+        """
+        with self._changed:
+            self._changed.wait_for(lambda: self.version != since_version, timeout=timeout)
+            return self.version
             
     def update_progress(self, current: str, processed: int):
         """Update progress thread-safely."""
@@ -94,6 +263,8 @@ class UnifiedDataCalculator:
         self.progress = progress or CalculationProgress()
         self.calculator = PerformanceCalculator()
         self._unified_data: Optional[Dict[str, Any]] = None
+        self._analyst_rankings: Optional[Dict[str, List]] = None
+        self._company_sectors: Dict[int, Optional[str]] = {}
         
     def recalculate_all(self, force: bool = False) -> Dict[str, Any]:
         """
@@ -124,8 +295,13 @@ class UnifiedDataCalculator:
             
             # Step 5: Calculate all views from unified data
             self.progress.log("Building view datasets...")
+            self._analyst_rankings = None
             all_views_data = self._calculate_all_views()
             
+            # Step 6: Save per-position basis arrays so a missing view cache
+            # can later be derived without a full recalculation
+            self._save_view_bases(all_views_data)
+            
             elapsed = time.time() - start_time
             self.progress.update_status("completed")
             self.progress.log(f"Recalculation completed in {elapsed:.1f}s")
@@ -421,7 +597,7 @@ class UnifiedDataCalculator:
         views = {}
         
         # Calculate each view for both methods
-        for view_name in ['all', 'approved_neutral', 'all_approved', 'board_approved', 'purchased']:
+        for view_name in VIEW_NAMES:
             for method in ['incremental', 'equal']:
                 cache_key = f"{view_name}_{method}"
                 self.progress.log(f"Calculating view: {view_name} (method: {method})")
@@ -447,8 +623,11 @@ class UnifiedDataCalculator:
         # Calculate sector statistics
         sector_stats = self._calculate_sector_stats(analysis_ids)
         
-        # Calculate analyst rankings (these are global, not view-specific)
-        analyst_rankings = self._calculate_analyst_rankings()
+        # Calculate analyst rankings (these are global, not view-specific,
+        # so compute them once per run and share across all views)
+        if self._analyst_rankings is None:
+            self._analyst_rankings = self._calculate_analyst_rankings()
+        analyst_rankings = self._analyst_rankings
         
         # Calculate positive ratio
         positive_count = 0
@@ -475,6 +654,218 @@ class UnifiedDataCalculator:
             'calc_method': method
         }
     
+    def _save_view_bases(self, all_views_data: Dict[str, Any]):
+        """Build and save the view basis for both calculation methods (non-fatal)."""
+        from .overview_cache import save_base_cache
+        
+        for method in ['incremental', 'equal']:
+            try:
+                basis, meta = self.build_view_basis(all_views_data, method)
+                save_base_cache(method, basis, meta)
+            except Exception as e:
+                logger.warning(f"Could not save view basis for {method}: {e}")
+    
+    def build_view_basis(self, all_views_data: Dict[str, Any], method: str) -> Tuple[Dict[str, np.ndarray], Dict[str, Any]]:
+        """
+        Build per-position arrays from which any view can be re-aggregated.
+        
+        One row per analysis with performance, one column per date of any
+        view's series grid. values[n, t] is the position's return on dates[t]
+        (NaN before entry or without prices); view_mask_bits bit i marks
+        membership in VIEW_NAMES[i].
+        
+        Returns:
+            Tuple of (arrays, metadata)
+        """
+        positions = [
+            (analysis_id, data) for analysis_id, data in self._unified_data['analyses'].items()
+            if data.get('performance') and data.get('analysis_date')
+        ]
+        
+        view_mask_bits = np.zeros(len(positions), dtype=np.uint8)
+        # Rank of each row within each view's id list, so derived views keep
+        # the same position order (sector listing order depends on it)
+        view_order = np.full((len(VIEW_NAMES), len(positions)), -1, dtype=np.int32)
+        row_by_id = {analysis_id: row for row, (analysis_id, _) in enumerate(positions)}
+        for bit, view_name in enumerate(VIEW_NAMES):
+            for rank, analysis_id in enumerate(self._get_analysis_ids_for_view(view_name)):
+                row = row_by_id.get(analysis_id)
+                if row is not None:
+                    view_mask_bits[row] |= 1 << bit
+                    view_order[bit, row] = rank
+        
+        # Union of all date grids computed for this method
+        grid = set()
+        for view_name in VIEW_NAMES:
+            view_data = all_views_data.get(f"{view_name}_{method}", {})
+            for series_key in ('series_all', 'series_1y'):
+                if view_data.get(series_key):
+                    grid.update(view_data[series_key]['dates'])
+        dates = np.array(sorted(grid), dtype='datetime64[D]')
+        
+        entry_dates = np.array([data['analysis_date'][:10] for _, data in positions], dtype='datetime64[D]')
+        return_pct = np.array([float(data['performance']['return_pct']) for _, data in positions])
+        annualized = np.array([float(data['performance']['annualized_return']) for _, data in positions])
+        company_ids = np.array([data['company_id'] for _, data in positions], dtype=np.int64)
+        
+        active = entry_dates[:, None] <= dates[None, :]
+        if method == 'equal':
+            values = np.where(active, return_pct[:, None], np.nan)
+        else:
+            values = self._price_return_matrix(company_ids, entry_dates, dates)
+            values[~active] = np.nan
+        
+        basis = {
+            'position_ids': np.array([analysis_id for analysis_id, _ in positions], dtype=np.int64),
+            'entry_dates': entry_dates,
+            'return_pct': return_pct,
+            'annualized': annualized,
+            'sectors': np.array([self._get_sector(cid) or '' for cid in company_ids.tolist()], dtype=str),
+            'view_mask_bits': view_mask_bits,
+            'view_order': view_order,
+            'dates': dates,
+            'values': values,
+        }
+        meta = {
+            'calculation_date': self._unified_data['metadata']['calculation_date'],
+            'analyst_rankings': self._analyst_rankings or {},
+        }
+        return basis, meta
+    
+    def _price_return_matrix(self, company_ids: np.ndarray, entry_dates: np.ndarray, dates: np.ndarray) -> np.ndarray:
+        """
+        Return % change from each position's entry price to its price on every date.
+        
+        Prices are "on or before" the date, matching get_price_on_date(), but
+        come from one query per run instead of one per position and date.
+        """
+        values = np.full((len(company_ids), len(dates)), np.nan)
+        if not len(company_ids):
+            return values
+        
+        rows = db.session.query(StockPrice.company_id, StockPrice.date, StockPrice.close_price).filter(
+            StockPrice.company_id.in_(set(company_ids.tolist()))
+        ).order_by(StockPrice.company_id, StockPrice.date).all()
+        
+        prices_by_company = {}
+        for company_id, price_date, close_price in rows:
+            prices_by_company.setdefault(company_id, ([], []))
+            prices_by_company[company_id][0].append(price_date)
+            prices_by_company[company_id][1].append(float(close_price) if close_price is not None else 0.0)
+        
+        for row, company_id in enumerate(company_ids.tolist()):
+            if company_id not in prices_by_company:
+                continue
+            price_dates = np.array(prices_by_company[company_id][0], dtype='datetime64[D]')
+            closes = np.array(prices_by_company[company_id][1])
+            
+            entry_idx = np.searchsorted(price_dates, entry_dates[row], side='right') - 1
+            if entry_idx < 0 or closes[entry_idx] <= 0:
+                continue
+            entry_price = closes[entry_idx]
+            
+            idx = np.searchsorted(price_dates, dates, side='right') - 1
+            current = np.where(idx >= 0, closes[np.maximum(idx, 0)], 0.0)
+            values[row] = np.where(current != 0, (current - entry_price) / entry_price * 100, np.nan)
+        
+        return values
+    
+    def derive_view_from_basis(self, basis: Dict[str, np.ndarray], meta: Dict[str, Any],
+                               view_name: str, method: str) -> Optional[Dict[str, Any]]:
+        """
+        Derive a view's overview data from a saved view basis.
+        
+        Series are re-aggregated in memory from the basis; only the cheap
+        benchmark lookups touch the database. Returns None if the basis does
+        not cover the view's date grid.
+        """
+        if view_name not in VIEW_NAMES:
+            return None
+        
+        bit = VIEW_NAMES.index(view_name)
+        rows = np.flatnonzero((basis['view_mask_bits'] >> bit) & 1)
+        rows = rows[np.argsort(basis['view_order'][bit][rows], kind='stable')]
+        entry_dates = basis['entry_dates'][rows]
+        return_pct = basis['return_pct'][rows]
+        annualized = basis['annualized'][rows]
+        values = basis['values'][rows]
+        count = len(rows)
+        end_date = date.fromisoformat(meta['calculation_date'])
+        
+        def series_for(years: Optional[int]) -> Optional[Dict]:
+            if not count:
+                return None
+            if years is not None:
+                earliest_date = end_date - timedelta(days=years * 365)
+                in_range = entry_dates >= np.datetime64(earliest_date, 'D')
+                if not in_range.any():
+                    return None
+            else:
+                in_range = np.ones(count, dtype=bool)
+                earliest_date = entry_dates.min().astype(date)
+            
+            dates = monthly_dates(earliest_date, end_date)
+            grid = np.array(dates, dtype='datetime64[D]')
+            columns = np.searchsorted(basis['dates'], grid)
+            if (columns >= len(basis['dates'])).any() or (basis['dates'][columns] != grid).any():
+                raise LookupError(f"View basis does not cover the {view_name} date grid")
+            
+            block = values[in_range][:, columns]
+            valid = ~np.isnan(block)
+            totals = np.where(valid, block, 0.0).sum(axis=0)
+            counts = valid.sum(axis=0)
+            with np.errstate(invalid='ignore', divide='ignore'):
+                portfolio_series = np.where(counts > 0, np.round(totals / np.maximum(counts, 1), 2), 0.0)
+            
+            return {
+                'dates': dates,
+                'portfolio_series': portfolio_series.tolist(),
+                'spy_series': self._get_benchmark_series('SPY', earliest_date, end_date, dates),
+                'vt_series': self._get_benchmark_series('VT', earliest_date, end_date, dates),
+                'eems_series': self._get_benchmark_series('EEMS', earliest_date, end_date, dates)
+            }
+        
+        try:
+            series_all = series_for(None)
+            series_1y = series_for(1)
+        except LookupError as e:
+            logger.info(str(e))
+            return None
+        
+        if count:
+            earliest_date = entry_dates.min().astype(date)
+            days = (date.today() - earliest_date).days
+            portfolio_performance = {
+                'num_positions': count,
+                'total_return': round(float(return_pct.sum()) / count, 2),
+                'annualized_return': round(float(annualized.sum()) / count, 2),
+                'start_date': earliest_date.isoformat(),
+                'benchmark_spy': round(self._get_cached_benchmark_return('SPY', days), 2),
+                'benchmark_ftse': round(self._get_cached_benchmark_return('VT', days), 2),
+                'benchmark_eems': round(self._get_cached_benchmark_return('EEMS', days), 2)
+            }
+        else:
+            portfolio_performance = self._calculate_portfolio_performance([])
+        
+        sector_returns = {}
+        for sector, ret in zip(basis['sectors'][rows].tolist(), return_pct.tolist()):
+            if sector:
+                sector_returns.setdefault(sector, []).append(ret)
+        
+        positive_ratio = (int((return_pct > 0).sum()) / count * 100) if count else 0
+        
+        return {
+            'portfolio_performance': portfolio_performance,
+            'series_all': series_all,
+            'series_1y': series_1y,
+            'sector_stats': summarize_sector_returns(sector_returns),
+            'analyst_rankings': meta.get('analyst_rankings', {}),
+            'positive_ratio': round(positive_ratio, 2),
+            'total_positions': count,
+            'analysis_ids': basis['position_ids'][rows].tolist(),
+            'calc_method': method
+        }
+    
     def _get_analysis_ids_for_view(self, view_name: str) -> List[int]:
         """Get analysis IDs for a specific view from unified data."""
         if not self._unified_data:
@@ -605,30 +996,7 @@ class UnifiedDataCalculator:
             earliest_date = analyses_with_perf[0]['analysis_date']
         
         # Generate monthly dates
-        dates = []
-        current = earliest_date
-        while current <= end_date:
-            dates.append(current.isoformat())
-            if current.month == 12:
-                current = current.replace(year=current.year + 1, month=1)
-            else:
-                # Handle months with different days
-                next_month = current.month + 1
-                next_year = current.year
-                if next_month > 12:
-                    next_month = 1
-                    next_year += 1
-                try:
-                    current = current.replace(year=next_year, month=next_month)
-                except ValueError:
-                    # Handle end of month (e.g., Jan 31 -> Feb 28)
-                    current = current.replace(year=next_year, month=next_month, day=1)
-                    # Go to last day of previous month
-                    current = current - timedelta(days=1)
-                    current = current.replace(day=min(current.day, 28))
-        
-        if not dates:
-            dates = [earliest_date.isoformat(), end_date.isoformat()]
+        dates = monthly_dates(earliest_date, end_date)
         
         # Calculate portfolio series based on method
         portfolio_series = []
@@ -692,75 +1060,40 @@ class UnifiedDataCalculator:
     
     def _calculate_sector_stats(self, analysis_ids: List[int]) -> Dict[str, Any]:
         """Calculate sector statistics for a list of analyses."""
-        from .sector_helper import get_company_sector_async
-        
         sector_returns = {}
-        sector_counts = {}
         
         for analysis_id in analysis_ids:
             analysis_data = self._unified_data['analyses'].get(analysis_id)
             if not analysis_data:
                 continue
             
-            company_id = analysis_data['company_id']
-            company = Company.query.get(company_id)
-            
-            if not company:
+            sector = self._get_sector(analysis_data['company_id'])
+            if sector is None:
                 continue
             
-            # Get sector (async version returns cached data)
-            sector = get_company_sector_async(company)
-            if not sector:
-                sector = 'Unknown'
-            
             perf = analysis_data.get('performance')
             if perf:
                 # Ensure value is float (not Decimal)
-                ret = float(perf['return_pct'])
-                
-                if sector not in sector_returns:
-                    sector_returns[sector] = []
-                    sector_counts[sector] = 0
-                
-                sector_returns[sector].append(ret)
-                sector_counts[sector] += 1
-        
-        # Calculate statistics per sector
-        sector_stats = []
-        for sector, returns in sector_returns.items():
-            if returns:
-                avg_return = sum(returns) / len(returns)
-                positive_count = sum(1 for r in returns if r > 0)
-                positive_ratio = (positive_count / len(returns)) * 100
-                
-                # Calculate risk (standard deviation)
-                if len(returns) > 1:
-                    mean = avg_return
-                    variance = sum((r - mean) ** 2 for r in returns) / len(returns)
-                    risk = variance ** 0.5
-                else:
-                    risk = 0
-                
-                sector_stats.append({
-                    'sector': sector,
-                    'count': sector_counts[sector],
-                    'avg_return': round(avg_return, 2),
-                    'positive_ratio': round(positive_ratio, 2),
-                    'risk': round(risk, 2),
-                    'min_return': round(min(returns), 2),
-                    'max_return': round(max(returns), 2)
-                })
+                sector_returns.setdefault(sector, []).append(float(perf['return_pct']))
         
-        # Sort by different metrics
-        by_return = sorted(sector_stats, key=lambda x: x['avg_return'], reverse=True)[:5]
-        by_risk = sorted(sector_stats, key=lambda x: x['risk'], reverse=True)[:5]
+        return summarize_sector_returns(sector_returns)
+    
+    def _get_sector(self, company_id: int) -> Optional[str]:
+        """
+        Get a company's sector ('Unknown' if not known, None if the company is gone).
         
-        return {
-            'all_sectors': sector_stats,
-            'top_by_return': by_return,
-            'top_by_risk': by_risk,
-            'sector_counts': sector_counts
-        }
+        Memoized for the run - every view asks for the same companies.
+        """
+        from .sector_helper import get_company_sector_async
+        
+        if company_id not in self._company_sectors:
+            company = Company.query.get(company_id)
+            if not company:
+                self._company_sectors[company_id] = None
+            else:
+                # Get sector (async version returns cached data)
+                self._company_sectors[company_id] = get_company_sector_async(company) or 'Unknown'
+        return self._company_sectors[company_id]
     
     def _calculate_analyst_rankings(self) -> Dict[str, List]:
         """Calculate analyst rankings."""
@@ -959,7 +1292,23 @@ class UnifiedDataCalculator:
 
 # Global progress tracker for SSE
 current_progress = CalculationProgress()
-_calculation_lock = False
+
+# Held for the whole recalculation when Redis is not configured; with Redis
+# the RECALC_LOCK_KEY entry is the lock instead (it spans all workers)
+_calculation_lock = threading.Lock()
+
+# Token returned for the process-local lock (it cannot expire, so there is
+# no other holder to tell apart)
+LOCAL_LOCK_TOKEN = 'local'
+
+# Delete the Redis lock only if it still holds our token - after a TTL
+# expiry it may belong to another worker's run
+_RELEASE_LOCK_SCRIPT = """
+if redis.call('get', KEYS[1]) == ARGV[1] then
+    return redis.call('del', KEYS[1])
+end
+return 0
+"""
 
 
 def get_progress() -> CalculationProgress:
@@ -970,33 +1319,199 @@ def get_progress() -> CalculationProgress:
 def reset_progress():
     """Reset progress tracker."""
     global current_progress
+    previous = current_progress
     current_progress = CalculationProgress()
+    # Streams still waiting on the old tracker must switch to the new one
+    previous.notify_changed()
     return current_progress
 
 
+def iter_progress_updates(keepalive_interval: float = 15):
+    """
+    Yield progress updates for an SSE stream as soon as they change.
+    
+    Each update carries the progress fields plus only the log lines the
+    stream has not sent yet: 'logs_append' holds the new lines and 'seq' the
+    index of the first of them, so clients append instead of re-rendering
+    the whole log (a 'seq' lower than the client's count means the tracker
+    was reset).
+    
+    Yields None when nothing changed for keepalive_interval seconds and
+    stops after the final 'completed'/'error' state. Uses Redis pub/sub when
+    configured, so a stream served by any worker sees the recalculation
+    running in another one.
+    """
+    client = get_redis_client()
+    if client is not None:
+        try:
+            pubsub = client.pubsub(ignore_subscribe_messages=True)
+            pubsub.subscribe(PROGRESS_CHANNEL)
+        except Exception as e:
+            logger.warning(f"Redis unavailable for progress stream, using local tracker: {e}")
+        else:
+            yield from _iter_redis_progress(client, pubsub, keepalive_interval)
+            return
+    yield from _iter_local_progress(keepalive_interval)
+
+
+# Idle heartbeat: an SSE comment line, ignored by EventSource.onmessage
+SSE_KEEPALIVE = b": hb\n\n"
+
+
+def encode_progress_event(data: Dict[str, Any]) -> bytes:
+    """Encode a progress update as an SSE 'data:' event."""
+    if orjson is not None:
+        return b"data: " + orjson.dumps(data) + b"\n\n"
+    return f"data: {json.dumps(data)}\n\n".encode('utf-8')
+
+
+def _progress_frame(state: Dict[str, Any], new_logs: List[str]) -> Dict[str, Any]:
+    """Build an SSE update from the progress fields and the unsent log lines."""
+    frame = dict(state)
+    frame['logs_append'] = new_logs
+    frame['seq'] = state['log_count'] - len(new_logs)
+    return frame
+
+
+def _iter_local_progress(keepalive_interval: float):
+    """Stream updates from this process's progress tracker."""
+    progress = get_progress()
+    version = progress.version
+    state, new_logs = progress.get_delta(0)
+    sent_log_count = state['log_count']
+    yield _progress_frame(state, new_logs)
+    
+    while True:
+        if state['status'] in ['completed', 'error']:
+            # Give trailing log lines a moment to arrive before the last update
+            progress.wait_for_change(version, timeout=2)
+            state, new_logs = progress.get_delta(sent_log_count)
+            yield _progress_frame(state, new_logs)
+            return
+        
+        # Block until the calculator reports a status/log change (or the
+        # tracker is reset); no polling while nothing happens
+        new_version = progress.wait_for_change(version, timeout=keepalive_interval)
+        current = get_progress()
+        if current is progress and new_version == version:
+            yield None
+            continue
+        
+        if current is not progress:
+            # New run - its log starts from scratch
+            sent_log_count = 0
+        progress = current
+        version = progress.version
+        state, new_logs = progress.get_delta(sent_log_count)
+        sent_log_count = state['log_count']
+        yield _progress_frame(state, new_logs)
+
+
+def _redis_frame(data: Dict[str, Any], sent_log_count: int) -> Dict[str, Any]:
+    """Turn a published progress snapshot into an update with only unsent lines."""
+    log_count = data.get('log_count', len(data['logs']))
+    if log_count < sent_log_count:
+        # Tracker was reset for a new run
+        sent_log_count = 0
+    unsent = log_count - sent_log_count
+    state = {key: value for key, value in data.items() if key != 'logs'}
+    state['log_count'] = log_count
+    return _progress_frame(state, data['logs'][-unsent:] if unsent > 0 else [])
+
+
+def _iter_redis_progress(client, pubsub, keepalive_interval: float):
+    """Stream updates published by whichever worker runs the recalculation."""
+    try:
+        state = client.get(PROGRESS_STATE_KEY)
+        data = json.loads(state) if state else get_progress().to_dict()
+        frame = _redis_frame(data, 0)
+        yield frame
+        
+        while True:
+            if data['status'] in ['completed', 'error']:
+                # Give trailing log lines a moment to arrive before the last update
+                message = pubsub.get_message(timeout=2)
+                if message:
+                    data = json.loads(message['data'])
+                yield _redis_frame(data, frame['log_count'])
+                return
+            
+            message = pubsub.get_message(timeout=keepalive_interval)
+            if message is None:
+                yield None
+                continue
+            
+            data = json.loads(message['data'])
+            frame = _redis_frame(data, frame['log_count'])
+            yield frame
+    finally:
+        pubsub.close()
+
+
+def acquire_calculation_lock() -> Optional[str]:
+    """
+    Atomically claim the right to run a recalculation.
+    
+    Uses SET NX on RECALC_LOCK_KEY when Redis is configured (one holder
+    across all workers), otherwise a process-local lock. The holder must pass
+    the returned token to release_calculation_lock() when the run ends.
+    
+    Returns:
+        The lock token if the lock was acquired (truthy), None if a
+        recalculation is running
+    """
+    client = get_redis_client()
+    if client is not None:
+        token = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex}"
+        if client.set(RECALC_LOCK_KEY, token, nx=True, ex=RECALC_LOCK_TTL):
+            return token
+        return None
+    return LOCAL_LOCK_TOKEN if _calculation_lock.acquire(blocking=False) else None
+
+
+def release_calculation_lock(token: str):
+    """
+    Release the lock taken by acquire_calculation_lock().
+    
+    With Redis the key is only deleted while it still holds token, so a run
+    that outlived RECALC_LOCK_TTL cannot drop a lock another worker has
+    since taken.
+    
+    Args:
+        token: The value acquire_calculation_lock() returned
+    """
+    client = get_redis_client()
+    if client is not None:
+        try:
+            if not client.eval(_RELEASE_LOCK_SCRIPT, 1, RECALC_LOCK_KEY, token):
+                logger.warning("Recalculation lock had expired or changed hands before release")
+        except Exception as e:
+            logger.warning(f"Could not release recalculation lock (expires on its own): {e}")
+    elif _calculation_lock.locked():
+        _calculation_lock.release()
+
+
 def is_calculation_running() -> bool:
-    """Check if a calculation is currently running."""
-    global _calculation_lock
-    return _calculation_lock
+    """Check if a calculation is currently running (in any process, with Redis)."""
+    client = get_redis_client()
+    if client is not None:
+        try:
+            return bool(client.exists(RECALC_LOCK_KEY))
+        except Exception as e:
+            logger.warning(f"Could not check recalculation lock: {e}")
+            return False
+    return _calculation_lock.locked()
 
 
 def recalculate_all_unified(force: bool = False) -> Dict[str, Any]:
     """
     Convenience function to recalculate all data with unified calculator.
     
+    The caller must hold the recalculation lock (acquire_calculation_lock()).
+    
     Returns dict with all views data.
     """
-    global _calculation_lock
-    
-    if _calculation_lock:
-        raise RuntimeError("A recalculation is already in progress")
-    
-    try:
-        _calculation_lock = True
-        progress = reset_progress()
-        progress.log("=== STARTING RECALCULATION ===")
-        calculator = UnifiedDataCalculator(progress=progress)
-        result = calculator.recalculate_all(force=force)
-        return result
-    finally:
-        _calculation_lock = False
+    progress = reset_progress()
+    progress.log("=== STARTING RECALCULATION ===")
+    calculator = UnifiedDataCalculator(progress=progress)
+    return calculator.recalculate_all(force=force)
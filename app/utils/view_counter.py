@@ -0,0 +1,136 @@
+"""
+Buffered blog post view counter.
+
+Counting a view used to be an UPDATE + commit on every article GET. Views
+are now added up in memory and a daemon thread writes the accumulated
+deltas every FLUSH_INTERVAL seconds - one UPDATE per viewed post per flush.
+Counts that fail to write stay buffered for the next flush, and a forked
+child starts with an empty buffer so the parent's counts are written once.
+"""
+
+import atexit
+import logging
+import os
+import threading
+from contextlib import nullcontext
+from typing import Dict, Optional
+
+from flask import current_app, has_app_context
+from sqlalchemy import bindparam
+
+from ..extensions import db
+from ..models import BlogPost
+
+logger = logging.getLogger(__name__)
+
+# Seconds between writes of the buffered view counts
+FLUSH_INTERVAL = 60
+
+# {app: {post_id: views not yet written}}
+_pending: Dict[object, Dict[int, int]] = {}
+_lock = threading.Lock()
+_stop = threading.Event()
+_worker: Optional[threading.Thread] = None
+_worker_pid: Optional[int] = None
+
+
+def record_view(post_id: int):
+    """Count one view of a blog post (written to the database later)."""
+    app = current_app._get_current_object()
+    with _lock:
+        counts = _pending.setdefault(app, {})
+        counts[post_id] = counts.get(post_id, 0) + 1
+
+    if app.testing:
+        flush()
+        return
+    _ensure_worker()
+
+
+def pending_views(post_id: int) -> int:
+    """Views of post_id counted by this process but not yet written."""
+    with _lock:
+        counts = _pending.get(current_app._get_current_object())
+        return counts.get(post_id, 0) if counts else 0
+
+
+def flush():
+    """Write all buffered view counts, one UPDATE per post."""
+    with _lock:
+        batches = list(_pending.items())
+        _pending.clear()
+
+    table = BlogPost.__table__
+    statement = table.update().where(
+        table.c.id == bindparam('post_id')
+    ).values(view_count=table.c.view_count + bindparam('delta'))
+
+    for app, counts in batches:
+        if not counts:
+            continue
+        rows = [{'post_id': post_id, 'delta': delta} for post_id, delta in counts.items()]
+        # Reuse the caller's session when flushing for the current app
+        in_app = has_app_context() and current_app._get_current_object() is app
+        with (nullcontext() if in_app else app.app_context()):
+            try:
+                db.session.execute(statement, rows)
+                db.session.commit()
+            except Exception as e:
+                db.session.rollback()
+                logger.error(f"Failed to write view counts for {len(rows)} posts: {e}")
+                _merge_back(app, counts)
+
+
+def _merge_back(app, counts: Dict[int, int]):
+    """Return unwritten counts to the buffer for the next flush."""
+    with _lock:
+        pending = _pending.setdefault(app, {})
+        for post_id, delta in counts.items():
+            pending[post_id] = pending.get(post_id, 0) + delta
+
+
+def _ensure_worker():
+    """Start the flush thread on first use (and again after a fork)."""
+    global _worker, _worker_pid
+
+    if _worker is not None and _worker.is_alive() and _worker_pid == os.getpid():
+        return
+
+    with _lock:
+        if _worker is not None and _worker.is_alive() and _worker_pid == os.getpid():
+            return
+        if _worker_pid is None:
+            atexit.register(_shutdown)
+        _worker = threading.Thread(target=_run, name='view-counter', daemon=True)
+        _worker_pid = os.getpid()
+        _worker.start()
+
+
+def _run():
+    """Flush every FLUSH_INTERVAL seconds until shutdown."""
+    while not _stop.wait(FLUSH_INTERVAL):
+        flush()
+
+
+def _shutdown():
+    """Write pending counts before the process exits."""
+    _stop.set()
+    flush()
+
+
+def _reset_after_fork():
+    """
+    Start the child with no buffered counts and no flush thread.
+
+    The parent still owns (and writes) the counts it buffered before the
+    fork; the lock is replaced because another thread may have held it.
+    """
+    global _pending, _lock, _stop, _worker
+    _pending = {}
+    _lock = threading.Lock()
+    _stop = threading.Event()
+    _worker = None
+
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=_reset_after_fork)
@@ -0,0 +1,55 @@
+#!/usr/bin/env python3
+"""
+Migration script to add the pdf_etag column to blog_posts and fill it in.
+
+BlogPost stores a digest of pdf_binary whenever the bytes are set, so
+serve_pdf can answer If-None-Match revalidations without loading the blob.
+Rows stored before this column existed are fingerprinted here, one post at
+a time so only a single PDF is held in memory.
+
+Usage:
+    python scripts/migrate_pdf_etag.py
+"""
+
+import sys
+sys.path.insert(0, '.')
+
+from sqlalchemy import inspect, select, text, update
+
+from app import create_app
+from app.extensions import db
+from app.models import BlogPost
+
+
+def migrate():
+    """Add the pdf_etag column if missing and backfill it for stored PDFs."""
+    app = create_app()
+    
+    with app.app_context():
+        table = BlogPost.__tablename__
+        columns = [column['name'] for column in inspect(db.engine).get_columns(table)]
+        
+        if 'pdf_etag' in columns:
+            print("✓ Column pdf_etag already exists.")
+        else:
+            with db.engine.begin() as conn:
+                conn.execute(text(f"ALTER TABLE {table} ADD COLUMN pdf_etag VARCHAR(32)"))
+            print("✓ Added pdf_etag column")
+        
+        post_ids = [post_id for (post_id,) in db.session.query(BlogPost.id).filter(
+            BlogPost.has_pdf_binary,
+            BlogPost.pdf_etag.is_(None)
+        )]
+        for post_id in post_ids:
+            pdf_data = db.session.scalar(select(BlogPost.pdf_binary).where(BlogPost.id == post_id))
+            db.session.execute(update(BlogPost).where(BlogPost.id == post_id).values(
+                pdf_etag=BlogPost.pdf_digest(pdf_data),
+                # Keep the post's modification time (sitemap lastmod, Last-Modified)
+                updated_at=BlogPost.updated_at
+            ))
+            db.session.commit()
+        print(f"✓ Fingerprinted {len(post_ids)} stored PDF(s).")
+
+
+if __name__ == '__main__':
+    migrate()
@@ -0,0 +1,50 @@
+#!/usr/bin/env python3
+"""
+Migration script to create composite indexes used by the hot performance queries.
+
+db.create_all() only creates indexes for tables that do not exist yet, so
+existing databases need this script after deploying the new models.
+"""
+
+import sys
+sys.path.insert(0, '.')
+
+from app import create_app
+from app.extensions import db
+from app.models import Analysis, BenchmarkPrice, BlogPost, Company, PerformanceCalculation
+
+
+def migrate():
+    """Create any missing indexes declared on the models."""
+    app = create_app()
+    
+    with app.app_context():
+        # Company trigram indexes need pg_trgm (declared PostgreSQL-only, skipped elsewhere)
+        if db.engine.dialect.name == 'postgresql':
+            with db.engine.begin() as conn:
+                conn.execute(db.text("CREATE EXTENSION IF NOT EXISTS pg_trgm"))
+        
+        for model in (Analysis, BenchmarkPrice, BlogPost, Company, PerformanceCalculation):
+            for index in model.__table__.indexes:
+                index.create(db.engine, checkfirst=True)
+                columns = ', '.join(column.name for column in index.columns)
+                print(f"Index '{index.name}' on {model.__tablename__} ({columns}) is present.")
+        
+        # Show the plan for the hot benchmark lookup so index usage can be verified
+        if db.engine.dialect.name == 'sqlite':
+            plan = db.session.execute(db.text(
+                "EXPLAIN QUERY PLAN SELECT close_price FROM benchmark_prices "
+                "WHERE ticker = 'SPY' AND date <= date('now') ORDER BY date DESC LIMIT 1"
+            )).all()
+        else:
+            plan = db.session.execute(db.text(
+                "EXPLAIN SELECT close_price FROM benchmark_prices "
+                "WHERE ticker = 'SPY' AND date <= CURRENT_DATE ORDER BY date DESC LIMIT 1"
+            )).all()
+        print("\nQuery plan for latest benchmark price lookup:")
+        for row in plan:
+            print(f"  {row[-1]}")
+
+
+if __name__ == '__main__':
+    migrate()
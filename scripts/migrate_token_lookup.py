@@ -0,0 +1,47 @@
+#!/usr/bin/env python3
+"""
+Migration script to add the indexed token_lookup column to password_reset_tokens.
+
+Also creates the other indexes declared on PasswordResetToken (the partial
+ix_prt_active index on unused tokens).
+
+New tokens store an HMAC digest so validate_token() can find them with one
+indexed query. Existing rows keep token_lookup NULL and are still accepted
+until they expire.
+
+Usage:
+    python scripts/migrate_token_lookup.py
+"""
+
+import sys
+sys.path.insert(0, '.')
+
+from sqlalchemy import inspect, text
+
+from app import create_app
+from app.extensions import db
+from app.models import PasswordResetToken
+
+
+def migrate():
+    """Add the token_lookup column and the token indexes if missing."""
+    app = create_app()
+    
+    with app.app_context():
+        table = PasswordResetToken.__tablename__
+        columns = [column['name'] for column in inspect(db.engine).get_columns(table)]
+        
+        if 'token_lookup' in columns:
+            print("✓ Column token_lookup already exists.")
+        else:
+            with db.engine.begin() as conn:
+                conn.execute(text(f"ALTER TABLE {table} ADD COLUMN token_lookup VARCHAR(64)"))
+            print("✓ Added token_lookup column")
+        
+        for index in PasswordResetToken.__table__.indexes:
+            index.create(db.engine, checkfirst=True)
+            print(f"✓ Index '{index.name}' is present.")
+
+
+if __name__ == '__main__':
+    migrate()
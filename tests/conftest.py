@@ -0,0 +1,38 @@
+"""
+Shared pytest fixtures.
+"""
+
+import pytest
+
+from app import create_app
+from app.extensions import cache, db
+from app.utils import overview_cache
+
+
+@pytest.fixture
+def seed():
+    """
+    Rows to add before a test runs.
+
+    Override in a test module with a fixture returning a function; it is
+    called inside the app context after the tables are created and its
+    rows are committed.
+    """
+    return None
+
+
+@pytest.fixture
+def app(seed, tmp_path, monkeypatch):
+    """Testing app on a fresh in-memory database, populated by the seed fixture."""
+    # File caches go to tmp_path so tests never write into the source tree
+    monkeypatch.setattr(overview_cache, 'CACHE_DIR', str(tmp_path / 'overview_cache'))
+    app = create_app('testing')
+    with app.app_context():
+        db.create_all()
+        cache.clear()
+        if seed is not None:
+            seed()
+            db.session.commit()
+        yield app
+        cache.clear()
+        db.session.remove()
@@ -0,0 +1,69 @@
+"""
+Tests for the background batch worker behind emails and activity logs.
+"""
+
+import pytest
+
+from app import email_service
+from app.extensions import db, mail
+from app.models import ActivityLog
+from app.utils import activity_logger
+
+
+@pytest.fixture(autouse=True)
+def queued(app):
+    """Queue work for the background threads instead of running it inline."""
+    app.config['BACKGROUND_WORKERS_SYNC'] = False
+
+
+class TestBatchWorker:
+    """Test that queued items are handled by the worker thread."""
+    
+    def test_activity_entries_written_in_background(self, app):
+        """Test that queued entries are only written once the worker drains them."""
+        with app.app_context():
+            for i in range(5):
+                activity_logger.log_activity_entry(None, f'action_{i}')
+            
+            activity_logger._worker.shutdown()
+            
+            actions = sorted(entry.action for entry in ActivityLog.query.all())
+            assert actions == [f'action_{i}' for i in range(5)]
+    
+    def test_emails_sent_in_background(self, app):
+        """Test that queued emails are sent by the worker thread."""
+        app.extensions['mail'].default_sender = 'tracker@example.com'
+        with app.app_context(), mail.record_messages() as outbox:
+            assert email_service.send_email_async('a@example.com', 'Subject A', 'Body')
+            assert email_service.send_email_async('b@example.com', 'Subject B', 'Body')
+            
+            email_service._worker.shutdown()
+            
+            assert sorted(message.subject for message in outbox) == ['Subject A', 'Subject B']
+    
+    def test_sync_flag_runs_on_calling_thread(self, app):
+        """Test that BACKGROUND_WORKERS_SYNC writes before returning."""
+        app.config['BACKGROUND_WORKERS_SYNC'] = True
+        with app.app_context():
+            activity_logger.log_activity_entry(None, 'sync_action')
+            
+            assert ActivityLog.query.filter_by(action='sync_action').count() == 1
+
+
+class TestSendEmailsBulk:
+    """Test that bulk SMTP sends go through the shared SMTP sender."""
+    
+    def test_one_connection_for_batch(self, app, monkeypatch):
+        """Test that every email is sent by _send_smtp over the same connection."""
+        calls = []
+        monkeypatch.setattr(email_service, '_send_smtp',
+                            lambda to, subject, body, html=None, connection=None: calls.append((to, connection)))
+        with app.app_context():
+            sent = email_service.send_emails_bulk([
+                ('a@example.com', 'Subject', 'Body', None),
+                ('b@example.com', 'Subject', 'Body', None),
+            ])
+        
+        assert sent == 2
+        assert [to for to, _ in calls] == ['a@example.com', 'b@example.com']
+        assert calls[0][1] is not None and calls[0][1] is calls[1][1]
@@ -0,0 +1,89 @@
+"""
+Tests for document text extraction in blog_ai_utils.
+"""
+
+import threading
+
+import pytest
+
+from app.utils import blog_ai_utils
+from app.utils.blog_ai_utils import parse_pdf
+
+pdfium = pytest.importorskip('pypdfium2')
+
+
+def _write_pdf(path, text):
+    """Write a one-page PDF showing text in Helvetica."""
+    stream = f'BT /F1 12 Tf 72 720 Td ({text}) Tj ET'.encode()
+    objects = [
+        b'<< /Type /Catalog /Pages 2 0 R >>',
+        b'<< /Type /Pages /Kids [3 0 R] /Count 1 >>',
+        b'<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] '
+        b'/Contents 4 0 R /Resources << /Font << /F1 5 0 R >> >> >>',
+        b'<< /Length ' + str(len(stream)).encode() + b' >>\nstream\n' + stream + b'\nendstream',
+        b'<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>',
+    ]
+    out = bytearray(b'%PDF-1.4\n')
+    offsets = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(len(out))
+        out += f'{number} 0 obj\n'.encode() + body + b'\nendobj\n'
+    xref = len(out)
+    out += f'xref\n0 {len(objects) + 1}\n0000000000 65535 f \n'.encode()
+    for offset in offsets:
+        out += f'{offset:010d} 00000 n \n'.encode()
+    out += f'trailer\n<< /Size {len(objects) + 1} /Root 1 0 R >>\nstartxref\n{xref}\n%%EOF\n'.encode()
+    path.write_bytes(bytes(out))
+
+
+class TestParsePdf:
+    """Test PDF text extraction."""
+    
+    def test_extracts_text(self, tmp_path):
+        """Test that text is read through PDFium."""
+        path = tmp_path / 'doc.pdf'
+        _write_pdf(path, 'Quarterly results')
+        assert 'Quarterly results' in parse_pdf(str(path))
+    
+    def test_concurrent_parses_do_not_overlap(self, tmp_path, monkeypatch):
+        """Test that two parses never have PDFium documents open at once."""
+        paths = []
+        for i in range(2):
+            paths.append(tmp_path / f'doc{i}.pdf')
+            _write_pdf(paths[-1], f'Document number {i}')
+        
+        state = {'open': 0, 'max_open': 0}
+        state_lock = threading.Lock()
+        real_document = pdfium.PdfDocument
+        
+        class TrackingDocument(real_document):
+            def __init__(self, *args, **kwargs):
+                with state_lock:
+                    state['open'] += 1
+                    state['max_open'] = max(state['max_open'], state['open'])
+                super().__init__(*args, **kwargs)
+            
+            def close(self):
+                super().close()
+                with state_lock:
+                    state['open'] -= 1
+        
+        monkeypatch.setattr(pdfium, 'PdfDocument', TrackingDocument)
+        
+        results = {}
+        start = threading.Barrier(2)
+        
+        def parse(i):
+            start.wait()
+            for _ in range(20):
+                results[i] = parse_pdf(str(paths[i]))
+        
+        threads = [threading.Thread(target=parse, args=(i,)) for i in range(2)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        
+        assert state['max_open'] == 1
+        assert 'Document number 0' in results[0]
+        assert 'Document number 1' in results[1]
@@ -0,0 +1,157 @@
+"""
+Query-count tests for the blog listing pages.
+
+Each listing should render with a fixed number of SQL statements no matter
+how many posts are on the page (no per-row lazy loads).
+"""
+
+from datetime import datetime
+
+import pytest
+from sqlalchemy import event
+
+from app.extensions import db
+from app.models import BlogPost, User
+
+
+@pytest.fixture
+def seed():
+    """An admin, a writer and 15 posts alternating between them."""
+    def add_posts():
+        admin = User(email='admin@example.com', is_admin=True)
+        admin.set_password('Admin-Password-1')
+        writer = User(email='writer@example.com')
+        writer.set_password('Writer-Password-1')
+        db.session.add_all([admin, writer])
+        db.session.flush()
+        for i in range(15):
+            db.session.add(BlogPost(
+                title=f'Post {i}', slug=f'post-{i}', content='Body ' * 50,
+                author_id=(admin.id, writer.id)[i % 2], status='published',
+                is_public=True, published_at=datetime(2024, 1, 1 + i)
+            ))
+    return add_posts
+
+
+def _count_statements(app, client, url):
+    """Render url and return the number of SQL statements it executed."""
+    statements = []
+    
+    def count(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+    
+    with app.app_context():
+        engine = db.engine
+    event.listen(engine, 'before_cursor_execute', count)
+    try:
+        response = client.get(url)
+    finally:
+        event.remove(engine, 'before_cursor_execute', count)
+    assert response.status_code == 200
+    return len(statements)
+
+
+class TestBlogListingQueries:
+    """Test that blog listings do not issue a query per post."""
+    
+    def _login(self, client, user_id):
+        with client.session_transaction() as session:
+            session['_user_id'] = str(user_id)
+            session['_fresh'] = True
+    
+    def test_admin_posts_loads_authors_with_page(self, app):
+        """Test that admin_posts renders authors without per-row queries."""
+        client = app.test_client()
+        self._login(client, 1)
+        
+        # Current user + the page (authors joined in)
+        assert _count_statements(app, client, '/blog/admin/posts') <= 2
+    
+    def test_my_posts_constant_queries(self, app):
+        """Test that my_posts renders with one query for the page."""
+        client = app.test_client()
+        self._login(client, 2)
+        
+        assert _count_statements(app, client, '/blog/my-posts') <= 2
+    
+    def test_author_posts_constant_queries(self, app):
+        """Test that author pages render with the author and page queries only."""
+        client = app.test_client()
+        
+        assert _count_statements(app, client, '/blog/author/1') <= 2
+
+
+class TestCategoriesCache:
+    """Test that the memoized editor categories follow BlogPost writes."""
+    
+    def test_categories_cleared_by_bulk_update(self, app):
+        """Test that an UPDATE statement also clears the cache."""
+        from sqlalchemy import update
+        from app.blog.routes import _categories_cache, get_blog_categories
+        
+        with app.app_context():
+            _categories_cache.clear()
+            assert get_blog_categories() == []
+            
+            db.session.execute(update(BlogPost).where(BlogPost.slug == 'post-14').values(category='Research'))
+            db.session.commit()
+            assert get_blog_categories() == ['Research']
+
+
+class TestDeletePost:
+    """Test the statement-based delete_post."""
+    
+    def test_delete_removes_post_and_attachments(self, app):
+        """Test that delete_post removes the row and its attachments."""
+        from app.models import BlogPostAttachment
+        
+        with app.app_context():
+            post_id = BlogPost.query.filter_by(slug='post-0').first().id
+            db.session.add(BlogPostAttachment(post_id=post_id, file_path='/tmp/a.pdf',
+                                              file_name='a.pdf', file_type='supplemental'))
+            db.session.commit()
+        
+        client = app.test_client()
+        with client.session_transaction() as session:
+            session['_user_id'] = '1'
+            session['_fresh'] = True
+        response = client.post(f'/blog/delete/{post_id}')
+        
+        assert response.status_code == 302
+        with app.app_context():
+            assert db.session.get(BlogPost, post_id) is None
+            assert BlogPostAttachment.query.filter_by(post_id=post_id).count() == 0
+    
+    def test_delete_other_users_post_refused(self, app):
+        """Test that non-admins cannot delete someone else's post."""
+        with app.app_context():
+            post_id = BlogPost.query.filter_by(slug='post-0').first().id  # admin's post
+        
+        client = app.test_client()
+        with client.session_transaction() as session:
+            session['_user_id'] = '2'
+            session['_fresh'] = True
+        client.post(f'/blog/delete/{post_id}')
+        
+        with app.app_context():
+            assert db.session.get(BlogPost, post_id) is not None
+
+
+class TestNewPostSlug:
+    """Test slug collision handling in new_post."""
+    
+    def test_same_title_same_second_gets_suffix(self, app, monkeypatch):
+        """Test that a colliding slug is retried with a suffix instead of failing."""
+        monkeypatch.setattr(BlogPost, 'generate_slug', lambda self: 'fixed-slug')
+        client = app.test_client()
+        with client.session_transaction() as session:
+            session['_user_id'] = '1'
+            session['_fresh'] = True
+        
+        for _ in range(2):
+            response = client.post('/blog/new', data={'title': 'Same', 'content': 'Body'})
+            assert response.status_code == 302
+        
+        with app.app_context():
+            slugs = {post.slug for post in BlogPost.query.filter_by(title='Same')}
+        assert slugs == {'fixed-slug', 'fixed-slug-2'}
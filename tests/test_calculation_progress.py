@@ -0,0 +1,225 @@
+"""
+Tests for the recalculation progress tracker used by the SSE endpoints.
+"""
+
+import json
+import threading
+
+from app.utils import unified_calculator
+from app.utils.unified_calculator import CalculationProgress
+
+
+class TestCalculationProgress:
+    """Test change notification on CalculationProgress."""
+
+    def test_wait_times_out_without_changes(self):
+        """Test that wait_for_change returns the same version on timeout."""
+        progress = CalculationProgress()
+        assert progress.wait_for_change(progress.version, timeout=0.01) == progress.version
+
+    def test_log_and_status_bump_version(self):
+        """Test that log() and update_status() signal a change."""
+        progress = CalculationProgress()
+        start = progress.version
+        progress.log('hello')
+        progress.update_status('calculating')
+        assert progress.wait_for_change(start, timeout=0.01) == start + 2
+
+    def test_waiter_is_woken_by_other_thread(self):
+        """Test that a blocked waiter wakes up as soon as another thread logs."""
+        progress = CalculationProgress()
+        timer = threading.Timer(0.05, progress.log, args=('done',))
+        timer.start()
+        try:
+            assert progress.wait_for_change(0, timeout=5) == 1
+        finally:
+            timer.cancel()
+
+    def test_reset_wakes_waiters_on_old_tracker(self):
+        """Test that reset_progress() notifies streams holding the old tracker."""
+        old = unified_calculator.get_progress()
+        version = old.version
+        unified_calculator.reset_progress()
+        assert old.wait_for_change(version, timeout=0.01) != version
+        assert unified_calculator.get_progress() is not old
+
+    def test_progress_stream_ends_after_completion(self):
+        """Test that the SSE update stream stops after the final state."""
+        progress = unified_calculator.reset_progress()
+        progress.update_status('completed')
+        updates = list(unified_calculator.iter_progress_updates(keepalive_interval=0.01))
+        assert [update['status'] for update in updates] == ['completed', 'completed']
+
+    def test_get_delta_returns_only_new_lines(self):
+        """Test that get_delta() returns the lines after since_index."""
+        progress = CalculationProgress()
+        progress.log('first')
+        progress.log('second')
+        state, new_logs = progress.get_delta(1)
+        assert state['log_count'] == 2
+        assert len(new_logs) == 1 and new_logs[0].endswith('second')
+
+    def test_progress_stream_sends_each_line_once(self):
+        """Test that SSE updates append log lines instead of resending them."""
+        progress = unified_calculator.reset_progress()
+        progress.log('starting')
+        progress.update_status('completed')
+        updates = list(unified_calculator.iter_progress_updates(keepalive_interval=0.01))
+        assert [len(update['logs_append']) for update in updates] == [1, 0]
+        assert updates[-1]['seq'] == 1
+
+    def test_encode_progress_event(self):
+        """Test that updates are encoded as a single SSE data event."""
+        event = unified_calculator.encode_progress_event({'status': 'calculating', 'logs_append': ['ř']})
+        assert event.startswith(b'data: ') and event.endswith(b'\n\n')
+        assert json.loads(event[len(b'data: '):].decode('utf-8')) == {'status': 'calculating', 'logs_append': ['ř']}
+
+
+class TestCalculationLock:
+    """Test the recalculation lock (process-local, without Redis)."""
+
+    def test_lock_is_exclusive(self):
+        """Test that only one caller can hold the recalculation lock."""
+        token = unified_calculator.acquire_calculation_lock()
+        assert token
+        try:
+            assert unified_calculator.is_calculation_running()
+            assert not unified_calculator.acquire_calculation_lock()
+        finally:
+            unified_calculator.release_calculation_lock(token)
+        assert not unified_calculator.is_calculation_running()
+
+    def test_concurrent_acquire_has_single_winner(self):
+        """Test that simultaneous attempts cannot both start a recalculation."""
+        barrier = threading.Barrier(8)
+        results = []
+
+        def attempt():
+            barrier.wait()
+            results.append(unified_calculator.acquire_calculation_lock())
+
+        threads = [threading.Thread(target=attempt) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        winners = [token for token in results if token]
+        unified_calculator.release_calculation_lock(winners[0])
+        assert len(winners) == 1
+
+
+class _FakeRedis:
+    """Just enough of a Redis client for the recalculation lock."""
+
+    def __init__(self):
+        self.data = {}
+
+    def set(self, key, value, nx=False, ex=None):
+        if nx and key in self.data:
+            return None
+        self.data[key] = value
+        return True
+
+    def exists(self, key):
+        return int(key in self.data)
+
+    def eval(self, script, numkeys, key, token):
+        # The compare-and-delete the release script performs
+        assert "redis.call('get', KEYS[1]) == ARGV[1]" in script
+        if self.data.get(key) == token:
+            del self.data[key]
+            return 1
+        return 0
+
+
+class TestRedisCalculationLock:
+    """Test the cross-process recalculation lock."""
+
+    def test_release_after_expiry_keeps_new_holder(self, monkeypatch):
+        """Test that a run outliving the TTL cannot drop the next holder's lock."""
+        client = _FakeRedis()
+        monkeypatch.setattr(unified_calculator, 'get_redis_client', lambda: client)
+
+        first = unified_calculator.acquire_calculation_lock()
+        assert first
+        # TTL expires, another worker takes the lock
+        del client.data[unified_calculator.RECALC_LOCK_KEY]
+        second = unified_calculator.acquire_calculation_lock()
+        assert second and second != first
+
+        unified_calculator.release_calculation_lock(first)
+        assert unified_calculator.is_calculation_running()
+
+        unified_calculator.release_calculation_lock(second)
+        assert not unified_calculator.is_calculation_running()
+
+
+class _ExitedProcess:
+    """Stand-in for a recalculation process that has already exited."""
+
+    def __init__(self, exitcode):
+        self.pid = 4242
+        self.exitcode = exitcode
+
+    def join(self):
+        pass
+
+
+class TestRecalculationWatcher:
+    """Test reaping of the recalculation process."""
+
+    def test_killed_process_releases_lock(self, monkeypatch):
+        """Test that a child killed before its finally frees the lock and reports the error."""
+        from app import tasks
+
+        client = _FakeRedis()
+        monkeypatch.setattr(unified_calculator, 'get_redis_client', lambda: client)
+        token = unified_calculator.acquire_calculation_lock()
+        progress = unified_calculator.reset_progress()
+
+        tasks._watch_recalculation_process(_ExitedProcess(-9), token)
+
+        assert not unified_calculator.is_calculation_running()
+        assert progress.status == 'error'
+
+    def test_clean_exit_leaves_lock_alone(self, monkeypatch):
+        """Test that a normal exit does not touch a lock the next run may hold."""
+        from app import tasks
+
+        client = _FakeRedis()
+        monkeypatch.setattr(unified_calculator, 'get_redis_client', lambda: client)
+        token = unified_calculator.acquire_calculation_lock()
+
+        tasks._watch_recalculation_process(_ExitedProcess(0), 'finished-run-token')
+
+        assert unified_calculator.is_calculation_running()
+        unified_calculator.release_calculation_lock(token)
+
+
+class TestRecalculationWorkerApp:
+    """Test the app built inside the recalculation process."""
+
+    def test_worker_app_skips_scheduler_and_startup(self, monkeypatch):
+        """Test that a worker app starts no scheduler and creates no tables."""
+        from app import create_app, scheduler
+        from app.extensions import db
+
+        calls = []
+        monkeypatch.setattr(scheduler, 'init_scheduler', lambda app: calls.append('scheduler'))
+        monkeypatch.setattr(db, 'create_all', lambda *args, **kwargs: calls.append('create_all'))
+
+        app = create_app('testing', worker=True)
+
+        assert calls == []
+        assert 'blog' in app.blueprints
+
+    def test_web_app_starts_scheduler(self, monkeypatch):
+        """Test that the regular factory still starts the scheduler."""
+        from app import create_app, scheduler
+
+        calls = []
+        monkeypatch.setattr(scheduler, 'init_scheduler', lambda app: calls.append('scheduler'))
+
+        create_app('testing')
+
+        assert calls == ['scheduler']
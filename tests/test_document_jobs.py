@@ -0,0 +1,64 @@
+"""
+Tests for polling background document imports.
+"""
+
+from datetime import datetime
+
+import pytest
+
+from app.extensions import db
+from app.models import DocumentImportJob, User
+from app.utils.document_jobs import JOB_TIMEOUT
+
+
+@pytest.fixture
+def seed():
+    """One writer."""
+    return lambda: db.session.add(User(email='writer@example.com'))
+
+
+@pytest.fixture
+def client(app):
+    """Client logged in as the writer."""
+    client = app.test_client()
+    with client.session_transaction() as session:
+        session['_user_id'] = '1'
+        session['_fresh'] = True
+    return client
+
+
+def _add_job(job_id, created_at):
+    db.session.add(DocumentImportJob(id=job_id, user_id=1, status='pending', created_at=created_at))
+    db.session.commit()
+
+
+class TestDocumentStatus:
+    """Test that a poller always reaches a final status."""
+    
+    def test_recent_pending_job(self, app, client):
+        """Test that a job within the timeout is still pending."""
+        with app.app_context():
+            _add_job('a' * 32, datetime.utcnow())
+        
+        response = client.get(f"/blog/api/document-status/{'a' * 32}")
+        
+        assert response.status_code == 202
+        assert response.get_json() == {'status': 'pending'}
+    
+    def test_stuck_job_fails(self, app, client):
+        """Test that a job pending past JOB_TIMEOUT is reported failed and dropped."""
+        with app.app_context():
+            _add_job('b' * 32, datetime.utcnow() - JOB_TIMEOUT * 2)
+        
+        response = client.get(f"/blog/api/document-status/{'b' * 32}")
+        
+        assert response.get_json()['status'] == 'failed'
+        with app.app_context():
+            assert db.session.get(DocumentImportJob, 'b' * 32) is None
+    
+    def test_unknown_job_fails(self, client):
+        """Test that an unknown job (e.g. lost in a restart) is reported failed."""
+        response = client.get(f"/blog/api/document-status/{'c' * 32}")
+        
+        assert response.status_code == 404
+        assert response.get_json()['status'] == 'failed'
@@ -0,0 +1,60 @@
+"""
+Tests for keyset pagination.
+"""
+
+from datetime import date, datetime
+
+import pytest
+
+from app.extensions import db
+from app.models import Analysis, BlogPost, User
+from app.utils.keyset import keyset_page, parse_cursor
+
+
+@pytest.fixture
+def seed():
+    """Five posts with distinct update times, two sharing one."""
+    def add_posts():
+        author = User(email='author@example.com')
+        db.session.add(author)
+        db.session.flush()
+        for i, day in enumerate([1, 2, 3, 3, 5]):
+            db.session.add(BlogPost(title=f'Post {i}', slug=f'post-{i}', content='Body',
+                                    author_id=author.id, updated_at=datetime(2024, 1, day)))
+    return add_posts
+
+
+def _page(per_page=2, **cursors):
+    posts, next_cursor, prev_cursor = keyset_page(
+        BlogPost.query, per_page, BlogPost.updated_at, BlogPost.id, **cursors
+    )
+    return [post.slug for post in posts], next_cursor, prev_cursor
+
+
+class TestKeysetPage:
+    """Test paging forwards and backwards through a listing."""
+    
+    def test_walks_forward_and_back(self, app):
+        """Test that after/before cursors visit every row once, ties included."""
+        first, next_cursor, prev_cursor = _page()
+        assert first == ['post-4', 'post-3']
+        assert prev_cursor is None
+        
+        second, next_cursor, prev_cursor = _page(after=next_cursor)
+        assert second == ['post-2', 'post-1']
+        
+        third, last_next, _ = _page(after=next_cursor)
+        assert third == ['post-0']
+        assert last_next is None
+        
+        back, _, _ = _page(before=prev_cursor)
+        assert back == first
+    
+    def test_malformed_cursor_gives_first_page(self, app):
+        """Test that a bad cursor falls back to the first page."""
+        assert _page(after='not-a-cursor')[0] == ['post-4', 'post-3']
+    
+    def test_date_column_cursor(self):
+        """Test that cursors on a date column parse as dates, on a datetime column as datetimes."""
+        assert parse_cursor('2024-03-01,7', Analysis.analysis_date) == (date(2024, 3, 1), 7)
+        assert parse_cursor('2024-03-01T10:30:00,7', BlogPost.updated_at) == (datetime(2024, 3, 1, 10, 30), 7)
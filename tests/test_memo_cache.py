@@ -0,0 +1,149 @@
+"""
+Tests for the in-process memo cache.
+"""
+
+import time
+
+from app.utils.memo_cache import MemoCache, MISSING
+
+
+class TestMemoCache:
+    """Test MemoCache get/set/expiry behaviour."""
+
+    def test_missing_key(self):
+        """Test that unknown keys return the MISSING sentinel."""
+        cache = MemoCache('test', ttl=60)
+        assert cache.get('nope') is MISSING
+
+    def test_none_is_cacheable(self):
+        """Test that None is a valid cached value."""
+        cache = MemoCache('test', ttl=60)
+        cache.set('key', None)
+        assert cache.get('key') is None
+
+    def test_returns_copy(self):
+        """Test that callers cannot mutate the cached value."""
+        cache = MemoCache('test', ttl=60)
+        cache.set('key', {'values': [1, 2]})
+        cache.get('key')['values'].append(3)
+        assert cache.get('key') == {'values': [1, 2]}
+
+    def test_expiry(self):
+        """Test that entries expire after the TTL."""
+        cache = MemoCache('test', ttl=0)
+        cache.set('key', 1)
+        time.sleep(0.01)
+        assert cache.get('key') is MISSING
+
+    def test_maxsize_evicts_oldest(self):
+        """Test that the oldest entry is evicted when full."""
+        cache = MemoCache('test', ttl=60, maxsize=2)
+        cache.set('a', 1)
+        cache.set('b', 2)
+        cache.set('c', 3)
+        assert cache.get('a') is MISSING
+        assert cache.get('c') == 3
+        assert len(cache) == 2
+
+    def test_clear_accepts_event_arguments(self):
+        """Test that clear() can be called as an SQLAlchemy listener."""
+        cache = MemoCache('test', ttl=60)
+        cache.set('key', 1)
+        cache.clear(object(), object(), object())
+        assert cache.get('key') is MISSING
+
+
+class TestRankingsInvalidation:
+    """Test which User writes clear the analyst rankings memo."""
+
+    def test_login_keeps_rankings(self):
+        """Test that a last_login-only update keeps the cache, a name change clears it."""
+        from datetime import datetime
+
+        from app import create_app
+        from app.analyst.routes import _rankings_cache
+        from app.extensions import db
+        from app.models import User
+
+        app = create_app('testing')
+        with app.app_context():
+            db.create_all()
+            user = User(email='analyst@example.com', full_name='Analyst')
+            db.session.add(user)
+            db.session.commit()
+
+            _rankings_cache.set('rankings', {'top_total': []})
+            user.last_login = datetime.utcnow()
+            db.session.commit()
+            assert _rankings_cache.get('rankings') == {'top_total': []}
+
+            user.full_name = 'Renamed Analyst'
+            db.session.commit()
+            assert _rankings_cache.get('rankings') is MISSING
+            db.session.remove()
+
+    def test_reimported_assignments_clear_rankings(self):
+        """Test that the CSV importer rewriting analyst roles clears the cache."""
+        from datetime import date
+
+        from app import create_app
+        from app.analyst.routes import _rankings_cache
+        from app.extensions import db
+        from app.models import Analysis, Company, User, analysis_analysts
+        from app.utils.csv_import import CsvImporter
+        from app.utils.email_normalization import normalize_name_for_email
+
+        app = create_app('testing')
+        with app.app_context():
+            db.create_all()
+            company = Company(name='Company')
+            db.session.add(company)
+            # Existing users, so the import writes only analysis_analysts rows
+            for name in ('Anna Analyst', 'Otto Opponent'):
+                db.session.add(User(email=f"{normalize_name_for_email(name)}@klubinvestoru.com",
+                                    full_name=name))
+            db.session.flush()
+            analysis = Analysis(company_id=company.id, analysis_date=date(2024, 1, 1), status='Neutral')
+            db.session.add(analysis)
+            db.session.commit()
+
+            importer = CsvImporter('', 'schedule.csv')
+            importer._assign_analysts(analysis, 'Anna Analyst', 'Otto Opponent')
+            db.session.commit()
+
+            _rankings_cache.set('rankings', {'top_total': []})
+            # Re-import with the roles swapped
+            importer._assign_analysts(analysis, 'Otto Opponent', 'Anna Analyst')
+            db.session.commit()
+
+            assert _rankings_cache.get('rankings') is MISSING
+            roles = db.session.execute(analysis_analysts.select()).all()
+            assert len(roles) == 2
+            db.session.remove()
+
+
+class TestPortfolioSeriesMemo:
+    """Test the benchmark memo layered on the chart series memo."""
+
+    def test_benchmarks_fetched_once_per_series(self, monkeypatch):
+        """Test that repeat requests reuse the benchmark lines, not a second series copy."""
+        from app import create_app
+        from app.analyst import routes
+        from app.utils import presentation_export
+
+        fetched = []
+        monkeypatch.setattr(presentation_export, 'generate_portfolio_chart_series',
+                            lambda ids, years=None, method='incremental':
+                            {'dates': ['2024-01-01', '2024-02-01'], 'values': [0.0, 1.5]})
+        monkeypatch.setattr(routes, '_admin_get_benchmark_series',
+                            lambda dates, ticker: fetched.append(ticker) or [0.0, 1.0])
+        routes._benchmark_series_cache.clear()
+
+        app = create_app('testing')
+        with app.app_context():
+            first = routes.get_portfolio_series_for_analyses([2, 1])
+            second = routes.get_portfolio_series_for_analyses([1, 2])
+
+        assert first == second
+        assert first['portfolio_series'] == [0.0, 1.5]
+        assert sorted(fetched) == ['EEMS', 'SPY', 'VT']
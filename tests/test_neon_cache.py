@@ -0,0 +1,106 @@
+"""
+Tests for dependency-based blog cache invalidation in neon_cache.
+"""
+
+from datetime import datetime
+
+import pytest
+
+from app.extensions import cache, db
+from app.models import BlogPost, User
+from app.utils import neon_cache
+from app.utils.neon_cache import (
+    KEY_PREFIX, get_cache_key, get_cached_blog_index, get_cached_blog_post,
+    get_cached_latest_blog_posts, invalidate_blog_cache, invalidate_blog_post_cache
+)
+
+
+@pytest.fixture(autouse=True)
+def neon_optimize(monkeypatch):
+    """Enable the caches under test."""
+    monkeypatch.setattr(neon_cache, 'NEON_OPTIMIZE', True)
+
+
+@pytest.fixture
+def seed():
+    """12 published posts (two index pages)."""
+    def add_posts():
+        author = User(email='author@example.com')
+        author.set_password('Author-Password-1')
+        db.session.add(author)
+        db.session.flush()
+        for i in range(12):
+            db.session.add(BlogPost(
+                title=f'Post {i}', slug=f'post-{i}', content='Body',
+                author_id=author.id, status='published', is_public=True,
+                published_at=datetime(2024, 1, 1 + i)
+            ))
+    return add_posts
+
+
+def _post_id(slug):
+    return BlogPost.query.filter_by(slug=slug).first().id
+
+
+def _index_key(page):
+    generation = neon_cache._blog_listings_generation(cache)
+    return get_cache_key(KEY_PREFIX['blog_index'], generation, page, '', '')
+
+
+class TestBlogPostInvalidation:
+    """Test that a post edit only drops the cached entries showing it."""
+    
+    def test_drops_entries_showing_post(self, app):
+        """Test that the post page and its index page go, other pages stay."""
+        with app.app_context():
+            get_cached_blog_index(page=1)
+            get_cached_blog_index(page=2)
+            get_cached_blog_post('post-11')
+            
+            # Newest post is on page 1 only
+            dropped = invalidate_blog_post_cache(_post_id('post-11'))
+            
+            assert dropped == 2
+            assert cache.get(get_cache_key(KEY_PREFIX['blog_post'], 'post-11')) is None
+            assert cache.get(_index_key(1)) is None
+            assert cache.get(_index_key(2)) is not None
+    
+    def test_full_invalidation_drops_all_listings(self, app):
+        """Test that invalidate_blog_cache reaches paginated listings."""
+        with app.app_context():
+            get_cached_blog_index(page=1)
+            get_cached_blog_index(page=2)
+            get_cached_blog_post('post-0')
+            
+            old_keys = [_index_key(1), _index_key(2)]
+            
+            invalidate_blog_cache()
+            
+            assert _index_key(1) not in old_keys
+            assert cache.get(_index_key(1)) is None
+            assert cache.get(_index_key(2)) is None
+            # A single post page does not depend on the listing
+            assert cache.get(get_cache_key(KEY_PREFIX['blog_post'], 'post-0')) is not None
+    
+    def test_listings_are_not_tracked_per_key(self, app):
+        """Test that caching listings adds no shared dependency list."""
+        with app.app_context():
+            for page in (1, 2):
+                get_cached_blog_index(page=page)
+            
+            assert cache.get('dep:blog_listings') is None
+    
+    def test_post_dependencies_are_capped(self, app, monkeypatch):
+        """Test that a full dependency list drops its oldest entry from the cache."""
+        monkeypatch.setattr(neon_cache, 'MAX_BLOG_DEPENDENTS', 2)
+        with app.app_context():
+            post_id = _post_id('post-11')
+            get_cached_blog_index(page=1)
+            get_cached_latest_blog_posts(limit=3)
+            get_cached_blog_post('post-11')
+            
+            generation = neon_cache._blog_listings_generation(cache)
+            dependents = cache.get(f"{KEY_PREFIX['dep_blog_post']}:{post_id}")
+            assert dependents == [get_cache_key(KEY_PREFIX['main_blog_posts'], generation, 3),
+                                  get_cache_key(KEY_PREFIX['blog_post'], 'post-11')]
+            assert cache.get(_index_key(1)) is None
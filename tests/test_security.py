@@ -4,6 +4,8 @@ Security tests for the application.
 These tests verify that security features are properly implemented.
 """
 
+import io
+
 import pytest
 from app.security import (
     sanitize_input, validate_email, validate_password,
@@ -177,14 +179,8 @@ class TestRateLimiter:
 class TestSecurityHeaders:
     """Test security headers middleware."""
     
-    def test_security_headers_present(self):
+    def test_security_headers_present(self, app):
         """Test that security headers are present in responses."""
-        import os
-        os.environ['FLASK_CONFIG'] = 'testing'
-        
-        from app import create_app
-        app = create_app('testing')
-        
         with app.test_client() as client:
             response = client.get('/')
             
@@ -194,14 +190,8 @@ class TestSecurityHeaders:
             assert 'X-XSS-Protection' in response.headers
             assert 'Referrer-Policy' in response.headers
     
-    def test_csp_header_content(self):
+    def test_csp_header_content(self, app):
         """Test CSP header has correct directives."""
-        import os
-        os.environ['FLASK_CONFIG'] = 'testing'
-        
-        from app import create_app
-        app = create_app('testing')
-        
         with app.test_client() as client:
             response = client.get('/')
             csp = response.headers.get('Content-Security-Policy', '')
@@ -211,6 +201,108 @@ class TestSecurityHeaders:
             assert "style-src 'self'" in csp
 
 
+class TestImageUploadValidation:
+    """Test that image uploads are checked by content, not extension."""
+    
+    def test_accepts_image_signatures(self):
+        """Test that PNG, JPEG, GIF and WebP headers are accepted."""
+        import io
+        from app.blog.routes import _is_image_upload
+        
+        for header in (b'\x89PNG\r\n\x1a\n\x00\x00\x00\rIHDR', b'\xff\xd8\xff\xe0\x00\x10JFIF',
+                       b'GIF89a\x01\x00\x01\x00', b'RIFF\x24\x00\x00\x00WEBPVP8 '):
+            stream = io.BytesIO(header)
+            assert _is_image_upload(stream) is True
+            assert stream.tell() == 0
+    
+    def test_rejects_other_content(self):
+        """Test that HTML or script content with an image extension is rejected."""
+        import io
+        from app.blog.routes import _is_image_upload
+        
+        assert _is_image_upload(io.BytesIO(b'<html><script>alert(1)</script>')) is False
+        assert _is_image_upload(io.BytesIO(b'')) is False
+
+
+class TestDocumentUploadLimit:
+    """Test that oversized document uploads are refused before the body is parsed."""
+    
+    @pytest.fixture
+    def client(self, monkeypatch):
+        """Client of a CSRF-enabled app, logged in, that records form parsing."""
+        from werkzeug.formparser import FormDataParser
+        from app import create_app
+        from app.extensions import db
+        from app.models import User
+        
+        app = create_app('testing')
+        app.config['WTF_CSRF_ENABLED'] = True
+        with app.app_context():
+            db.create_all()
+            user = User(email='writer@example.com')
+            db.session.add(user)
+            db.session.commit()
+            user_id = user.id
+        
+        self.parsed = []
+        original_parse = FormDataParser.parse
+        
+        def parse(parser, *args, **kwargs):
+            self.parsed.append(True)
+            return original_parse(parser, *args, **kwargs)
+        
+        monkeypatch.setattr(FormDataParser, 'parse', parse)
+        client = app.test_client()
+        with client.session_transaction() as session:
+            session['_user_id'] = str(user_id)
+            session['_fresh'] = True
+        yield client
+        with app.app_context():
+            db.drop_all()
+    
+    def test_oversized_upload_rejected_unparsed(self, client):
+        """Test that a too-large Content-Length is refused without parsing the form."""
+        body = b'x' * (11 * 1024 * 1024)
+        response = client.post('/blog/api/upload-document', data=body,
+                               content_type='multipart/form-data; boundary=b')
+        
+        assert response.status_code == 413
+        assert 'File too large' in response.get_json()['error']
+        assert self.parsed == []
+    
+    def test_small_upload_still_needs_csrf_token(self, client):
+        """Test that an upload within the limit is still CSRF-checked."""
+        response = client.post('/blog/api/upload-document',
+                               data={'document': (io.BytesIO(b'%PDF-1.4'), 'a.pdf')})
+        
+        assert response.status_code == 400
+        assert b'CSRF' in response.data
+
+
+class TestAdditionalPdfsParsing:
+    """Test bounds on the editor's additional_pdfs JSON."""
+    
+    def _parse(self, value):
+        from werkzeug.datastructures import MultiDict
+        from app import create_app
+        from app.blog.routes import _parse_post_form
+        
+        app = create_app('testing')
+        with app.app_context():
+            return _parse_post_form(MultiDict({'additional_pdfs': value}))['additional_pdfs']
+    
+    def test_accepts_list_of_objects(self):
+        """Test that a normal list of PDF descriptors is kept."""
+        assert self._parse('[{"name": "a.pdf", "path": "/x/a.pdf"}]') == [{'name': 'a.pdf', 'path': '/x/a.pdf'}]
+    
+    def test_rejects_oversized_or_malformed(self):
+        """Test that huge, deeply nested or wrongly shaped payloads are dropped."""
+        assert self._parse('[' + '{"a": 1},' * 20000 + '{"a": 1}]') is None
+        assert self._parse('[' * 5000 + ']' * 5000) is None
+        assert self._parse('[1, 2, 3]') is None
+        assert self._parse('{"name": "a.pdf"}') is None
+
+
 class TestSQLInjectionPrevention:
     """Test SQL injection prevention."""
     
@@ -271,3 +363,32 @@ class TestSessionSecurity:
         
         # CSRF might be disabled in testing but should be configured
         assert 'WTF_CSRF_ENABLED' in app.config
+
+
+class TestPasswordHashing:
+    """Test bcrypt password hashing and legacy hash upgrade."""
+    
+    def test_bcrypt_hash_roundtrip(self):
+        """Test that new passwords are stored as bcrypt hashes."""
+        from app.models import User
+        
+        user = User(email='hash@example.com')
+        user.set_password('Correct-Horse-42')
+        
+        assert user.password_hash.startswith('$2')
+        assert user.check_password('Correct-Horse-42') is True
+        assert user.check_password('wrong') is False
+    
+    def test_legacy_hash_upgraded_on_login(self):
+        """Test that a Werkzeug PBKDF2 hash still verifies and is rehashed."""
+        from werkzeug.security import generate_password_hash
+        from app.models import User
+        
+        user = User(email='legacy@example.com')
+        user.password_hash = generate_password_hash('Old-Password-1')
+        
+        assert user.check_password('wrong') is False
+        assert not user.password_hash.startswith('$2')
+        assert user.check_password('Old-Password-1') is True
+        assert user.password_hash.startswith('$2')
+        assert user.check_password('Old-Password-1') is True
@@ -0,0 +1,114 @@
+"""
+Tests that overview views derived from the saved view basis match a full
+per-view calculation.
+"""
+
+from datetime import date, datetime, timedelta
+
+import pytest
+
+from app.extensions import db
+from app.models import (Analysis, Company, OverviewDataCache, PortfolioPurchase, StockPrice,
+                        User, Vote)
+from app.utils import overview_cache
+from app.utils.unified_calculator import VIEW_NAMES, UnifiedDataCalculator
+
+# (status, days before today, board votes yes/no, purchased, return_pct or None)
+POSITIONS = [
+    ('On Watchlist', 700, (3, 1), True, 12.5),
+    ('On Watchlist', 500, (1, 2), False, -4.25),
+    ('Neutral', 420, (0, 0), False, 7.0),
+    ('Refused', 300, (2, 0), False, -11.75),
+    ('On Watchlist', 200, (2, 1), True, 3.5),
+    ('Neutral', 90, (0, 1), False, 21.0),
+    ('Refused', 40, (0, 0), False, None),  # no performance yet
+    ('On Watchlist', 20, (1, 0), False, 0.5),
+]
+
+SECTORS = ['Technology', 'Energy', 'Technology', 'Healthcare', 'Unknown', 'Energy', 'Energy', 'Technology']
+
+
+@pytest.fixture
+def calculator(app):
+    """Calculator with a unified dataset built from positions added to the app's database."""
+    users = [User(email=f'board{i}@example.com') for i in range(4)]
+    db.session.add_all(users)
+    db.session.flush()
+    user = users[0]
+    
+    today = date.today()
+    performance = {}
+    sectors = {}
+    for i, (status, age, (yes, no), purchased, return_pct) in enumerate(POSITIONS):
+        company = Company(name=f'Company {i}', ticker_symbol=f'C{i}')
+        db.session.add(company)
+        db.session.flush()
+        sectors[company.id] = SECTORS[i]
+        
+        # Monthly prices from before the first analysis to today
+        for month in range(26):
+            db.session.add(StockPrice(company_id=company.id,
+                                      date=today - timedelta(days=760 - 30 * month),
+                                      close_price=100 + (i + 1) * month * (-1) ** i))
+        
+        analysis = Analysis(company_id=company.id, status=status,
+                            analysis_date=today - timedelta(days=age))
+        db.session.add(analysis)
+        db.session.flush()
+        for voter, vote in zip(users, [True] * yes + [False] * no):
+            db.session.add(Vote(analysis_id=analysis.id, user_id=voter.id, vote=vote))
+        if purchased:
+            db.session.add(PortfolioPurchase(analysis_id=analysis.id, purchase_date=today,
+                                             added_by=user.id))
+        if return_pct is not None:
+            performance[analysis.id] = {'return_pct': return_pct,
+                                        'annualized_return': return_pct / 2}
+    db.session.commit()
+    
+    calc = UnifiedDataCalculator()
+    calc._company_sectors = sectors
+    calc._analyst_rankings = {'top_total': []}
+    calc._unified_data = calc._build_unified_dataset(
+        calc._get_all_analyses_with_companies(), performance
+    )
+    return calc
+
+
+@pytest.mark.parametrize('method', ['incremental', 'equal'])
+def test_derived_views_match_full_calculation(calculator, method):
+    """Test that every view derived from the basis equals _calculate_view."""
+    expected = {name: calculator._calculate_view(name, method) for name in VIEW_NAMES}
+    all_views = {f"{name}_{method}": data for name, data in expected.items()}
+    basis, meta = calculator.build_view_basis(all_views, method)
+    
+    for view_name in VIEW_NAMES:
+        derived = calculator.derive_view_from_basis(basis, meta, view_name, method)
+        view = dict(expected[view_name])
+        # The basis only holds positions with performance
+        view['analysis_ids'] = [
+            analysis_id for analysis_id in view['analysis_ids']
+            if calculator._unified_data['analyses'][analysis_id]['performance']
+        ]
+        assert derived == view, view_name
+
+
+def test_view_outside_basis_grid_is_not_derived(calculator):
+    """Test that a basis without the view's dates yields None, not a partial view."""
+    expected = {f"{name}_equal": calculator._calculate_view(name, 'equal') for name in VIEW_NAMES}
+    basis, meta = calculator.build_view_basis(expected, 'equal')
+    basis['dates'] = basis['dates'][1:]
+    basis['values'] = basis['values'][:, 1:]
+    
+    assert calculator.derive_view_from_basis(basis, meta, 'all', 'equal') is None
+
+
+def test_derived_view_keeps_basis_age(calculator):
+    """Test that a view saved from an old basis is not cached as fresh."""
+    basis_time = datetime.utcnow() - timedelta(days=5)
+    
+    overview_cache.save_overview_cache('all_equal', calculator._calculate_view('all', 'equal'),
+                                       cached_at=basis_time)
+    
+    assert overview_cache.get_cache_age_days('all_equal') == 5
+    cache = OverviewDataCache.query.filter_by(filter_type='all_equal').one()
+    assert cache.expires_at == basis_time + timedelta(days=overview_cache.CACHE_EXPIRY_DAYS)
@@ -0,0 +1,76 @@
+"""
+Tests for the buffered blog post view counter.
+"""
+
+import os
+from datetime import datetime
+
+import pytest
+
+from app.extensions import db
+from app.models import BlogPost, User
+from app.utils import view_counter
+
+
+@pytest.fixture
+def seed():
+    """One published post."""
+    def add_post():
+        author = User(email='author@example.com')
+        db.session.add(author)
+        db.session.flush()
+        db.session.add(BlogPost(title='Post', slug='post', content='Body', author_id=author.id,
+                                status='published', is_public=True, view_count=0,
+                                published_at=datetime(2024, 1, 1)))
+    return add_post
+
+
+@pytest.fixture(autouse=True)
+def clear_pending():
+    """Drop view counts a test left buffered."""
+    yield
+    view_counter._pending.clear()
+
+
+def _post():
+    return BlogPost.query.filter_by(slug='post').first()
+
+
+class TestViewCounter:
+    """Test that buffered views are written exactly once."""
+    
+    def test_failed_flush_keeps_counts(self, app, monkeypatch):
+        """Test that counts from a failed write are retried on the next flush."""
+        with app.app_context():
+            post_id = _post().id
+            
+            def fail(*args, **kwargs):
+                raise RuntimeError('database unavailable')
+            
+            with monkeypatch.context() as patch:
+                patch.setattr(db.session, 'execute', fail)
+                view_counter.record_view(post_id)
+                view_counter.record_view(post_id)
+            
+            assert view_counter.pending_views(post_id) == 2
+            
+            view_counter.flush()
+            
+            assert view_counter.pending_views(post_id) == 0
+            assert _post().view_count == 2
+    
+    @pytest.mark.skipif(not hasattr(os, 'fork'), reason='requires os.fork')
+    def test_forked_child_starts_empty(self, app):
+        """Test that a child process does not inherit the parent's buffered views."""
+        with app.app_context():
+            post_id = _post().id
+            with view_counter._lock:
+                view_counter._pending.setdefault(app, {})[post_id] = 3
+            
+            pid = os.fork()
+            if pid == 0:
+                os._exit(0 if not view_counter._pending and view_counter._worker is None else 1)
+            _, status = os.waitpid(pid, 0)
+            
+            assert os.WEXITSTATUS(status) == 0
+            assert view_counter.pending_views(post_id) == 3